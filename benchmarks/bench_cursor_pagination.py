@@ -0,0 +1,86 @@
+"""
+Compares reading a page deep in a large SQLite table with offset pagination, a `COUNT(*)`
+plus `LIMIT/OFFSET` as DRF's `PageNumberPagination` does, and with `Linker.paginate`
+keyset cursors, which read `page_size + 1` rows from an index.
+
+Usage: python benchmarks/bench_cursor_pagination.py [rows] [page_size]
+"""
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import django
+from django.conf import settings
+
+DATABASE = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+
+settings.configure(
+    INSTALLED_APPS=['rest_framework', 'rest_framework_toolbox'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(DATABASE)}},
+    ALLOWED_HOSTS=['*'],
+    SECRET_KEY='bench',
+)
+django.setup()
+
+from django.db import connection, models
+from django.test import RequestFactory
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+
+from rest_framework_toolbox.handlers import Linker
+from rest_framework_toolbox.handlers.linker import Cursor
+
+
+class Event(models.Model):
+    created = models.IntegerField()
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = 'rest_framework_toolbox'
+        indexes = [models.Index(fields=['created', 'id'])]
+
+
+def populate(rows):
+    with connection.schema_editor() as editor:
+        editor.create_model(Event)
+    batch = 10000
+    for start in range(0, rows, batch):
+        Event.objects.bulk_create(
+            Event(created=i // 3, name=f'event {i}') for i in range(start, min(start + batch, rows)))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    populate(rows)
+    queryset = Event.objects.all()
+    ordering = ('created', 'pk')
+
+    pagination = PageNumberPagination()
+    pagination.page_size = page_size
+    deep_page = rows // page_size - 1
+
+    # Cursor of the same deep page
+    boundary = queryset.order_by(*ordering)[deep_page * page_size - 1]
+    token = Cursor((boundary.created, boundary.pk)).encode()
+
+    def offset():
+        request = Request(RequestFactory().get(f'/events?page={deep_page + 1}'))
+        return list(pagination.paginate_queryset(queryset.order_by(*ordering), request))
+
+    def cursor():
+        request = Request(RequestFactory().get(f'/events?cursor={token}'))
+        return Linker.paginate(request, queryset, ordering, page_size).items
+
+    assert offset() == cursor()
+    for label, func in (('offset + count', offset), ('keyset cursor', cursor)):
+        seconds = min(timeit.repeat(func, number=10, repeat=3)) / 10
+        print(f'{label:<16} {seconds * 1e3:10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
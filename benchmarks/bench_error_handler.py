@@ -0,0 +1,70 @@
+"""
+Measures the per-exception overhead of building an `ErrorHandler` for every exception, as
+`ErrorHandler.handle_exception` used to, against the shared `ErrorHandler.default()`.
+
+Usage: python benchmarks/bench_error_handler.py [iterations]
+"""
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=['rest_framework', 'rest_framework_toolbox'],
+    ERROR_HANDLER_LOGGER='logging.root',
+    ERROR_HANDLER_SIGNALS=[],
+)
+django.setup()
+# Handled exceptions are not logged, only the handler overhead is measured
+logging.root.setLevel(logging.ERROR)
+
+from django.test import RequestFactory
+from rest_framework import exceptions
+from rest_framework.response import Response
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import ErrorHandler
+
+
+class FailResponse(JSONModel):
+    status = BooleanField(default=False)
+    message = StringField(default="Failed request")
+    error = DataField()
+
+
+class View:
+    def on_error(self, exc, context, response):
+        return FailResponse(message=str(exc.detail), error=exc.default_code)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    exc = exceptions.PermissionDenied()
+    context = {'view': View(), 'request': RequestFactory().get('/')}
+    response = Response(status=exc.status_code)
+
+    def per_exception():
+        ErrorHandler()._handle(exc, context, response, error_model=FailResponse)
+
+    def shared():
+        ErrorHandler.default()._handle(exc, context, response, error_model=FailResponse)
+
+    def construct_only():
+        ErrorHandler()
+
+    for label, func in (('new handler per exception', per_exception),
+                        ('shared handler', shared),
+                        ('handler construction alone', construct_only)):
+        seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f'{label:<28} {seconds * 1e6:10.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares the size and the speed of the JSON and MessagePack envelopes.
+
+Usage: python benchmarks/bench_renderers.py [records]
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=['rest_framework'])
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.core.msgpack import packb, unpackb
+from rest_framework_toolbox.handlers import RestMsgPackRenderer
+
+
+class SuccessResponse(JSONModel):
+    status = BooleanField(default=True)
+    message = StringField(default="Successful request")
+    data = DataField()
+
+
+def build(records):
+    return SuccessResponse(data=[
+        {'id': i, 'name': f'item {i}', 'price': i * 1.25, 'active': i % 2 == 0, 'tags': ['a', 'b']}
+        for i in range(records)
+    ])
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f'{label:<28} {seconds * 1000:10.3f} ms')
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    number = max(1, 100000 // records)
+    envelope = build(records)
+    json_renderer = JSONRenderer()
+    msgpack_renderer = RestMsgPackRenderer()
+    json_bytes = json_renderer.render(envelope.to_dict())
+    msgpack_bytes = msgpack_renderer.encode(envelope)
+
+    print(f'records: {records}')
+    print(f'{"json size":<28} {len(json_bytes):10d} bytes')
+    print(f'{"msgpack size":<28} {len(msgpack_bytes):10d} bytes')
+    bench('json encode', lambda: json_renderer.render(envelope.to_dict()), number)
+    bench('msgpack encode', lambda: msgpack_renderer.encode(envelope), number)
+    bench('json decode', lambda: json.loads(json_bytes), number)
+    bench('msgpack decode', lambda: unpackb(msgpack_bytes), number)
+    assert unpackb(packb(envelope)) == json.loads(json_bytes)
+
+
+if __name__ == '__main__':
+    main()
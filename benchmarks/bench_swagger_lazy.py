@@ -0,0 +1,109 @@
+"""
+Measures the cost of declaring views, with a class and two method schemas each, with
+drf-spectacular's `extend_schema` and with `lazy_extend_schema`, which defers building the
+declaration until the schema is generated, then the cost of materializing them.
+
+Usage: python benchmarks/bench_swagger_lazy.py [views]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=['rest_framework', 'drf_spectacular'],
+    REST_FRAMEWORK={'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'},
+)
+django.setup()
+
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.swagger import lazy_extend_schema, materialize_schemas
+
+
+class OrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    reference = serializers.CharField()
+
+
+def get_schema():
+    return {
+        'responses': {200: OpenApiResponse(OrderSerializer(many=True), description='Orders')},
+        'parameters': [OpenApiParameter('status', str), OpenApiParameter('page', int)],
+    }
+
+
+def post_schema():
+    return {'request': OrderSerializer, 'responses': {201: OrderSerializer}}
+
+
+def class_schema():
+    return {'tags': ['orders']}
+
+
+def declare_eager():
+    @extend_schema(**class_schema())
+    class OrdersView(APIView):
+        @extend_schema(**get_schema())
+        def get(self, request):
+            pass
+
+        @extend_schema(**post_schema())
+        def post(self, request):
+            pass
+
+    return OrdersView
+
+
+def declare_lazy():
+    @lazy_extend_schema(class_schema)
+    class OrdersView(APIView):
+        @lazy_extend_schema(get_schema)
+        def get(self, request):
+            pass
+
+        @lazy_extend_schema(post_schema)
+        def post(self, request):
+            pass
+
+    return OrdersView
+
+
+def measure(func, count):
+    tracemalloc.start()
+    started = time.perf_counter()
+    views = [func() for _ in range(count)]
+    seconds = time.perf_counter() - started
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds / count, memory / count, views
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    # Warm up the imports and caches of both paths
+    declare_eager()
+    declare_lazy()
+    materialize_schemas()
+
+    eager, eager_memory, _ = measure(declare_eager, count)
+    lazy, lazy_memory, _ = measure(declare_lazy, count)
+    started = time.perf_counter()
+    materialize_schemas()
+    materialized = (time.perf_counter() - started) / count
+
+    print(f'{"extend_schema":<22} {eager * 1e3:8.3f} ms {eager_memory / 1024:8.1f} KiB per view')
+    print(f'{"lazy_extend_schema":<22} {lazy * 1e3:8.3f} ms {lazy_memory / 1024:8.1f} KiB per view')
+    print(f'{"materialize_schemas":<22} {materialized * 1e3:8.3f} ms per view, once the schema is generated')
+
+
+if __name__ == '__main__':
+    main()
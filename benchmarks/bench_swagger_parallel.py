@@ -0,0 +1,87 @@
+"""
+Measures the cold build of the OpenAPI document of a generated API with the serial
+`SchemaGenerator` and with `ParallelSchemaGenerator` as the number of workers grows.
+
+Usage: python benchmarks/bench_swagger_parallel.py [endpoints]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=['rest_framework', 'drf_spectacular'],
+    REST_FRAMEWORK={'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'},
+)
+django.setup()
+
+from django.urls import path
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.swagger import ParallelSchemaGenerator
+
+
+def make_view(index):
+    class LineSerializer(serializers.Serializer):
+        sku = serializers.CharField()
+        quantity = serializers.IntegerField()
+        price = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+    class OrderSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        reference = serializers.CharField()
+        created = serializers.DateTimeField()
+        status = serializers.ChoiceField(choices=['open', 'paid', 'shipped'])
+        lines = LineSerializer(many=True)
+
+    LineSerializer.__name__ = f'Line{index}Serializer'
+    OrderSerializer.__name__ = f'Order{index}Serializer'
+
+    class OrderView(APIView):
+        @extend_schema(responses={200: OrderSerializer(many=True)})
+        def get(self, request):
+            pass
+
+        @extend_schema(request=OrderSerializer, responses={201: OrderSerializer})
+        def post(self, request):
+            pass
+
+    OrderView.__name__ = f'Order{index}View'
+    return OrderView
+
+
+def build(generator):
+    started = time.perf_counter()
+    document = OpenApiJsonRenderer().render(generator.get_schema(request=None, public=True))
+    return time.perf_counter() - started, document
+
+
+def main():
+    endpoints = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    patterns = [path(f'shops/{index}/orders', make_view(index).as_view()) for index in range(endpoints)]
+
+    # Warm up drf-spectacular's imports and caches so the first build isn't penalised
+    build(SchemaGenerator(patterns=[path('warmup', make_view(-1).as_view())]))
+
+    serial, document = build(SchemaGenerator(patterns=patterns))
+    print(f'{"serial":<12} {serial:8.2f} s')
+    workers = 2
+    while workers <= (os.cpu_count() or 1) * 2:
+        seconds, parallel = build(ParallelSchemaGenerator(patterns=patterns, workers=workers))
+        assert parallel == document, 'documents differ'
+        print(f'{f"{workers} workers":<12} {seconds:8.2f} s {serial / seconds:6.2f}x')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ Subpackages:
 - `rest_framework_toolbox.error_handler`: Custom error handler for rest_framework.
 - `rest_framework_toolbox.renderer`: Custom JSON renderer for rest_framework.
 - `rest_framework_toolbox.linker`: Provides utilities to create links for your model instances.
+- `rest_framework_toolbox.metrics`: Counters and histograms of the handlers, in the Prometheus format.
 
 __version__ = '0.1.0'
 """
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class RestFrameworkToolboxConfig(AppConfig):
+    name = 'rest_framework_toolbox'
+    verbose_name = 'Rest Framework Toolbox'
+
+    def ready(self):
+        # Build the shared error handler once, rather than on the first exception
+        from rest_framework_toolbox.handlers.error_handler import ErrorHandler
+        ErrorHandler.configure()
@@ -0,0 +1,117 @@
+"""
+Helpers to run the toolbox hooks under ASGI deployments.
+
+- `call_hook` calls a hook from sync code, awaiting its result when it is a coroutine.
+- `queued_logger` returns a logger whose records are handed over to a background thread,
+  so slow logging handlers never block a request thread or the event loop. Its listener
+  threads are restarted in forked children, e.g. the workers of a pre-fork server.
+"""
+import atexit
+import inspect
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable
+
+__all__ = [
+    'call_hook',
+    'queued_logger',
+]
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def call_hook(hook: Callable, *args, **kwds) -> Any:
+    """Calls `hook` from sync code.
+
+    If the hook returns an awaitable (e.g. `async def on_success`), it is awaited using
+    `asgiref.sync.async_to_sync`, which runs it on the server's event loop when called from a
+    thread spawned by `sync_to_async`, as Django does for sync views under ASGI.
+    """
+    result = hook(*args, **kwds)
+    if inspect.isawaitable(result):
+        from asgiref.sync import async_to_sync
+        return async_to_sync(_await)(result)
+    return result
+
+
+_queued_loggers = {}
+_queued_loggers_lock = threading.Lock()
+
+
+def _stop_listener(listener: QueueListener):
+    # A listener stopped already has no thread, stopping it again would fail
+    if listener._thread is not None:
+        listener.stop()
+
+
+def _collect_handlers(logger):
+    handlers = []
+    current = logger
+    while current:
+        handlers.extend(current.handlers)
+        if not current.propagate:
+            break
+        current = current.parent
+    return handlers
+
+
+def queued_logger(logger: logging.Logger) -> logging.Logger:
+    """Returns a logger that enqueues its records, the handlers of `logger` process them in a
+    background thread.
+
+    The returned logger is named `<logger name>.queued`, doesn't propagate, and is cached so
+    a single listener thread is started per logger. The listener is stopped at exit, once the
+    queued records are handled.
+    """
+    name = f'{logger.name}.queued'
+    queued = _queued_loggers.get(name)
+    if queued is not None:
+        return queued
+
+    with _queued_loggers_lock:
+        queued = _queued_loggers.get(name)
+        if queued is not None:
+            return queued
+
+        handlers = _collect_handlers(logger)
+        if not handlers:
+            return logger
+
+        queued = logging.getLogger(name)
+        _listen(queued, handlers)
+        queued.propagate = False
+        queued.setLevel(logger.getEffectiveLevel())
+        _queued_loggers[name] = queued
+        return queued
+
+
+def _listen(queued: logging.Logger, handlers):
+    """Starts a listener thread handing the records of `queued` to `handlers`"""
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    # The records still queued are handled before the interpreter exits
+    atexit.register(_stop_listener, listener)
+    queued.handlers = [QueueHandler(records)]
+    queued.listener = listener
+
+
+def _restart_listeners():
+    """Runs in a forked child, where the listener threads of the parent don't run: each queued
+    logger gets a new queue and listener, the records queued by the parent stay the parent's"""
+    global _queued_loggers_lock
+    _queued_loggers_lock = threading.Lock()
+    for queued in _queued_loggers.values():
+        parent = queued.listener
+        # The thread of the parent mustn't be stopped at exit, it doesn't exist here
+        parent._thread = None
+        _listen(queued, parent.handlers)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listeners)
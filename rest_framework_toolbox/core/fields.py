@@ -1,6 +1,5 @@
 from typing import Any, List, Dict
 from datetime import datetime, date
-from rest_framework import serializers
 
 # Forward declare JSONModel type
 
@@ -43,6 +42,7 @@ class Field:
         return value
     
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.Field(
                 default = value,
@@ -88,6 +88,7 @@ class StringField(Field):
         return value
 
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.CharField(
                 default = value,
@@ -133,6 +134,7 @@ class IntegerField(Field):
         return value
 
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.IntegerField(
                 default = value,
@@ -167,6 +169,7 @@ class BooleanField(Field):
         return value
     
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.BooleanField(
                 default = value,
@@ -202,6 +205,7 @@ class DateTimeField(Field):
         return value
     
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.DateTimeField(
                 default = value,
@@ -237,6 +241,7 @@ class DateField(Field):
         return value
 
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.DateField(
                 default = value,
@@ -252,12 +257,15 @@ class DateField(Field):
         )
 class ListField(Field):
     """List Field. Constructor ensures value assigned is a `list`
+
+    `child` is the field, or `JSONModel`, of the items, it's used to document the field.
     """
-    def __init__(self, default=[]):
+    def __init__(self, default=[], child=None):
         if default:
             pass
             #assert type(default) is list, "Default should be a list"
         super().__init__(default)
+        self.child = child
 
     def get_value(self, value : List) -> List:
         if value is None and self.default is not None:
@@ -269,6 +277,7 @@ class ListField(Field):
         return value
 
     def serializer(self, value = None):
+        from rest_framework import serializers
         if value:
             return serializers.ListField(
                 default = value,
@@ -285,12 +294,15 @@ class ListField(Field):
 
 class DictField(Field):
     """Dict Field. Constructor ensures value assigned is a `dict`
+
+    `child` is the field, or `JSONModel`, of the values, it's used to document the field.
     """
-    def __init__(self, default={}):
+    def __init__(self, default={}, child=None):
         if default:
             pass
             #assert type(default) is dict, "Default should be a dict"
         super().__init__(default)
+        self.child = child
 
     def get_value(self, value : Dict) -> Dict:
         if value is None and self.default is not None:
@@ -302,6 +314,7 @@ class DictField(Field):
         return value
     
     def serializer(self, value= None):
+        from rest_framework import serializers
         if value:
             
             return serializers.DictField(
@@ -318,6 +331,7 @@ class DictField(Field):
         )
 class DataField(Field):
     def serializer(self, custom_serializer):
+        from rest_framework import serializers
         if isinstance(custom_serializer, serializers.Field):
             return custom_serializer
         
@@ -14,4 +14,9 @@ class _JSONModelMeta(type):
                 fields[key] = value
                 
         attrs['_fields'] = fields
+        # Encoding plan shared by every instance of the class: (name, default, is nested model)
+        attrs['_plan'] = tuple(
+            (key, value.default if isinstance(value, Field) else None, not isinstance(value, Field))
+            for key, value in fields.items()
+        )
         return super(_JSONModelMeta, cls).__new__(cls, name, bases, attrs)
\ No newline at end of file
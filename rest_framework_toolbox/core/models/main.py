@@ -1,5 +1,4 @@
 from enum import Enum
-from rest_framework.response import Response
 from ._meta import _JSONModelMeta
 from ..fields import Field
 
@@ -37,13 +36,13 @@ class JSONModel(metaclass=_JSONModelMeta):
         :rtype: dict
         """
         result = {}
-        for key, field in self._fields.items():
-            # Fields: String, Integer, Boolean, ... etc.
-            if isinstance(field, Field):
-                result[key] = getattr(self, key, field.default)
+        for key, default, nested in self._plan:
             # Nested JSON
-            elif isinstance(field, JSONModel):                
+            if nested:
                 result[key] = getattr(self, key).to_dict()
+            # Fields: String, Integer, Boolean, ... etc.
+            else:
+                result[key] = getattr(self, key, default)
             
         return result
     
@@ -60,6 +59,7 @@ class JSONModel(metaclass=_JSONModelMeta):
         return value
 
     def to_response(self, *args, **kwds):
+        from rest_framework.response import Response
         return Response(data=self.to_dict(), headers=kwds.get('headers', {}), status=kwds.get('http_status', 200))
 
     def serializer(self, *args, **kwds):
@@ -0,0 +1,281 @@
+"""
+A pure python MessagePack encoder and decoder.
+
+It covers the MessagePack types that map to JSON (nil, booleans, integers, floats, strings,
+arrays and maps) plus binary data, extension types are not supported.
+
+`JSONModel` instances are encoded straight from their class encoding plan, without building
+the intermediate `to_dict()` representation.
+"""
+from struct import Struct, error as struct_error
+from typing import Any, Callable, Optional
+
+from .models import JSONModel
+
+__all__ = [
+    'packb',
+    'unpackb',
+    'MsgPackError',
+]
+
+_uint8 = Struct('>B')
+_uint16 = Struct('>H')
+_uint32 = Struct('>I')
+_uint64 = Struct('>Q')
+_int8 = Struct('>b')
+_int16 = Struct('>h')
+_int32 = Struct('>i')
+_int64 = Struct('>q')
+_float32 = Struct('>f')
+_float64 = Struct('>d')
+
+_max_depth = 512
+
+
+class MsgPackError(ValueError):
+    pass
+
+
+def _pack_length(out, length, fix_mask, fix_limit, code16, code32):
+    if length < fix_limit:
+        out.append(fix_mask | length)
+    elif length <= 0xffff:
+        out.append(code16)
+        out += _uint16.pack(length)
+    elif length <= 0xffffffff:
+        out.append(code32)
+        out += _uint32.pack(length)
+    else:
+        raise MsgPackError("Object is too large to be encoded")
+
+
+def _pack_int(out, obj):
+    if 0 <= obj < 0x80:
+        out.append(obj)
+    elif -0x20 <= obj < 0:
+        out += _int8.pack(obj)
+    elif obj >= 0:
+        if obj <= 0xff:
+            out.append(0xcc)
+            out.append(obj)
+        elif obj <= 0xffff:
+            out.append(0xcd)
+            out += _uint16.pack(obj)
+        elif obj <= 0xffffffff:
+            out.append(0xce)
+            out += _uint32.pack(obj)
+        elif obj <= 0xffffffffffffffff:
+            out.append(0xcf)
+            out += _uint64.pack(obj)
+        else:
+            raise MsgPackError("Integer is too large to be encoded")
+    elif obj >= -0x80:
+        out.append(0xd0)
+        out += _int8.pack(obj)
+    elif obj >= -0x8000:
+        out.append(0xd1)
+        out += _int16.pack(obj)
+    elif obj >= -0x80000000:
+        out.append(0xd2)
+        out += _int32.pack(obj)
+    elif obj >= -0x8000000000000000:
+        out.append(0xd3)
+        out += _int64.pack(obj)
+    else:
+        raise MsgPackError("Integer is too large to be encoded")
+
+
+def _pack_str(out, obj):
+    data = obj.encode('utf-8')
+    length = len(data)
+    if length < 32:
+        out.append(0xa0 | length)
+        out += data
+        return
+    elif length <= 0xff:
+        out.append(0xd9)
+        out.append(length)
+    else:
+        _pack_length(out, length, 0, 0, 0xda, 0xdb)
+    out += data
+
+
+def _pack_bin(out, obj):
+    length = len(obj)
+    if length <= 0xff:
+        out.append(0xc4)
+        out.append(length)
+    else:
+        _pack_length(out, length, 0, 0, 0xc5, 0xc6)
+    out += obj
+
+
+def _pack(out, obj, default, depth):
+    if depth > _max_depth:
+        raise MsgPackError("Object is too deeply nested to be encoded")
+    kind = type(obj)
+
+    if kind is str:
+        _pack_str(out, obj)
+    elif obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif kind is int:
+        _pack_int(out, obj)
+    elif kind is float:
+        out.append(0xcb)
+        out += _float64.pack(obj)
+    elif kind is dict or isinstance(obj, dict):
+        _pack_length(out, len(obj), 0x80, 16, 0xde, 0xdf)
+        for key, value in obj.items():
+            if type(key) is str:
+                _pack_str(out, key)
+            else:
+                _pack(out, key, default, depth + 1)
+            _pack(out, value, default, depth + 1)
+    elif kind is list or kind is tuple or isinstance(obj, (list, tuple)):
+        _pack_length(out, len(obj), 0x90, 16, 0xdc, 0xdd)
+        for value in obj:
+            _pack(out, value, default, depth + 1)
+    elif isinstance(obj, JSONModel):
+        plan = obj._plan
+        _pack_length(out, len(plan), 0x80, 16, 0xde, 0xdf)
+        for key, field_default, nested in plan:
+            _pack_str(out, key)
+            if nested:
+                _pack(out, getattr(obj, key), default, depth + 1)
+            else:
+                _pack(out, getattr(obj, key, field_default), default, depth + 1)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        _pack_bin(out, bytes(obj))
+    elif isinstance(obj, str):
+        _pack_str(out, str(obj))
+    elif isinstance(obj, int):
+        _pack_int(out, int(obj))
+    elif isinstance(obj, float):
+        out.append(0xcb)
+        out += _float64.pack(obj)
+    elif default is not None:
+        replacement = default(obj)
+        if type(replacement) is kind:
+            raise TypeError(f"Object of type {kind.__name__} is not MessagePack serializable")
+        _pack(out, replacement, default, depth + 1)
+    else:
+        raise TypeError(f"Object of type {kind.__name__} is not MessagePack serializable")
+
+
+def packb(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Encodes `obj` to MessagePack bytes.
+
+    Args:
+        obj (Any): object to encode
+        default (Callable): called with objects that can't be encoded natively, it must return
+            an encodable replacement, e.g. `rest_framework.utils.encoders.JSONEncoder().default`
+
+    Returns:
+        bytes: encoded object
+    """
+    out = bytearray()
+    _pack(out, obj, default, 0)
+    return bytes(out)
+
+
+_fixed = {
+    0xcc: _uint8, 0xcd: _uint16, 0xce: _uint32, 0xcf: _uint64,
+    0xd0: _int8, 0xd1: _int16, 0xd2: _int32, 0xd3: _int64,
+    0xca: _float32, 0xcb: _float64,
+}
+_str_lengths = {0xd9: _uint8, 0xda: _uint16, 0xdb: _uint32}
+_bin_lengths = {0xc4: _uint8, 0xc5: _uint16, 0xc6: _uint32}
+_array_lengths = {0xdc: _uint16, 0xdd: _uint32}
+_map_lengths = {0xde: _uint16, 0xdf: _uint32}
+_constants = {0xc0: None, 0xc2: False, 0xc3: True}
+
+
+def _unpack(data, pos, depth):
+    """Decodes the object at `pos`, returns it with the position right after it"""
+    if depth > _max_depth:
+        raise MsgPackError("Data is too deeply nested to be decoded")
+    code = data[pos]
+    pos += 1
+
+    if code <= 0x7f:
+        return code, pos
+    if code >= 0xe0:
+        return code - 0x100, pos
+    if 0xa0 <= code <= 0xbf:
+        end = pos + (code & 0x1f)
+        return data[pos:end].decode('utf-8'), end
+    if 0x80 <= code <= 0x8f:
+        return _unpack_map(data, pos, code & 0x0f, depth)
+    if 0x90 <= code <= 0x9f:
+        return _unpack_array(data, pos, code & 0x0f, depth)
+    if code in _constants:
+        return _constants[code], pos
+    if code in _fixed:
+        fmt = _fixed[code]
+        return fmt.unpack_from(data, pos)[0], pos + fmt.size
+    if code in _str_lengths:
+        fmt = _str_lengths[code]
+        start = pos + fmt.size
+        end = start + fmt.unpack_from(data, pos)[0]
+        return data[start:end].decode('utf-8'), end
+    if code in _bin_lengths:
+        fmt = _bin_lengths[code]
+        start = pos + fmt.size
+        end = start + fmt.unpack_from(data, pos)[0]
+        return data[start:end], end
+    if code in _array_lengths:
+        fmt = _array_lengths[code]
+        return _unpack_array(data, pos + fmt.size, fmt.unpack_from(data, pos)[0], depth)
+    if code in _map_lengths:
+        fmt = _map_lengths[code]
+        return _unpack_map(data, pos + fmt.size, fmt.unpack_from(data, pos)[0], depth)
+    raise MsgPackError(f"Unsupported MessagePack type: 0x{code:02x}")
+
+
+def _unpack_array(data, pos, length, depth):
+    result = []
+    append = result.append
+    depth += 1
+    for _ in range(length):
+        value, pos = _unpack(data, pos, depth)
+        append(value)
+    return result, pos
+
+
+def _unpack_map(data, pos, length, depth):
+    result = {}
+    depth += 1
+    for _ in range(length):
+        code = data[pos]
+        # Fast path for the short string keys of JSON objects
+        if 0xa0 <= code <= 0xbf:
+            end = pos + 1 + (code & 0x1f)
+            key = data[pos + 1:end].decode('utf-8')
+            pos = end
+        else:
+            key, pos = _unpack(data, pos, depth)
+        result[key], pos = _unpack(data, pos, depth)
+    return result, pos
+
+
+def unpackb(data: bytes) -> Any:
+    """Decodes MessagePack bytes
+
+    Raises:
+        MsgPackError: data is malformed, truncated, or uses extension types
+    """
+    data = bytes(data)
+    try:
+        value, pos = _unpack(data, 0, 0)
+    except (IndexError, struct_error):
+        raise MsgPackError("Unexpected end of data")
+    except (UnicodeDecodeError, TypeError) as e:
+        raise MsgPackError(str(e))
+    if pos != len(data):
+        raise MsgPackError("Extra data after the encoded object" if pos < len(data) else "Unexpected end of data")
+    return value
@@ -1,3 +1,5 @@
+import re
+from functools import lru_cache
 from typing import Any
 
 def import_class(module_path: str) -> Any:
@@ -6,6 +8,12 @@ def import_class(module_path: str) -> Any:
     module = import_module(module_name)
     return getattr(module, class_name, None)
 
+@lru_cache(maxsize=None)
+def cached_import_class(module_path: str) -> Any:
+    """Same as `import_class`, the result is cached per path, use it for settings resolved on
+    every request"""
+    return import_class(module_path)
+
 def get_class_name(obj):
     return obj.__class__.__name__
 
@@ -13,9 +21,38 @@ def get_class_fields(_class):
     return [attr for attr in dir(_class) if not callable(getattr(_class, attr)) and not attr.startswith("__") and not attr.startswith("_")]
 
 
+_first_cap_re = re.compile('(.)([A-Z][a-z]+)')
+_all_cap_re = re.compile('([a-z0-9])([A-Z])')
+
+@lru_cache(maxsize=1024)
 def camel_to_snake(name):
-    import re
     # Find all uppercase letters and add an underscore before them
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    s1 = _first_cap_re.sub(r'\1_\2', name)
     # Convert the entire string to lowercase
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    return _all_cap_re.sub(r'\1_\2', s1).lower()
+
+
+def lazy_module(package: str, attributes: dict):
+    """Returns the module `__getattr__` and `__dir__` (PEP 562) of `package` importing
+    `attributes`, mapping each name to the submodule defining it, on first access.
+
+    ```py
+    __getattr__, __dir__ = lazy_module(__name__, {'Linker': '.linker'})
+    ```
+    """
+    from importlib import import_module
+    import sys
+
+    def __getattr__(name):
+        submodule = attributes.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(submodule, package), name)
+        # Cache the attribute so `__getattr__` isn't called again
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
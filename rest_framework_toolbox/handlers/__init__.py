@@ -1,8 +1,29 @@
-from .error_handler import (
-    exception_handler,
-    ErrorHandler,
-)
+"""
+rest_framework_toolbox[handlers]
+================================
 
-from .linker import Linker
+The handlers are imported on first access, `import rest_framework_toolbox.handlers` doesn't
+import DRF.
+"""
+from rest_framework_toolbox.core.utils import lazy_module
 
-from .renderer import RestJsonRenderer
+_attributes = {
+    'exception_handler': '.error_handler',
+    'ErrorHandler': '.error_handler',
+    'ErrorContext': '.error_handler',
+    'CrashRecord': '.error_handler',
+    'CrashReporter': '.error_handler',
+    'Linker': '.linker',
+    'CursorPage': '.linker',
+    'RestJsonRenderer': '.renderer',
+    'RestMsgPackRenderer': '.renderer',
+    'NDJSONRenderer': '.renderer',
+    'NDJSONStreamingResponse': '.renderer',
+    'PaginatedStreamingResponse': '.renderer',
+    'MsgPackParser': '.parser',
+    'ServerTiming': '.timing',
+}
+
+__all__ = list(_attributes)
+
+__getattr__, __dir__ = lazy_module(__name__, _attributes)
@@ -1,2 +1,8 @@
 from .main import ErrorHandler
-from .error_handler import exception_handler
\ No newline at end of file
+from .context import ErrorContext
+from .error_handler import exception_handler
+from .crash import CrashRecord, CrashReporter
+from .response_cache import ErrorResponseCache, error_response_cache
+from .breaker import LogBreaker
+from .validation import format_validation_errors, TRUNCATION_MARKER
+from .signals import ErrorSignals
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+
+__all__ = [
+    'LogBreaker',
+]
+
+CLOSED = 'closed'
+OPEN = 'open'
+
+
+class _Circuit:
+    __slots__ = ('state', 'window_start', 'count', 'rate', 'suppressed', 'opened_at', 'summary_at')
+
+    def __init__(self, now):
+        self.state = CLOSED
+        self.window_start = now
+        self.count = 0
+        self.rate = 0.0
+        self.suppressed = 0
+        self.opened_at = None
+        self.summary_at = now
+
+
+class LogBreaker:
+    """Protects logs from exception storms.
+
+    Exceptions are counted per (exception class, view class) in windows of `window` seconds.
+    When more than `threshold` exceptions happen within a window, the circuit of that pair
+    opens: the logging and crash reporting side effects of its exceptions are skipped, and a
+    summary with the count of skipped exceptions is logged once per window instead. The
+    circuit closes once a window goes by with at most `threshold / 2` exceptions, averaged
+    over the time since the window started, or once no exception happened for two windows.
+
+    Settings:
+    - `ERROR_HANDLER_BREAKER_THRESHOLD`: exceptions per window opening a circuit, defaults to
+      `100`, `0` disables the breaker
+    - `ERROR_HANDLER_BREAKER_WINDOW`: window in seconds, defaults to `10`
+    """
+    def __init__(self, logger, threshold=100, window=10.0):
+        self.logger = logger
+        self.threshold = threshold
+        self.window = window
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, logger) -> 'LogBreaker':
+        return cls(
+            logger,
+            threshold=getattr(settings, 'ERROR_HANDLER_BREAKER_THRESHOLD', 100),
+            window=getattr(settings, 'ERROR_HANDLER_BREAKER_WINDOW', 10.0),
+        )
+
+    def allow(self, key: Tuple[str, str]) -> bool:
+        """Counts an exception, returns whether its side effects should run"""
+        if not self.threshold:
+            return True
+
+        now = time.monotonic()
+        summary = None
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit(now)
+
+            elapsed = now - circuit.window_start
+            if elapsed >= self.window:
+                circuit.rate = circuit.count / elapsed
+                # The count is the one of the last active window, however long ago it was
+                quiet = elapsed >= 2 * self.window or circuit.rate * self.window <= self.threshold // 2
+                if circuit.state == OPEN and quiet:
+                    circuit.state = CLOSED
+                    summary = self._take_summary(key, circuit, now, recovered=True)
+                circuit.window_start = now
+                circuit.count = 0
+
+            circuit.count += 1
+            if circuit.state == CLOSED and circuit.count > self.threshold:
+                circuit.state = OPEN
+                circuit.opened_at = now
+                circuit.summary_at = now
+
+            allowed = circuit.state == CLOSED
+            if not allowed:
+                circuit.suppressed += 1
+                if now - circuit.summary_at >= self.window:
+                    summary = self._take_summary(key, circuit, now)
+
+        if summary:
+            self._log_summary(*summary)
+        return allowed
+
+    def _take_summary(self, key, circuit, now, recovered=False):
+        if not circuit.suppressed and not recovered:
+            return None
+        summary = (key, circuit.suppressed, now - circuit.summary_at, recovered)
+        circuit.suppressed = 0
+        circuit.summary_at = now
+        return summary
+
+    def _log_summary(self, key, suppressed, period, recovered):
+        exception, view = key
+        self.logger.log(
+            logging.WARNING,
+            '%d %s exceptions raised in %s were not logged in the last %.0f seconds%s',
+            suppressed, exception, view, period, ', logging resumed' if recovered else '',
+            extra={'error_summary': {
+                'exception': exception,
+                'view': view,
+                'suppressed': suppressed,
+                'period': period,
+                'recovered': recovered,
+            }},
+        )
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Returns the state of every circuit, keyed by `<exception class>:<view class>`"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f'{exception}:{view}': {
+                    'state': circuit.state,
+                    'count': circuit.count,
+                    'rate': circuit.rate,
+                    'suppressed': circuit.suppressed,
+                    'open_for': now - circuit.opened_at if circuit.state == OPEN else 0.0,
+                }
+                for (exception, view), circuit in self._circuits.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._circuits.clear()
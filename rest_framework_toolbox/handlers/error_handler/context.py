@@ -0,0 +1,27 @@
+from typing import Any, Dict, NamedTuple, Optional
+
+__all__ = [
+    'ErrorContext',
+]
+
+
+class ErrorContext(NamedTuple):
+    """Immutable state of a single exception being handled.
+
+    It is built per exception and passed along the handling steps, so a single `ErrorHandler`
+    can be shared by concurrent threads and coroutines.
+    """
+    exc: Exception
+    context: Dict
+    response: Any = None
+    error_model: Optional[type] = None
+    # Whether the logging and crash reporting side effects are skipped, see `LogBreaker`
+    suppressed: bool = False
+
+    @property
+    def view(self):
+        return (self.context or {}).get('view', None)
+
+    @property
+    def request(self):
+        return (self.context or {}).get('request', None)
@@ -0,0 +1,272 @@
+import hashlib
+import logging
+import queue
+import threading
+import time
+import traceback
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+__all__ = [
+    'CrashRecord',
+    'CrashReporter',
+]
+
+logger = logging.getLogger('rest_framework_toolbox.crash')
+
+# Shortest wait of the worker between two flushes of the suppressed crashes, so a window of
+# zero doesn't spin the worker
+MIN_FLUSH_INTERVAL = 1.0
+
+
+class CrashRecord(NamedTuple):
+    """Structured crash report, captured cheaply in the request thread and formatted by the
+    reporter's worker thread"""
+    fingerprint: str
+    exception: str
+    message: str
+    frames: Tuple[Tuple[str, int, str], ...]
+    method: Optional[str] = None
+    uri: Optional[str] = None
+    view: Optional[str] = None
+    request_data: Any = None
+    request_meta: Optional[Dict] = None
+    exc: Optional[BaseException] = None
+    timestamp: float = 0.0
+    # Raised by the error handler itself while handling `exc`
+    handler_exc: Optional[BaseException] = None
+
+    @staticmethod
+    def fingerprint_for(exc_class, frames) -> str:
+        """Identifies crashes by exception class and traceback frames, line numbers excluded so
+        unrelated edits in the same functions don't change it"""
+        key = repr((exc_class.__module__, exc_class.__qualname__, [(f, n) for f, _, n in frames]))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def capture(cls, ctx, handler_exc: Optional[BaseException] = None) -> 'CrashRecord':
+        """Captures the crash of the exception of `ctx`, which identifies it. `handler_exc`, the
+        exception raised by the error handler itself while handling it, is only reported along"""
+        exc = ctx.exc
+        frames = []
+        tb = getattr(exc, '__traceback__', None)
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            frames.append((code.co_filename, tb.tb_lineno, code.co_name))
+            tb = tb.tb_next
+        frames = tuple(frames)
+
+        request = ctx.request
+        view = ctx.view
+        method = uri = request_data = request_meta = None
+        if request is not None:
+            method = getattr(request, 'method', None)
+            uri = getattr(request, 'path_info', None)
+            try:
+                request_data = request.data
+            except Exception:
+                request_data = None
+            request_meta = getattr(request, 'META', None)
+
+        return cls(
+            fingerprint=cls.fingerprint_for(exc.__class__, frames),
+            exception=exc.__class__.__name__,
+            message=str(exc),
+            frames=frames,
+            method=method,
+            uri=uri,
+            view=view.__class__.__name__ if view is not None else None,
+            request_data=request_data,
+            request_meta=request_meta,
+            exc=exc,
+            timestamp=time.time(),
+            handler_exc=handler_exc,
+        )
+
+    def format(self, suppressed=0) -> str:
+        if self.exc is not None:
+            traceback_str = ''.join(traceback.format_exception(self.exc.__class__, self.exc, self.exc.__traceback__))
+        else:
+            traceback_str = ''.join(traceback.format_list(self.frames))
+        if self.handler_exc is not None:
+            traceback_str += "\nError handler traceback:\n" + ''.join(traceback.format_exception(
+                self.handler_exc.__class__, self.handler_exc, self.handler_exc.__traceback__))
+        return (
+            "--- Error crash report --- "
+            f"\nError context:\n"
+            "------------------\n"
+            f"Fingerprint:\n{self.fingerprint}\n\n"
+            f"Request Header:\n{self.method} {self.uri}\n\n"
+            f"Request Data:\n{self.request_data}\n\n"
+            f"Request META:\n{self.request_meta}\n\n"
+            f"Action Name:\n{self.view}\n\n"
+            f"Exception Class:\n{self.exception}\n\n"
+            f"Similar crashes suppressed:\n{suppressed}\n\n"
+            f"Traceback Record:\n{traceback_str}\n\n"
+        )
+
+
+class _Fingerprint:
+    __slots__ = ('window_start', 'reported', 'suppressed', 'record')
+
+    def __init__(self, now):
+        self.window_start = now
+        self.reported = 0
+        self.suppressed = 0
+        self.record = None
+
+
+class CrashReporter:
+    """Deduplicates, rate limits and writes crash reports off the request path.
+
+    Crashes are grouped by fingerprint. Within a window of `window` seconds, at most
+    `rate_limit` reports are written per fingerprint, the other occurrences are counted and
+    the count is reported with the next report, or in a summary once the window is over.
+
+    Reports are formatted and logged by a background thread fed through a bounded queue,
+    reports are dropped (and counted in `dropped`) when the queue is full.
+
+    Settings:
+    - `ERROR_HANDLER_CRASH_WINDOW`: window in seconds, defaults to `60`
+    - `ERROR_HANDLER_CRASH_RATE_LIMIT`: reports per fingerprint per window, defaults to `1`
+    - `ERROR_HANDLER_CRASH_QUEUE_SIZE`: size of the queue, defaults to `1000`
+    """
+    _reporters = {}
+    _reporters_lock = threading.Lock()
+
+    def __init__(self, logger, window=60.0, rate_limit=1, queue_size=1000):
+        self.logger = logger
+        self.window = window
+        self.rate_limit = rate_limit
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        self._worker = None
+
+    @classmethod
+    def for_logger(cls, logger) -> 'CrashReporter':
+        """Returns the reporter writing to `logger`, a single reporter and worker thread is used
+        per logger"""
+        key = id(logger)
+        reporter = cls._reporters.get(key)
+        if reporter is None:
+            with cls._reporters_lock:
+                reporter = cls._reporters.get(key)
+                if reporter is None:
+                    reporter = cls(
+                        logger,
+                        window=getattr(settings, 'ERROR_HANDLER_CRASH_WINDOW', 60.0),
+                        rate_limit=getattr(settings, 'ERROR_HANDLER_CRASH_RATE_LIMIT', 1),
+                        queue_size=getattr(settings, 'ERROR_HANDLER_CRASH_QUEUE_SIZE', 1000),
+                    )
+                    cls._reporters[key] = reporter
+        return reporter
+
+    def report(self, record: CrashRecord) -> bool:
+        """Enqueues `record` unless its fingerprint is over the rate limit.
+
+        Returns:
+            bool: whether the record is going to be written
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._fingerprints.get(record.fingerprint)
+            if state is None:
+                state = self._fingerprints[record.fingerprint] = _Fingerprint(now)
+            elif now - state.window_start >= self.window:
+                state.window_start = now
+                state.reported = 0
+            if state.reported >= self.rate_limit:
+                state.suppressed += 1
+                state.record = record
+                return False
+            state.reported += 1
+            suppressed = state.suppressed
+            state.suppressed = 0
+            state.record = None
+
+        return self._enqueue((record, suppressed))
+
+    def _enqueue(self, item) -> bool:
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run, name='rest_framework_toolbox_crash_reporter', daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=max(self.window, MIN_FLUSH_INTERVAL))
+            except queue.Empty:
+                item = None
+            if item is not None:
+                try:
+                    self._write(*item)
+                except Exception:
+                    logger.exception("Crash report %s could not be written", item[0].fingerprint)
+                finally:
+                    self.queue.task_done()
+            if time.monotonic() - last_flush >= self.window:
+                self.flush_suppressed()
+                last_flush = time.monotonic()
+
+    def _write(self, record: CrashRecord, suppressed: int):
+        self.logger.error(record.format(suppressed), extra={
+            'crash_report': {
+                'fingerprint': record.fingerprint,
+                'exception': record.exception,
+                'message': record.message,
+                'method': record.method,
+                'uri': record.uri,
+                'view': record.view,
+                'handler_exception': record.handler_exc.__class__.__name__ if record.handler_exc else None,
+                'suppressed': suppressed,
+            }
+        })
+
+    def flush_suppressed(self):
+        """Writes the last suppressed record of the fingerprints whose window is over, with the
+        count of suppressed occurrences"""
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            for fingerprint, state in list(self._fingerprints.items()):
+                if now - state.window_start < self.window:
+                    continue
+                if state.suppressed:
+                    summaries.append((state.record, state.suppressed))
+                    state.window_start = now
+                    state.reported = 0
+                    state.suppressed = 0
+                    state.record = None
+                else:
+                    # Forget idle fingerprints so the table doesn't grow unbounded
+                    del self._fingerprints[fingerprint]
+        for summary in summaries:
+            self._enqueue(summary)
+
+    def join(self):
+        """Blocks until every enqueued report is written"""
+        self.queue.join()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                fingerprint: {'reported': state.reported, 'suppressed': state.suppressed}
+                for fingerprint, state in self._fingerprints.items()
+            }
@@ -1,50 +1,91 @@
 from rest_framework.views import exception_handler as drf_exception_handler
 from django.conf import settings
-from rest_framework_toolbox.core.utils import import_class
+from rest_framework_toolbox.core.utils import cached_import_class
 from rest_framework_toolbox.core.models import JSONModel
 from .main import ErrorHandler
+from .response_cache import error_response_cache
+from .validation import format_validation_errors
+from ..timing import ServerTiming
+from rest_framework_toolbox.metrics.main import metrics_enabled, errors_total
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 
 __all__ = [
     'exception_handler',
     
 ]
 
-handler = ErrorHandler()
-
 def get_error_model(view = None):
     if view and hasattr(view, 'error_model'):
         return view.error_model
     elif getattr(settings, 'ERROR_JSON_MODEL', None):
-        return import_class(settings.ERROR_JSON_MODEL)
+        return cached_import_class(settings.ERROR_JSON_MODEL)
     else:
         raise Exception("A global error json model must be set")
+
+
+def count_error(exc, context, status_code):
+    if metrics_enabled():
+        view = (context or {}).get('view', None)
+        errors_total.inc(exc.__class__.__name__, view.__class__.__name__, str(status_code))
     
 def exception_handler(exc, context):
+    handler = ErrorHandler.default()
+    ctx = None
+    # Exceptions that aren't API exceptions aren't handled, it isn't a failure of the handler
+    unhandled = False
     try:
         # WARNING: Don't remove the default handler as it performs DB rollback
         response = drf_exception_handler(exc, context)
+        unhandled = response is None
         assert response, "DRF Exception handler didn't return a response, this could be due to the exception thrown is not an instance of excpetions.APIException"
         error_model = get_error_model(view = context['view'])
         assert error_model, "Error JSON model not found"
         assert issubclass(error_model, JSONModel), f"error class: {error_model.__class__.__name__} must be an extension to JSONModel"
+        if isinstance(exc, ValidationError) and isinstance(exc.detail, (list, dict)):
+            # Bulk endpoints can raise thousands of nested errors, handlers get a bounded copy
+            response.data = format_validation_errors(exc.detail)
+        
+        # The context is built once, it counts the exception in the log breaker
+        ctx = handler.build_context(exc, context, response, error_model)
+        
+        # Static errors are served from their pre-rendered envelope
+        cache_key = error_response_cache.key(exc, context, error_model)
+        if cache_key is not None:
+            cached = error_response_cache.get(cache_key)
+            if cached is not None:
+                handler._post_handling_processing(ctx)
+                headers = dict(response.headers)
+                headers.update(getattr(exc, 'headers', None) or {})
+                count_error(exc, context, response.status_code)
+                return error_response_cache.build_response(cached, headers)
         
-        handler.error_model = error_model
-        error_res = handler._handle(exc, context, response)
+        timing = ServerTiming.for_response(response)
+        with timing.phase('error_handler'):
+            error_res = handler._handle(exc, context, response, error_model=error_model, ctx=ctx)
         assert error_res, "Error handler did not return a response"
         assert isinstance(error_res, error_model), f"handler response must be an instance of {settings.ERROR_JSON_MODEL}"
         
-        response.data = error_res.to_dict()
+        with timing.phase('error_to_dict'):
+            response.data = error_res.to_dict()
         if getattr(exc, 'headers', None):
             response.headers.update(exc.headers)
         if getattr(exc, 'callback', None):
             response.add_post_render_callback(exc.callback)
+        if cache_key is not None:
+            error_response_cache.set(cache_key, response, context['request'])
+        # The renderer completes the header and emits the record, this covers other renderers
+        timing.finish(response, emit=False)
+        count_error(exc, context, response.status_code)
         
         return response
         
     except Exception as e:
-        handler.context = context
-        handler.exc = exc
+        # The context is only built here when the failure happened before it was built
+        if ctx is None:
+            ctx = handler.build_context(exc, context)
+        if handler.signals:
+            handler.signals.send('failure', ctx, error=e)
         if settings.DEBUG:
             import traceback
             status_code = 500
@@ -54,13 +95,14 @@ def exception_handler(exc, context):
                 'traceback': traceback.format_exc()
             }
         else:
-            handler.report_crash()
+            handler.report_crash(ctx, None if unhandled else e)
             status_code = 500
             data = {
                 'code': 'system_error',
                 'details': 'An unexpected error occurred, and it is being investigated now.'
             }
         
+        count_error(exc, context, status_code)
         return Response(
             status=status_code,
             data=data
@@ -0,0 +1,158 @@
+import logging
+import random
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+
+__all__ = [
+    'LogPolicy',
+    'resolve_log_policy',
+    'validate_log_policies',
+    'build_error_event',
+]
+
+
+class LogPolicy(NamedTuple):
+    """How handled exceptions of a class are logged"""
+    level: int = logging.WARNING
+    # Fraction of the exceptions that are logged
+    sample_rate: float = 1.0
+    # Maximum length of the request data and META representations
+    max_size: int = 2048
+    # Whether the traceback is captured
+    traceback: bool = False
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+
+def _parse_policy(options: Dict, strict: bool = False) -> LogPolicy:
+    """Builds the policy of an `ERROR_HANDLER_LOG_POLICIES` entry, an unknown level raises
+    `ImproperlyConfigured` when `strict`, the default level is used otherwise"""
+    level = options.get('level', LogPolicy._field_defaults['level'])
+    if isinstance(level, str):
+        # `getLevelName` returns a string for unknown names
+        level = logging.getLevelName(level.upper())
+    if not isinstance(level, int):
+        if strict:
+            raise ImproperlyConfigured(
+                f"Unknown log level {options['level']!r} in ERROR_HANDLER_LOG_POLICIES")
+        level = LogPolicy._field_defaults['level']
+    return LogPolicy(
+        level=level,
+        sample_rate=options.get('sample_rate', LogPolicy._field_defaults['sample_rate']),
+        max_size=options.get('max_size', LogPolicy._field_defaults['max_size']),
+        traceback=options.get('traceback', LogPolicy._field_defaults['traceback']),
+    )
+
+
+def validate_log_policies():
+    """Checks every entry of `ERROR_HANDLER_LOG_POLICIES`, so a misconfiguration is reported
+    when the app starts rather than while handling an exception.
+
+    Raises:
+        ImproperlyConfigured: when a level is unknown
+    """
+    policies = getattr(settings, 'ERROR_HANDLER_LOG_POLICIES', None) or {}
+    for options in policies.values():
+        _parse_policy(options, strict=True)
+
+
+@lru_cache(maxsize=1024)
+def resolve_log_policy(exc_class) -> LogPolicy:
+    """Returns the policy of the closest class in the MRO of `exc_class` configured in
+    `ERROR_HANDLER_LOG_POLICIES`, or the `'default'` entry. The entries are checked by
+    `validate_log_policies` when the handler is configured, an unknown level is never raised
+    from here.
+
+    ```py
+    ERROR_HANDLER_LOG_POLICIES = {
+        'default': {'level': 'WARNING', 'max_size': 2048},
+        'ValidationError': {'level': 'INFO', 'sample_rate': 0.1},
+        'NotFound': {'level': 'DEBUG'},
+        'APIException': {'traceback': True},
+    }
+    ```
+    """
+    policies = getattr(settings, 'ERROR_HANDLER_LOG_POLICIES', None) or {}
+    for klass in exc_class.__mro__:
+        if klass.__name__ in policies:
+            return _parse_policy(policies[klass.__name__])
+    return _parse_policy(policies.get('default', {}))
+
+
+def _clear_policies(setting, **kwds):
+    if setting == 'ERROR_HANDLER_LOG_POLICIES':
+        resolve_log_policy.cache_clear()
+
+
+setting_changed.connect(_clear_policies)
+
+
+def _bounded_repr(value: Any, limit: int) -> str:
+    """`repr` of `value`, containers and strings stop being represented once `limit`
+    characters are reached"""
+    if isinstance(value, (str, bytes)):
+        return repr(value[:limit])
+    if isinstance(value, Mapping):
+        opening, closing = '{', '}'
+        items = value.items()
+    elif isinstance(value, list):
+        opening, closing = '[', ']'
+        items = value
+    elif isinstance(value, tuple):
+        opening, closing = '(', ',)' if len(value) == 1 else ')'
+        items = value
+    else:
+        return repr(value)
+
+    text = opening
+    for item in items:
+        if len(text) > limit:
+            break
+        if len(text) > 1:
+            text += ', '
+        if isinstance(value, Mapping):
+            key, item = item
+            text += _bounded_repr(key, limit) + ': '
+        text += _bounded_repr(item, limit - len(text))
+    return text + closing
+
+
+def _capped(value: Any, max_size: int) -> Optional[str]:
+    if value is None:
+        return None
+    text = _bounded_repr(value, max_size + 1)
+    if len(text) > max_size:
+        return f'{text[:max_size]}... (truncated)'
+    return text
+
+
+def build_error_event(ctx, policy: LogPolicy) -> Dict:
+    """Builds the structured event of a handled exception, it should only be called once the
+    logger is known to be enabled for the policy level"""
+    request = ctx.request
+    view = ctx.view
+    try:
+        req_data = request.data
+    except Exception:
+        req_data = None
+
+    event = {
+        'view': view.__class__.__name__,
+        'exception': ctx.exc.__class__.__name__,
+        'status_code': getattr(ctx.response, 'status_code', None),
+        'method': getattr(request, 'method', None),
+        'uri': getattr(request, 'path_info', None),
+        'data': _capped(req_data, policy.max_size),
+        'meta': _capped(getattr(request, 'META', None), policy.max_size),
+    }
+    if policy.traceback:
+        import traceback
+        exc = ctx.exc
+        event['traceback'] = ''.join(traceback.format_exception(exc.__class__, exc, exc.__traceback__))
+    return event
@@ -1,8 +1,20 @@
-from typing import Any, Dict, TypeVar, Callable
+import threading
+from functools import lru_cache
+from typing import Any, Dict, TypeVar, Callable, NamedTuple, Optional
 from rest_framework_toolbox.core.models import JSONModel
-from rest_framework_toolbox.core.utils import import_class, get_class_fields, camel_to_snake
+from rest_framework_toolbox.core.utils import import_class, cached_import_class, get_class_fields, camel_to_snake
+from rest_framework_toolbox.core.aio import call_hook, queued_logger
 
+from ..timing import ServerTiming
 from ._config import configs
+from .context import ErrorContext
+from .crash import CrashRecord, CrashReporter
+from .log_policy import resolve_log_policy, build_error_event, validate_log_policies
+from .response_cache import error_response_cache
+from .breaker import LogBreaker
+from .validation import format_validation_errors
+from .signals import ErrorSignals
+from rest_framework_toolbox.metrics.main import metrics_enabled, error_dispatch_total
 
 import logging
 
@@ -24,6 +36,43 @@ if __testing:
     Response = TypeVar("Response")
 
 
+class Dispatch(NamedTuple):
+    """Handlers resolved for an (exception class, error model, view class) triple"""
+    # Handler registered with `ErrorHandler.register_handler`
+    user_handler: Optional[Callable]
+    # Name of the error model method handling the exception, e.g. `not_found`
+    default_handler: Optional[str]
+    # Whether the error model handler takes precedence over the view's `on_error`
+    default_first: bool
+    # Whether the view defines `on_error`
+    on_error: bool
+
+
+@lru_cache(maxsize=1024)
+def _resolve_dispatch(handler_class, exc_class, error_model, view_class) -> Dispatch:
+    user_handler = None
+    default_handler = None
+    default_first = False
+
+    # Walk the MRO so subclasses of a handled exception are handled as well
+    for klass in exc_class.__mro__:
+        name = klass.__name__
+        if user_handler is None and name in handler_class._user_handlers:
+            user_handler = handler_class._user_handlers[name]
+        if default_handler is None and name in handler_class._default_handlers:
+            method_name = camel_to_snake(name)
+            if callable(getattr(error_model, method_name, None)):
+                default_handler = method_name
+                default_first = name in handler_class._early_default_handlers
+
+    return Dispatch(
+        user_handler,
+        default_handler,
+        default_first,
+        callable(getattr(view_class, 'on_error', None)),
+    )
+
+
 # def register_handler(exception_class):
 #         def decorator(func):
 #             ErrorHandler._user_handlers[exception_class.__name__] = func
@@ -45,8 +94,18 @@ class ErrorHandler:
         'Http404',
     ]
 
+    # Handled by the error model before the view's `on_error`, as they are not APIExceptions
+    _early_default_handlers = (
+        'Http404',
+        'ServiceUnavailable',
+    )
+
     _user_handlers = {}
 
+    # Handler shared by every exception, see `ErrorHandler.default`
+    _default = None
+    _default_lock = threading.Lock()
+
     class Config:
         use_drf_handler = False
 
@@ -55,29 +114,93 @@ class ErrorHandler:
             assert issubclass(
                 error_model, JSONModel), "error_model must be an extension to JSONModel"
         self.error_model = error_model
-        self.context = None
-        self.exc = None
-        self.response = None
         self.logger = ErrorHandler.register_logger()
         self.crash_logger = ErrorHandler.register_crash_logger()
+        self.crash_reporter = CrashReporter.for_logger(self.crash_logger)
+        self.breaker = LogBreaker.from_settings(self.logger)
         self.signals = ErrorHandler.register_signals()
 
+    @classmethod
+    def default(cls) -> 'ErrorHandler':
+        """Returns the handler shared by every exception.
+
+        Its loggers, crash reporter and signals are resolved from the settings once, when the
+        app is ready or on first use. The handler is stateless, the state of the exception
+        being handled is kept in an `ErrorContext`.
+        """
+        handler = cls._default
+        if handler is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+                handler = cls._default
+        return handler
+
+    @classmethod
+    def configure(cls) -> 'ErrorHandler':
+        """Rebuilds the shared handler from the settings.
+
+        Raises:
+            ImproperlyConfigured: when `ERROR_HANDLER_LOG_POLICIES` is invalid
+        """
+        validate_log_policies()
+        with cls._default_lock:
+            cls._default = cls()
+        cached_import_class.cache_clear()
+        cls.invalidate_dispatch()
+        return cls._default
+
+    @classmethod
+    def breaker_state(cls) -> Dict[str, Dict]:
+        """Returns the state of the shared handler's log breaker circuits"""
+        return cls.default().breaker.snapshot()
+
+    def build_context(self, exc, context: Dict, response=None, error_model=None) -> ErrorContext:
+        """Builds the context of an exception, counting it in the log breaker, and sends the
+        `init` signal"""
+        view = (context or {}).get('view', None)
+        allowed = self.breaker.allow((exc.__class__.__name__, view.__class__.__name__))
+        ctx = ErrorContext(exc, context, response, error_model or self.error_model, not allowed)
+        if self.signals:
+            self.signals.send('init', ctx)
+        return ctx
+
     @classmethod
     def register_handler(cls, exception_class):
         def decorator(func):
             cls._user_handlers[exception_class.__name__] = func
+            cls.invalidate_dispatch()
             return func
         return decorator
 
+    @classmethod
+    def resolve_dispatch(cls, exc_class, error_model, view_class) -> Dispatch:
+        """Returns the handlers of an exception class, resolved once and cached"""
+        return _resolve_dispatch(cls, exc_class, error_model, view_class)
+
+    @staticmethod
+    def invalidate_dispatch():
+        """Clears the dispatch cache and the cached error responses, call it after changing the
+        handlers tables"""
+        _resolve_dispatch.cache_clear()
+        error_response_cache.clear()
+
     @classmethod
     def register_exception(cls, exception: APIException):
         @cls.register_handler(exception)
         def handler(exc, context, res):
             res.message = exc.outcome
-            res.data = {
-                'code': exc.get_full_details()['code'],
-                'details': exc.get_full_details()['message']
-            }
+            details = format_validation_errors(exc.detail, full=True)
+            if isinstance(exc.detail, (list, dict)):
+                res.data = {
+                    'code': exc.default_code,
+                    'details': details
+                }
+            else:
+                res.data = {
+                    'code': details['code'],
+                    'details': details['message']
+                }
 
             return res
 
@@ -91,33 +214,36 @@ class ErrorHandler:
         if view and hasattr(view, 'error_model'):
             return view.error_model
         elif getattr(settings, 'ERROR_JSON_MODEL', None):
-            return import_class(settings.ERROR_JSON_MODEL)
+            return cached_import_class(settings.ERROR_JSON_MODEL)
         else:
             raise Exception("A global error json model must be set")
 
     @classmethod
     def register_signals(self):
-        signals = getattr(settings, 'ERROR_HANDLER_SIGNALS', None)
-
-        if type(signals) == list:
-            return signals
+        return ErrorSignals.from_settings()
 
     @classmethod
     def register_logger(self):
         logger = getattr(settings, 'ERROR_HANDLER_LOGGER', None)
 
         if logger:
-            return import_class(logger)
-        return logging.getLogger('rest_framework_toolbox_error_logger')
+            return self._queued(import_class(logger))
+        return self._queued(logging.getLogger('rest_framework_toolbox_error_logger'))
 
     @classmethod
     def register_crash_logger(self):
         crash_logger = getattr(settings, 'ERROR_HANDLER_CRASH_LOGGER', None)
 
         if crash_logger:
-            return import_class(crash_logger)
+            return self._queued(import_class(crash_logger))
         else:
-            return logging.getLogger('rest_framework_toolbox_crash_logger')
+            return self._queued(logging.getLogger('rest_framework_toolbox_crash_logger'))
+
+    @staticmethod
+    def _queued(logger):
+        if getattr(settings, 'QUEUED_LOGGING', False) and isinstance(logger, logging.Logger):
+            return queued_logger(logger)
+        return logger
 
     def _convert_to_apiexception(self, exc):
         return APIException(
@@ -139,40 +265,35 @@ class ErrorHandler:
     def override_default_handler(self, exception_name: str, handler: Callable) -> None:
         self._default_handlers[exception_name] = handler
 
-    def _handle_with_registered_handler(self, exception_name: str, exc, context, response):
-        if exception_name in self._user_handlers:
-            user_handler = self._user_handlers[exception_name]
-            # User handler must return an instance of `self.error_model` class
-            error_res = user_handler(exc, context, response)
-            assert isinstance(
-                error_res, self.error_model), "User-defined handler must return an instance of the error model"
+    def _handle_with_registered_handler(self, ctx: ErrorContext, user_handler: Callable):
+        # User handler must return an instance of the error model class
+        error_res = user_handler(ctx.exc, ctx.context, ctx.response)
+        assert isinstance(
+            error_res, ctx.error_model), "User-defined handler must return an instance of the error model"
+
+        return error_res
 
+    def _handle_with_predefined_handler(self, ctx: ErrorContext, method_name: str):
+        # Handle default exception using handler defined in the error model
+        handler = getattr(ctx.error_model(), method_name)
+        error_res = handler(ctx.request, ctx.response)
+        if error_res:
+            assert isinstance(error_res, ctx.error_model), \
+                "User-defined handler must return an instance of the error model"
             return error_res
 
         return None
 
-    def _handle_with_predefined_handler(self, exception_class: str, exc, context, response):
-        if exception_class in self._default_handlers:
-            # print("Handling default exception")
-            error_res = self.error_model()
-
-            # Handle default exception using handler defined in error_res
-            if getattr(error_res, camel_to_snake(exception_class), None):
-                handler = getattr(
-                    error_res, camel_to_snake(exception_class), None)
-                if callable(handler):
-                    error_res = handler(context['request'], response)
-                    if error_res:
-                        assert isinstance(error_res, self.error_model), \
-                            "User-defined handler must return an instance of the error model"
-                        return error_res
-
-            return None
-
-    def _handle(self, exc: APIException, context: Dict, response: Response) -> JSONModel:
+    def _handle(self, exc: APIException, context: Dict, response: Response, error_model=None,
+                ctx: Optional[ErrorContext] = None) -> JSONModel:
         """
         Django REST API Error handler
 
+        The handler doesn't keep any state of the exception being handled, it is carried by an
+        `ErrorContext` built per call, so a single handler can be shared by concurrent requests.
+        `error_model` defaults to the error model the handler was constructed with, `ctx` is the
+        context already built by the caller, if any.
+
         In the upcoming sections, between parantheses defined the phase name, in which a signal can be registered
 
         # Handling API exceptions goes in these phases:
@@ -211,143 +332,135 @@ class ErrorHandler:
         ---------------------------
 
         """
-        self.context = context
-        self.exc = exc
-        if response:
-            self.response = response
-        view = context.get('view', None)
-        exception_class = exc.__class__.__name__
+        if ctx is None:
+            ctx = self.build_context(exc, context, response, error_model)
+        view = ctx.view
         error_res = None
 
         assert view, "View is required to handle exceptions"
-        assert self.error_model, "Error model is required to handle exceptions"
+        assert ctx.error_model, "Error model is required to handle exceptions"
         
+        dispatch = self.resolve_dispatch(exc.__class__, ctx.error_model, view.__class__)
+        timing = ServerTiming.for_response(response)
+        crash_reported = False
+
         if response.status_code > 499:
-            self.report_crash()
+            with timing.phase('crash_report'):
+                self.report_crash(ctx)
+            crash_reported = True
 
         # 1. Check if the user registered any custom handler against the exception
-        error_res = self._handle_with_registered_handler(
-            exception_class, exc, context, response)
-        if error_res:
-            self._post_handling_processing()
-            return error_res
-
-        # If the error is an instance of Http404 which is a standard exception but not an APIException
-        if exception_class == 'Http404':
-            error_res = self._handle_with_predefined_handler(
-                exception_class, exc, context, response)
-
+        if dispatch.user_handler:
+            error_res = self._handle_with_registered_handler(ctx, dispatch.user_handler)
             if error_res:
-                self._post_handling_processing()
+                self._count_dispatch(ctx, 'registered')
+                self._post_handling_processing(ctx, error_res)
                 return error_res
 
-        elif exception_class == 'ServiceUnavailable':
-            error_res = self._handle_with_predefined_handler(
-                exception_class, exc, context, response)
+        # Exceptions which are not APIExceptions, such as Http404, are handled by the error model first
+        if dispatch.default_handler and dispatch.default_first:
+            error_res = self._handle_with_predefined_handler(ctx, dispatch.default_handler)
 
             if error_res:
-                self._post_handling_processing()
+                self._count_dispatch(ctx, 'error_model')
+                self._post_handling_processing(ctx, error_res)
                 return error_res
 
         # 2. Check if the exception can be handled by view's 'on_error' method
-        if getattr(view, 'on_error', None) and isinstance(exc, APIException):
-            serializer_error_handler = getattr(view, 'on_error', None)
-            if serializer_error_handler and callable(serializer_error_handler):
-                error_res = serializer_error_handler(exc, context, response)
+        if dispatch.on_error and isinstance(exc, APIException):
+            error_res = call_hook(view.on_error, exc, context, response)
 
             if error_res:
-                assert isinstance(error_res, self.error_model), \
+                assert isinstance(error_res, ctx.error_model), \
                     "User-defined handler must return an instance of the error model"
-                self._post_handling_processing()
+                self._count_dispatch(ctx, 'on_error')
+                self._post_handling_processing(ctx, error_res)
                 return error_res
 
         # 3. Fallback to default handlers defined in error_res if no `on_error` is defined
-        error_res = self._handle_with_predefined_handler(
-            exception_class, exc, context, response)
+        if dispatch.default_handler and not dispatch.default_first:
+            error_res = self._handle_with_predefined_handler(ctx, dispatch.default_handler)
 
         if error_res:
-            self._post_handling_processing()
+            self._count_dispatch(ctx, 'error_model')
+            self._post_handling_processing(ctx, error_res)
             return error_res
 
         # 3. If no handler is defined, handle the error using the exception class user supplied attributes
         else:
-            self.report_crash()
-            error_res = self.error_model()
+            if not crash_reported:
+                with timing.phase('crash_report'):
+                    self.report_crash(ctx)
+            error_res = ctx.error_model()
 
         # 4. Postprocessing
         if error_res:
-            self._post_handling_processing()
+            self._count_dispatch(ctx, 'fallback')
+            self._post_handling_processing(ctx, error_res)
             return error_res
         else:
             raise Exception(f"Error could not be handled:\n{str(exc)}")
 
-    def _post_handling_processing(self):
-        view = None
-        request = None
-        if self.context:
-            view = self.context.get('view', None)
-            request = self.context.get('request', None)
-        if view and request:
-            try:
-                req_data = request.data
-            except:
-                req_data = None
-                req_method = None
-                uri = None
-                meta = None
-            req_method = getattr(request, 'method', None)
-            uri = getattr(request, 'path_info', None)
-            meta = getattr(request, 'META', None)
-            
-            import traceback
-
-            self.logger.warn(
-                f'Exception raised in {view.__class__.__name__} during handling {req_method} {uri} {req_data} {meta} - Taceback: {traceback.format_exc()}')
-
-    def report_crash(self):
-        import traceback
-        traceback_str = traceback.format_exc()
-        request = self.context.get('request', None)
-        method = None
-
-        if request:
-            method = request.method
-            req_data = getattr(request, 'data', None)
-            req_meta = getattr(request, 'META', None)
-            request = request.build_absolute_uri()
+    @staticmethod
+    def _count_dispatch(ctx: ErrorContext, handler: str):
+        if metrics_enabled():
+            error_dispatch_total.inc(ctx.exc.__class__.__name__, handler)
+
+    def _post_handling_processing(self, ctx: ErrorContext, error_res=None):
+        if self.signals:
+            self.signals.send('error_handling', ctx, error_response=error_res)
+        if ctx.suppressed:
+            return
+        with ServerTiming.for_response(ctx.response).phase('error_log'):
+            self._log_handled_error(ctx)
+
+    def _log_handled_error(self, ctx: ErrorContext):
+        """Logs a structured event of the handled exception.
+
+        The event is only built if the logger is enabled for the level of the exception's
+        `LogPolicy`, and the exception is sampled.
+        """
+        view = ctx.view
+        request = ctx.request
+        if not (view and request):
+            return
+
+        policy = resolve_log_policy(ctx.exc.__class__)
+        is_enabled = getattr(self.logger, 'isEnabledFor', None)
+        if is_enabled and not is_enabled(policy.level):
+            return
+        if not policy.sampled():
+            return
+
+        event = build_error_event(ctx, policy)
+        self.logger.log(
+            policy.level,
+            'Exception %s raised in %s during handling %s %s',
+            event['exception'], event['view'], event['method'], event['uri'],
+            extra={'error_event': event},
+        )
 
-        view = self.context.get('view', None)
-        
-        if view:
-            view = view.__class__.__name__
-            
-        exception_name = self.exc.__class__.__name__
-        
-        self.crash_logger.error(
-                            "--- Error crash report --- "
-                            f"\nError context:\n" 
-                            "------------------\n"
-                            f"Request Header:\n{method} {request}\n\n"
-                            f"Request Data:\n{req_data}\n\n"
-                            f"Request META:\n{req_meta}\n\n"
-                            f"Action Name:\n{view}\n\n"
-                            f"Exception Class:\n{exception_name}\n\n"
-                            f"Traceback Record:\n{traceback_str}\n\n"
-                            )
+    def report_crash(self, ctx: ErrorContext, handler_exc: Optional[BaseException] = None):
+        """Captures a structured crash record of the exception of `ctx`, along with `handler_exc`
+        when the error handler itself failed, it is deduplicated and written by the crash
+        reporter's background thread"""
+        if ctx.suppressed:
+            return
+        self.crash_reporter.report(CrashRecord.capture(ctx, handler_exc))
 
     @staticmethod
     def handle_exception(exc, context) -> Response:
         print(f"Handling exception: {exc.__class__.__name__}")
         # WARNING: Don't remove the default handler as it performs DB rollback and init headers
-        self = ErrorHandler()
+        self = ErrorHandler.default()
         response = drf_exception_handler(exc, context)
-        self.error_model = self.get_error_model(view=context['view'])
-        assert self.error_model, "Error model must be set"
+        error_model = self.get_error_model(view=context['view'])
+        assert error_model, "Error model must be set"
         assert issubclass(
-            self.error_model, JSONModel), "error_model must be an extension to JSONModel"
+            error_model, JSONModel), "error_model must be an extension to JSONModel"
 
         try:
-            error_res = self._handle(exc, context, response)
+            error_res = self._handle(exc, context, response, error_model=error_model)
             if error_res:
                 response.data = error_res.to_dict()
                 if getattr(exc, 'headers', None):
@@ -363,3 +476,14 @@ class ErrorHandler:
                 'details': 'An unexpected error occurred during handling an error.'
             }
             return response
+
+
+def _reset_default_handler(setting, **kwds):
+    if setting.startswith('ERROR_HANDLER_') or setting in ('ERROR_JSON_MODEL', 'QUEUED_LOGGING'):
+        ErrorHandler._default = None
+        cached_import_class.cache_clear()
+
+
+if not __testing:
+    from django.core.signals import setting_changed
+    setting_changed.connect(_reset_default_handler)
@@ -0,0 +1,130 @@
+import copy
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from rest_framework.response import Response
+
+__all__ = [
+    'ErrorResponseCache',
+    'error_response_cache',
+]
+
+# Caching is opt-in, as the `on_error` of a view may depend on the request
+DEFAULT_STATIC_ERRORS = ()
+
+
+class CachedErrorResponse(NamedTuple):
+    data: Any
+    content: bytes
+    status: int
+
+
+@lru_cache(maxsize=1024)
+def is_static_error(exc_class) -> bool:
+    """Whether the class, or one of its bases, is listed in `ERROR_HANDLER_STATIC_ERRORS`"""
+    static_errors = getattr(settings, 'ERROR_HANDLER_STATIC_ERRORS', DEFAULT_STATIC_ERRORS)
+    return any(klass.__name__ in static_errors for klass in exc_class.__mro__)
+
+
+class ErrorResponseCache:
+    """Bounded LRU cache of encoded error responses.
+
+    Static errors produce the same envelope for a given error model and exception detail, so
+    their envelope and encoded bytes are cached, keyed by (error model, view class, exception
+    class, detail, code, status, renderer class, accepted media type), and served without
+    going through the error handler again. Dynamic headers set by DRF or the exception (e.g.
+    `Retry-After`, `WWW-Authenticate`) are merged into every response.
+
+    Cached responses still go through the toolbox renderer, which logs them, records their
+    timing and metrics, and writes the cached bytes rather than encoding the envelope again.
+    Responses negotiated with other renderers are not cached.
+
+    The cache is opt-in: only exceptions listed in `ERROR_HANDLER_STATIC_ERRORS`, subclasses
+    included, are cached, so handlers of these exceptions must only depend on the exception,
+    e.g. `('NotFound', 'Http404', 'MethodNotAllowed', 'NotAuthenticated', 'Throttled')`.
+    `ERROR_HANDLER_STATIC_ERRORS_CACHE_SIZE` bounds the cache, `1024` responses by default.
+    """
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, exc, context, error_model) -> Optional[Hashable]:
+        """Returns the cache key of the exception, or `None` if its response can't be cached"""
+        if not is_static_error(exc.__class__) or getattr(exc, 'callback', None):
+            return None
+        detail = getattr(exc, 'detail', None)
+        if detail is None:
+            detail = str(exc)
+        elif not isinstance(detail, str):
+            return None
+
+        request = context.get('request', None)
+        renderer = getattr(request, 'accepted_renderer', None)
+        # Only the toolbox renderers, which encode with `encode`, can write the cached bytes
+        if not callable(getattr(renderer, 'encode', None)):
+            return None
+
+        return (
+            error_model,
+            context.get('view', None).__class__,
+            exc.__class__,
+            str(detail),
+            getattr(detail, 'code', None),
+            getattr(exc, 'status_code', None),
+            renderer.__class__,
+            getattr(request, 'accepted_media_type', None),
+        )
+
+    def get(self, key) -> Optional[CachedErrorResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, response, request):
+        """Encodes the data of `response` with the request's renderer, and caches it"""
+        # Error envelopes are not wrapped by the toolbox renderers, they are only encoded
+        content = request.accepted_renderer.encode(response.data, request.accepted_media_type, {})
+        # The response being cached is still handed to the middlewares, which may edit its data
+        entry = CachedErrorResponse(copy.deepcopy(response.data), content, response.status_code)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def build_response(self, entry: CachedErrorResponse, headers=None) -> Response:
+        """Returns the response of a cached entry, the renderer writes `cached_content`. Each
+        response gets its own copy of the data, editing it leaves the cache untouched"""
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() != 'content-type'}
+        response = Response(copy.deepcopy(entry.data), status=entry.status, headers=headers)
+        response.cached_content = entry.content
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+error_response_cache = ErrorResponseCache(
+    maxsize=getattr(settings, 'ERROR_HANDLER_STATIC_ERRORS_CACHE_SIZE', 1024)
+)
+
+
+def _clear_cache(setting, **kwds):
+    if setting == 'ERROR_HANDLER_STATIC_ERRORS':
+        is_static_error.cache_clear()
+        error_response_cache.clear()
+
+
+setting_changed.connect(_clear_cache)
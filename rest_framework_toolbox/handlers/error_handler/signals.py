@@ -0,0 +1,127 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from django.conf import settings
+
+from rest_framework_toolbox.core.aio import call_hook
+from rest_framework_toolbox.core.utils import import_class
+
+__all__ = [
+    'PHASES',
+    'Receiver',
+    'ErrorSignals',
+]
+
+PHASES = ('init', 'error_handling', 'failure')
+
+INLINE = 'inline'
+BACKGROUND = 'background'
+
+logger = logging.getLogger('rest_framework_toolbox.signals')
+
+
+class Receiver(NamedTuple):
+    func: Callable
+    phases: Tuple[str, ...]
+    delivery: str = INLINE
+
+
+def _parse_receiver(entry) -> Receiver:
+    if not isinstance(entry, dict):
+        entry = {'receiver': entry}
+    func = entry['receiver']
+    if isinstance(func, str):
+        func = import_class(func)
+    phases = entry.get('phase', PHASES)
+    if isinstance(phases, str):
+        phases = (phases,)
+    for phase in phases:
+        assert phase in PHASES, f"Unknown error handler phase: {phase}, expected one of {PHASES}"
+    delivery = entry.get('delivery', INLINE)
+    assert delivery in (INLINE, BACKGROUND), f"Unknown signal delivery: {delivery}"
+    return Receiver(func, tuple(phases), delivery)
+
+
+class ErrorSignals:
+    """Receivers of the error handler phases, resolved once from `ERROR_HANDLER_SIGNALS`.
+
+    Receivers are called with the phase name and the `ErrorContext` of the exception, plus
+    `error_response` (the error model instance, `None` for cached static errors) in the
+    `error_handling` phase, and `error` (the exception raised while handling) in the `failure`
+    phase. They can be coroutine functions.
+
+    Inline receivers are called in the request thread. Background receivers are submitted to
+    a thread pool of `ERROR_HANDLER_SIGNALS_WORKERS` threads (`2` by default) holding at most
+    `ERROR_HANDLER_SIGNALS_QUEUE_SIZE` pending calls (`1000` by default), calls are dropped
+    (and counted in `dropped`) when it's full, and skipped for the exceptions silenced by the
+    log breaker. Inline receivers are called for every exception: they are part of handling
+    the request, e.g. they annotate the response or the transaction, the breaker only guards
+    the side effects that can pile up, and `ctx.suppressed` tells them the exception is
+    silenced. Exceptions raised by receivers are logged and never reach the response.
+    """
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, receivers: List[Receiver] = (), queue_size=1000):
+        self.receivers = {phase: tuple(r for r in receivers if phase in r.phases) for phase in PHASES}
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._pending = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> 'ErrorSignals':
+        entries = getattr(settings, 'ERROR_HANDLER_SIGNALS', None) or []
+        return cls(
+            [_parse_receiver(entry) for entry in entries],
+            queue_size=getattr(settings, 'ERROR_HANDLER_SIGNALS_QUEUE_SIZE', 1000),
+        )
+
+    def __bool__(self):
+        return any(self.receivers.values())
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Thread pool shared by the background receivers of every handler"""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=getattr(settings, 'ERROR_HANDLER_SIGNALS_WORKERS', 2),
+                        thread_name_prefix='rest_framework_toolbox_signals',
+                    )
+        return cls._executor
+
+    def send(self, phase: str, ctx, **kwds):
+        for receiver in self.receivers[phase]:
+            if receiver.delivery == INLINE:
+                self._call(receiver.func, phase, ctx, kwds)
+            elif not ctx.suppressed:
+                self._submit(receiver.func, phase, ctx, kwds)
+
+    def _call(self, func, phase, ctx, kwds):
+        try:
+            call_hook(func, phase, ctx, **kwds)
+        except Exception:
+            logger.exception("Error handler signal receiver %r failed in phase %s", func, phase)
+
+    def _submit(self, func, phase, ctx, kwds):
+        if not self._pending.acquire(blocking=False):
+            with self._lock:
+                self.dropped += 1
+            return
+        try:
+            future = self.executor().submit(self._call, func, phase, ctx, kwds)
+        except RuntimeError:
+            # The executor is shut down, the interpreter is exiting
+            self._pending.release()
+            return
+        future.add_done_callback(lambda _: self._pending.release())
+
+    def snapshot(self) -> Dict:
+        return {
+            'receivers': {phase: len(receivers) for phase, receivers in self.receivers.items()},
+            'dropped': self.dropped,
+        }
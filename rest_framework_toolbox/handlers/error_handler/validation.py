@@ -0,0 +1,85 @@
+from typing import Any, Optional
+
+from django.conf import settings
+
+__all__ = [
+    'TRUNCATION_MARKER',
+    'format_validation_errors',
+]
+
+# Key holding the number of entries left out of a truncated list or dict
+TRUNCATION_MARKER = '__truncated__'
+
+
+class _Budget:
+    __slots__ = ('left',)
+
+    def __init__(self, left):
+        self.left = left
+
+
+def _leaf(detail, full):
+    if full:
+        return {'message': str(detail), 'code': getattr(detail, 'code', None)}
+    return detail
+
+
+def _walk(detail, depth, max_depth, budget, full):
+    if isinstance(detail, dict):
+        if depth >= max_depth:
+            return {TRUNCATION_MARKER: len(detail)}
+        result = {}
+        walked = 0
+        for key, value in detail.items():
+            if budget.left <= 0:
+                break
+            result[key] = _walk(value, depth + 1, max_depth, budget, full)
+            walked += 1
+        if walked < len(detail):
+            result[TRUNCATION_MARKER] = len(detail) - walked
+        return result
+
+    if isinstance(detail, (list, tuple)):
+        if depth >= max_depth:
+            return [{TRUNCATION_MARKER: len(detail)}]
+        result = []
+        for value in detail:
+            if budget.left <= 0:
+                break
+            result.append(_walk(value, depth + 1, max_depth, budget, full))
+        if len(result) < len(detail):
+            result.append({TRUNCATION_MARKER: len(detail) - len(result)})
+        return result
+
+    budget.left -= 1
+    return _leaf(detail, full)
+
+
+def format_validation_errors(detail: Any, max_items: Optional[int] = None, max_depth: Optional[int] = None,
+                             full: bool = False) -> Any:
+    """Formats the detail tree of a `ValidationError` in a single pass, bounded in size.
+
+    At most `max_items` error messages are kept, the lists and dicts with entries left out get
+    a `TRUNCATION_MARKER` entry with the number of entries left out, lists and dicts nested
+    deeper than `max_depth` are replaced by such an entry:
+
+    ```py
+    format_validation_errors([{'name': ['required']}, {'name': ['required']}], max_items=1)
+    # [{'name': ['required']}, {'__truncated__': 1}]
+    ```
+
+    Args:
+        detail (Any): `exc.detail`, or the `response.data` set by DRF
+        max_items (int): defaults to `ERROR_HANDLER_VALIDATION_MAX_ITEMS`, or `100`
+        max_depth (int): defaults to `ERROR_HANDLER_VALIDATION_MAX_DEPTH`, or `10`
+        full (bool): formats the messages as `{'message': ..., 'code': ...}`, as
+            `get_full_details()` does, rather than keeping the `ErrorDetail` strings
+
+    Returns:
+        Any: the formatted tree, made of dicts, lists and messages only
+    """
+    if max_items is None:
+        max_items = getattr(settings, 'ERROR_HANDLER_VALIDATION_MAX_ITEMS', 100)
+    if max_depth is None:
+        max_depth = getattr(settings, 'ERROR_HANDLER_VALIDATION_MAX_DEPTH', 10)
+    return _walk(detail, 0, max_depth, _Budget(max_items), full)
@@ -0,0 +1,142 @@
+import decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.core import signing
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+__all__ = [
+    'Cursor',
+    'CursorPage',
+    'paginate',
+]
+
+CURSOR_SALT = 'rest_framework_toolbox.cursor'
+
+
+class Cursor(NamedTuple):
+    """Position in a keyset: the values of the ordering columns of a row, and whether the page
+    is read backwards, before that row"""
+    values: Tuple[Any, ...]
+    reverse: bool = False
+
+    def encode(self) -> str:
+        """Returns the opaque, signed representation of the cursor"""
+        values = [
+            value if value is None or isinstance(value, (bool, int, float, str)) else str(value)
+            for value in self.values
+        ]
+        return signing.dumps([values, int(self.reverse)], salt=CURSOR_SALT, compress=True)
+
+    @classmethod
+    def decode(cls, token: str, fields) -> 'Cursor':
+        """Reads a cursor, `fields` are the model fields of the ordering columns.
+
+        Raises:
+            NotFound: when the cursor was tampered with or doesn't match the ordering
+        """
+        try:
+            values, reverse = signing.loads(token, salt=CURSOR_SALT)
+            if len(values) != len(fields):
+                raise ValueError(values)
+            values = tuple(
+                field.to_python(value) if value is not None else None
+                for field, value in zip(fields, values)
+            )
+        except (signing.BadSignature, ValueError, TypeError, decimal.InvalidOperation):
+            raise NotFound('Invalid cursor')
+        return cls(values, bool(reverse))
+
+
+class CursorPage(NamedTuple):
+    """A page read from a keyset cursor, `links` holds the `self`, `next` and `prev` links as
+    `{'href': url}`, `None` when there is no such page"""
+    items: List[Any]
+    links: Dict[str, Optional[Dict[str, str]]]
+    has_next: bool
+    has_prev: bool
+
+
+def _ordering(queryset, ordering: Sequence[str]) -> List[Tuple[str, bool]]:
+    """Returns the (field name, descending) pairs of `ordering`, ending with the primary key so
+    that the keyset is unique"""
+    pairs = []
+    for name in ordering:
+        descending = name.startswith('-')
+        pairs.append((name.lstrip('-'), descending))
+    pk = queryset.model._meta.pk
+    if not any(name in ('pk', pk.name) for name, _ in pairs):
+        pairs.append((pk.name, pairs[-1][1] if pairs else False))
+    return pairs
+
+
+def _after(pairs, values, reverse) -> Q:
+    """Builds `a >= x & ((a > x) | (a = x & b > y) | ...)`, with `<` for descending columns,
+    flipped when reading backwards. The leading range lets the database use an index on the
+    ordering columns"""
+    condition = Q()
+    equal = Q()
+    for (name, descending), value in zip(pairs, values):
+        lookup = 'lt' if descending != reverse else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    name, descending = pairs[0]
+    return Q(**{f"{name}__{'lte' if descending != reverse else 'gte'}": values[0]}) & condition
+
+
+def paginate(request, queryset, ordering: Sequence[str] = ('pk',), page_size: Optional[int] = None,
+             cursor_query_param: str = 'cursor') -> CursorPage:
+    """Reads the page of `queryset` pointed by the cursor of `request`.
+
+    `page_size + 1` rows are read to know if there are more, no `COUNT(*)` query is performed.
+    The ordering columns must not be null, the primary key is added to them when missing.
+    """
+    page_size = page_size or api_settings.PAGE_SIZE
+    assert page_size, "A page size is required for cursor pagination"
+    pairs = _ordering(queryset, ordering)
+    fields = [queryset.model._meta.get_field(name) if name != 'pk' else queryset.model._meta.pk
+              for name, _ in pairs]
+
+    query_params = getattr(request, 'query_params', None) or request.GET
+    token = query_params.get(cursor_query_param)
+    cursor = Cursor.decode(token, fields) if token else None
+    reverse = cursor.reverse if cursor else False
+
+    order_by = [('-' if descending != reverse else '') + name for name, descending in pairs]
+    if cursor:
+        queryset = queryset.filter(_after(pairs, cursor.values, reverse))
+    rows = list(queryset.order_by(*order_by)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    # Reading forward from a cursor there are rows before it, reading backwards there are rows
+    # after it
+    has_next = has_more if not reverse else True
+    has_prev = has_more if reverse else cursor is not None
+
+    def position(row, backwards):
+        values = tuple(getattr(row, field.attname) for field in fields)
+        return Cursor(values, backwards).encode()
+
+    url = request.build_absolute_uri()
+    next_link = prev_link = None
+    if rows and has_next:
+        next_link = replace_query_param(url, cursor_query_param, position(rows[-1], False))
+    if rows and has_prev:
+        prev_link = replace_query_param(url, cursor_query_param, position(rows[0], True))
+    elif has_prev:
+        prev_link = remove_query_param(url, cursor_query_param)
+    return CursorPage(
+        items=rows,
+        links={
+            'self': {'href': url},
+            'next': {'href': next_link} if next_link else None,
+            'prev': {'href': prev_link} if prev_link else None,
+        },
+        has_next=has_next,
+        has_prev=has_prev,
+    )
@@ -1,10 +1,247 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import quote
 
+from django.core.signals import setting_changed
+from django.db.models import QuerySet
+from django.urls import NoReverseMatch, get_resolver, get_script_prefix, get_urlconf
+from django.urls.resolvers import get_ns_resolver
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
+from django.utils.translation import get_language
+
+from .cursor import CursorPage, paginate
+
+__all__ = ['Linker', 'URLCandidate', 'URLTemplate']
+
+
+class URLCandidate(NamedTuple):
+    """A URL pattern of a view compiled to a format template, formatting it with `%` is what
+    `reverse()` does once it found the pattern"""
+    template: str
+    params: Tuple[str, ...]
+    converters: Dict[str, Any]
+    pattern: str
+    defaults: Dict[str, Any]
+
+    def format(self, script_prefix: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Returns the URL, or `None` when the values don't match the pattern"""
+        if any(kwargs.get(name, value) != value for name, value in self.defaults.items()):
+            return None
+        subs = {}
+        for name, value in kwargs.items():
+            converter = self.converters.get(name)
+            try:
+                subs[name] = converter.to_url(value) if converter else str(value)
+            except ValueError:
+                return None
+        candidate = script_prefix.replace('%', '%%') + self.template
+        url = candidate % subs
+        if not _compile(script_prefix, self.pattern).search(url):
+            return None
+        return escape_leading_slashes(quote(url, safe=RFC3986_SUBDELIMS + '/~:@'))
+
+
+class URLTemplate(NamedTuple):
+    """The URL patterns of a view taking a set of keyword arguments, tried in the order
+    `reverse()` tries them"""
+    viewname: str
+    candidates: Tuple[URLCandidate, ...]
+
+    def format(self, script_prefix: str, kwargs: Dict[str, Any]) -> str:
+        for candidate in self.candidates:
+            url = candidate.format(script_prefix, kwargs)
+            if url is not None:
+                return url
+        raise NoReverseMatch(f"Reverse for '{self.viewname}' with keyword arguments {kwargs} not found")
+
+
+@lru_cache(maxsize=1024)
+def _compile(script_prefix, pattern):
+    return re.compile('^%s%s' % (re.escape(script_prefix), pattern))
+
+
+def _namespace_resolver(viewname: str, urlconf):
+    """Returns the resolver of the namespaces of `viewname` and the name of the view, as
+    `reverse()` resolves them without a current app"""
+    resolver = get_resolver(urlconf)
+    *path, view = viewname.split(':')
+    ns_pattern = ''
+    ns_converters = {}
+    for ns in path:
+        app_list = resolver.app_dict.get(ns)
+        if app_list and ns not in app_list:
+            ns = app_list[0]
+        try:
+            extra, resolver = resolver.namespace_dict[ns]
+        except KeyError:
+            raise NoReverseMatch(f"{ns} is not a registered namespace")
+        ns_pattern += extra
+        ns_converters.update(resolver.pattern.converters)
+    if ns_pattern:
+        resolver = get_ns_resolver(ns_pattern, resolver, tuple(ns_converters.items()))
+    return resolver, view
+
+
+@lru_cache(maxsize=1024)
+def _url_template(viewname: str, urlconf, params: Tuple[str, ...], language: Optional[str]) -> URLTemplate:
+    # The reverse dict of the resolver is built per active language, `language` is only part
+    # of the cache key
+    resolver, view = _namespace_resolver(viewname, urlconf)
+    candidates = []
+    for possibility, pattern, defaults, converters in resolver.reverse_dict.getlist(view):
+        for result, result_params in possibility:
+            if set(params).symmetric_difference(result_params).difference(defaults):
+                continue
+            candidates.append(URLCandidate(result, tuple(result_params), dict(converters), pattern, dict(defaults)))
+    if not candidates:
+        raise NoReverseMatch(
+            f"Reverse for '{viewname}' with keyword arguments {params} not found")
+    return URLTemplate(viewname, tuple(candidates))
+
+
+def _clear_url_templates(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _url_template.cache_clear()
+
+
+setting_changed.connect(_clear_url_templates)
 
-__all__ = ['Linker']
 
 class Linker:
+    """Builds the links of your envelopes.
+
+    URL patterns are compiled to format templates once per view name and parameters, and
+    the scheme and host of the request are computed once per request, so the links of a
+    whole list are built without calling `reverse()` for every item:
+
+    ```py
+    Linker.links(request, 'order-detail', [1, 2, 3])
+    # ['https://api.example.com/orders/1', 'https://api.example.com/orders/2', ...]
+
+    Linker.attach(request, serializer.data, 'order-detail')
+    # every item gets {'links': {'self': {'href': 'https://api.example.com/orders/1'}}}
+
+    Linker.related(request, Order.objects.all(), {'customer': 'customer-detail'}, self_view='order-detail')
+    # {1: {'self': {'href': '.../orders/1'}, 'customer': {'href': '.../customers/7'}}, ...}
+
+    page = Linker.paginate(request, Order.objects.all(), ordering=('-created', 'pk'))
+    # page.links: {'self': {'href': ...}, 'next': {'href': '...?cursor=<signed cursor>'}, 'prev': None}
+    ```
+    """
     @staticmethod
     def self_link(request, *args, **kwds):
         return {
             'href': request.build_absolute_uri()
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def template(viewname: str, params: Iterable[str] = ('pk',), urlconf=None) -> URLTemplate:
+        """Returns the compiled templates of `viewname` taking the `params` keyword arguments, in
+        the active language"""
+        return _url_template(viewname, urlconf or get_urlconf(), tuple(sorted(params)), get_language())
+
+    @staticmethod
+    def prefix(request) -> str:
+        """Returns the scheme and host of `request`, computed once per request"""
+        prefix = getattr(request, '_linker_prefix', None)
+        if prefix is None:
+            prefix = request.build_absolute_uri('/')[:-1]
+            request._linker_prefix = prefix
+        return prefix
+
+    @classmethod
+    def reverse(cls, request, viewname: str, urlconf=None, **kwargs) -> str:
+        """Same as `request.build_absolute_uri(reverse(viewname, kwargs=kwargs))`"""
+        template = cls.template(viewname, kwargs, urlconf)
+        return cls.prefix(request) + template.format(get_script_prefix(), kwargs)
+
+    @classmethod
+    def links(cls, request, viewname: str, values: Iterable[Any], kwarg: str = 'pk', urlconf=None,
+              **kwargs) -> List[str]:
+        """Returns the absolute URLs of `viewname` for each of `values`, passed as the `kwarg`
+        keyword argument, along with the other `kwargs`, e.g. the parent of nested routes"""
+        template = cls.template(viewname, (kwarg, *kwargs), urlconf)
+        prefix = cls.prefix(request)
+        script_prefix = get_script_prefix()
+        return [prefix + template.format(script_prefix, {**kwargs, kwarg: value}) for value in values]
+
+    @staticmethod
+    def paginate(request, queryset, ordering=('pk',), page_size=None, cursor_query_param='cursor') -> CursorPage:
+        """Reads a page of `queryset` from the signed keyset cursor of `request` and builds its
+        `next` and `prev` links, without counting the rows, see `cursor.paginate`"""
+        return paginate(request, queryset, ordering, page_size, cursor_query_param)
+
+    @classmethod
+    def attach(cls, request, items, viewname: str, rel: str = 'self', lookup: str = 'pk',
+               kwarg: Optional[str] = None, field: str = 'links', urlconf=None, **kwargs):
+        """Adds the `rel` link of `viewname` to the `field` links of every item.
+
+        Items are dicts or objects, e.g. `JSONModel` instances, whose `lookup` key or
+        attribute is passed as the `kwarg` keyword argument, `lookup` by default, with
+        `kwargs`. Declare `field` on your models, e.g. as a `DictField`, for the links to be
+        encoded.
+
+        Returns:
+            the items
+        """
+        items = list(items)
+        values = [item[lookup] if isinstance(item, dict) else getattr(item, lookup) for item in items]
+        urls = cls.links(request, viewname, values, kwarg or lookup, urlconf, **kwargs)
+        for item, url in zip(items, urls):
+            # The links are copied, the default value of a field is shared by the instances
+            if isinstance(item, dict):
+                item[field] = {**(item.get(field) or {}), rel: {'href': url}}
+            else:
+                setattr(item, field, {**(getattr(item, field, None) or {}), rel: {'href': url}})
+        return items
+
+    @classmethod
+    def related(cls, request, objects, relations: Dict[str, Union[str, Tuple[str, str]]],
+                self_view: Optional[str] = None, urlconf=None) -> Dict[Any, Dict[str, Optional[Dict]]]:
+        """Returns the links of the related resources of `objects`, by primary key.
+
+        `relations` maps the foreign keys of the model to the view name of the related
+        resource, or to a `(view name, keyword argument)` pair, the keyword argument being
+        `pk` by default. Only the primary keys and the foreign key columns are read, with a
+        single `values_list` query for a queryset, from the `<name>_id` attributes for model
+        instances, so the related objects are never loaded. Links of null foreign keys are
+        `None`. `self_view` adds the `self` link.
+
+        Raises:
+            ValueError: when a relation isn't a foreign key or a one to one field of the model
+        """
+        model = objects.model if isinstance(objects, QuerySet) else None
+        objects = objects if model else list(objects)
+        if model is None:
+            if not objects:
+                return {}
+            model = type(objects[0])
+
+        attnames = []
+        for name in relations:
+            field = model._meta.get_field(name)
+            if not (field.concrete and (field.many_to_one or field.one_to_one)):
+                raise ValueError(f"{model.__name__}.{name} is not a foreign key")
+            attnames.append(field.attname)
+
+        if isinstance(objects, QuerySet):
+            # The default ordering of the model may join other tables, it's useless here
+            if not objects.query.is_sliced:
+                objects = objects.order_by()
+            rows = list(objects.values_list('pk', *attnames))
+        else:
+            rows = [(obj.pk, *(getattr(obj, attname) for attname in attnames)) for obj in objects]
+
+        result = {row[0]: {} for row in rows}
+        if self_view:
+            for pk, url in zip(result, cls.links(request, self_view, list(result), urlconf=urlconf)):
+                result[pk]['self'] = {'href': url}
+
+        for index, (name, view) in enumerate(relations.items(), start=1):
+            viewname, kwarg = (view, 'pk') if isinstance(view, str) else view
+            values = [row[index] for row in rows if row[index] is not None]
+            urls = iter(cls.links(request, viewname, values, kwarg, urlconf))
+            for row in rows:
+                result[row[0]][name] = {'href': next(urls)} if row[index] is not None else None
+        return result
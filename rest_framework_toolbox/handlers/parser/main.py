@@ -0,0 +1,19 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from rest_framework_toolbox.core.msgpack import unpackb, MsgPackError
+
+__all__ = [
+    'MsgPackParser',
+]
+
+
+class MsgPackParser(BaseParser):
+    """Parses MessagePack request bodies, the counterpart of `RestMsgPackRenderer`"""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return unpackb(stream.read())
+        except MsgPackError as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
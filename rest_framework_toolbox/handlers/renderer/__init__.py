@@ -1 +1,4 @@
-from .main import RestJsonRenderer
\ No newline at end of file
+from .main import RestJsonRenderer
+from .msgpack import RestMsgPackRenderer
+from .ndjson import NDJSONRenderer, NDJSONStreamingResponse
+from .streaming import PaginatedStreamingResponse
@@ -1,7 +1,11 @@
 import logging
+import time
 from rest_framework.renderers import JSONRenderer
 from django.conf import settings
 from rest_framework_toolbox.core.utils import import_class
+from rest_framework_toolbox.core.aio import call_hook, queued_logger
+from ..timing import ServerTiming
+from rest_framework_toolbox.metrics.main import metrics_enabled, render_seconds
 
 __all__ = [
     'RestJsonRenderer'
@@ -19,6 +23,9 @@ def get_response_class(view = None):
         raise Exception("Must define a view-based or global JSON response model")
 
 class RestJsonRenderer(JSONRenderer):
+    # Whether `encode` accepts `JSONModel` instances, so the envelope is not converted to a dict
+    encodes_models = False
+
     def __init__(self, *args, **kwargs):
         super(RestJsonRenderer, self).__init__(*args, **kwargs)
         logger_obj = getattr(settings, 'JSON_RENDERER_LOGGER', None)
@@ -26,25 +33,58 @@ class RestJsonRenderer(JSONRenderer):
             self.logger = import_class(logger_obj)
         else:
             self.logger = logging.getLogger('rest_framework_toolbox')
+        if getattr(settings, 'QUEUED_LOGGING', False) and isinstance(self.logger, logging.Logger):
+            self.logger = queued_logger(self.logger)
         
     def render(self, data, accepted_media_type=None, renderer_context=None):
         response = getattr(renderer_context['view'], 'response', None)
         view = renderer_context.get('view', None)
         request = renderer_context.get('request', None)
-        get_success_response = getattr(view, 'on_success', None)
+        timing = ServerTiming.for_response(response)
+        started = time.perf_counter()
         
-        # Leave error response alone as it is handled by exception handler
-        if response.status_code >= 400:
-            self.post_rendering_actions(view, request, response.status_code, data)
-            return super(RestJsonRenderer, self).render(data, accepted_media_type, renderer_context)
+        response_data = self.get_response_data(data, view, request, response, timing)
         
-        elif renderer_context and get_success_response:
-            request =  renderer_context['view'].request
-            response_data = get_success_response(request, data).to_dict()
+        with timing.phase('log'):
             self.post_rendering_actions(view, request, response.status_code, data)
-            return super(RestJsonRenderer, self).render(response_data, accepted_media_type, renderer_context)
+        with timing.phase('encode'):
+            # Cached error responses carry their encoded bytes
+            ret = getattr(response, 'cached_content', None)
+            if ret is None:
+                ret = self.encode(response_data, accepted_media_type, renderer_context)
+        timing.finish(response, view=view, request=request)
+        self.observe(started, view, response)
+        return ret
+
+    def get_response_data(self, data, view, request, response, timing):
+        """Wraps `data` in the success envelope returned by the view's `on_success`.
+
+        Error responses are left alone as they are handled by the exception handler.
+        `on_success` may be a coroutine function, its result is awaited then.
+        """
+        get_success_response = getattr(view, 'on_success', None)
+        
+        if response.status_code >= 400 or not get_success_response:
+            return data
         
-        self.post_rendering_actions(view, request, response.status_code, data)
+        with timing.phase('on_success'):
+            success_response = call_hook(get_success_response, getattr(view, 'request', request), data)
+        return self._envelope(success_response, timing)
+
+    def _envelope(self, success_response, timing):
+        if self.encodes_models:
+            return success_response
+        with timing.phase('to_dict'):
+            return success_response.to_dict()
+
+    def observe(self, started, view, response):
+        """Records the render duration in the `rest_framework_toolbox_render_seconds` metric"""
+        if metrics_enabled():
+            render_seconds.observe(
+                time.perf_counter() - started,
+                self.__class__.__name__, view.__class__.__name__, str(response.status_code))
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None):
         return super(RestJsonRenderer, self).render(data, accepted_media_type, renderer_context)
 
     def post_rendering_actions(self, view, request, status_code, response):
@@ -0,0 +1,26 @@
+from rest_framework.utils import encoders
+
+from rest_framework_toolbox.core.msgpack import packb
+from .main import RestJsonRenderer
+
+__all__ = [
+    'RestMsgPackRenderer',
+]
+
+
+class RestMsgPackRenderer(RestJsonRenderer):
+    """Renders the same success and error envelopes as `RestJsonRenderer`, encoded as MessagePack.
+
+    It is selected by content negotiation when the client accepts `application/msgpack`.
+    The success envelope is encoded straight from the `JSONModel` returned by `on_success`.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encodes_models = True
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return packb(data, default=encoders.JSONEncoder().default)
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+from rest_framework_toolbox.core.aio import call_hook
+from rest_framework_toolbox.core.models import JSONModel
+from .streaming import buffered
+
+__all__ = [
+    'NDJSONRenderer',
+    'NDJSONStreamingResponse',
+]
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders records as newline delimited JSON (one JSON document per line).
+
+    Querysets are consumed with `iterator(chunk_size=...)`, which uses server-side cursors
+    on backends that support them, so memory stays constant whatever the size of the export.
+
+    The success envelope can be emitted as the first line (`'header'`) or the last line
+    (`'trailer'`) by setting `NDJSON_ENVELOPE` in your settings, or `ndjson_envelope` on
+    the view. It is built by calling the view's `on_success` with `None` as data, error
+    responses are rendered without it.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    encoder_class = encoders.JSONEncoder
+    chunk_size = 2000
+    buffer_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        return b''.join(self.stream(
+            data,
+            view=renderer_context.get('view', None),
+            request=renderer_context.get('request', None),
+            response=renderer_context.get('response', None),
+        ))
+
+    def get_envelope_position(self, view=None):
+        position = getattr(view, 'ndjson_envelope', None) or getattr(settings, 'NDJSON_ENVELOPE', None)
+        assert position in (None, 'header', 'trailer'), "NDJSON envelope must be either 'header' or 'trailer'"
+        return position
+
+    def get_envelope(self, view, request, response=None):
+        on_success = getattr(view, 'on_success', None)
+        # Error responses are built by the exception handler
+        if response is not None and (response.status_code >= 400 or getattr(response, 'exception', False)):
+            return None
+        if on_success:
+            return call_hook(on_success, request, None).to_dict()
+        return None
+
+    def iter_records(self, data, serializer_class=None, serializer_context=None, chunk_size=None):
+        if data is None:
+            return
+        if isinstance(data, QuerySet):
+            data = data.iterator(chunk_size=chunk_size or self.chunk_size)
+        elif isinstance(data, (dict, JSONModel)):
+            data = (data,)
+
+        # A single serializer instance is reused for every record
+        serializer = None
+        if serializer_class:
+            serializer = serializer_class(context=serializer_context or {})
+
+        for record in data:
+            if serializer:
+                record = serializer.to_representation(record)
+            elif isinstance(record, JSONModel):
+                record = record.to_dict()
+            yield record
+
+    def stream(self, data, view=None, request=None, serializer_class=None, chunk_size=None, response=None):
+        """Yields encoded lines, grouped in blocks of about `buffer_size` bytes.
+
+        The first line is yielded as soon as it is encoded so the time to first byte doesn't
+        depend on the size of the export.
+        """
+        return buffered(
+            self.iter_lines(data, view, request, serializer_class, chunk_size, response),
+            self.buffer_size
+        )
+
+    def iter_lines(self, data, view=None, request=None, serializer_class=None, chunk_size=None, response=None):
+        encode = self.encoder_class(ensure_ascii=False, separators=(',', ':')).encode
+        position = self.get_envelope_position(view)
+        envelope = self.get_envelope(view, request, response) if position else None
+        serializer_context = {'request': request, 'view': view}
+
+        if envelope is not None and position == 'header':
+            yield (encode(envelope) + '\n').encode('utf-8')
+
+        for record in self.iter_records(data, serializer_class, serializer_context, chunk_size):
+            yield (encode(record) + '\n').encode('utf-8')
+
+        if envelope is not None and position == 'trailer':
+            yield (encode(envelope) + '\n').encode('utf-8')
+
+
+class NDJSONStreamingResponse(StreamingHttpResponse):
+    """Streams an iterable or a queryset as NDJSON, bypassing DRF's response rendering.
+
+    ```py
+    class ExportView(APIView):
+        def get(self, request):
+            return NDJSONStreamingResponse(
+                Order.objects.all(), serializer_class=OrderSerializer, view=self, request=request)
+    ```
+    """
+    def __init__(self, data, serializer_class=None, view=None, request=None, chunk_size=None,
+                 renderer_class=NDJSONRenderer, **kwds):
+        renderer = renderer_class()
+        kwds.setdefault('content_type', renderer.media_type)
+        super().__init__(
+            renderer.stream(data, view=view, request=request,
+                            serializer_class=serializer_class, chunk_size=chunk_size),
+            **kwds
+        )
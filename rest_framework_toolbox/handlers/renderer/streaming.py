@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.db.models.query import ModelIterable
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from rest_framework_toolbox.core.aio import call_hook
+
+__all__ = [
+    'PaginatedStreamingResponse',
+    'buffered',
+]
+
+
+def buffered(chunks, buffer_size=64 * 1024):
+    """Groups `chunks` of bytes in blocks of about `buffer_size` bytes.
+
+    The first chunk is yielded right away so the time to first byte doesn't depend on the
+    size of the response.
+    """
+    chunks = iter(chunks)
+    for chunk in chunks:
+        yield chunk
+        break
+
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+
+    if buffer:
+        yield b''.join(buffer)
+
+
+class PaginatedStreamingResponse(StreamingHttpResponse):
+    """Streams a page of a queryset wrapped in the success envelope.
+
+    The envelope returned by the view's `on_success` (called with `None` as data) is written
+    first, then the page items as they are read from the database and serialized, and the
+    pagination links come last, as they are only known once the page is read. Links are
+    `{'href': url}`, as those of `Linker`, `None` when there is no such page:
+
+    ```json
+    {"status": true, "message": "...", "data": [{...}, {...}], "links": {"self": {"href": "..."}, "next": {"href": "..."}, "prev": null}}
+    ```
+
+    The page is read with `page_size + 1` rows to detect whether there is a next page, no
+    `COUNT(*)` query is performed. As with DRF's page number pagination, a page past the last
+    one raises `NotFound`, this is checked with an `exists()` query before anything is
+    written. The page size and the page query parameter are taken from
+    the view's paginator when it's a `PageNumberPagination`, from `PAGE_SIZE` otherwise.
+
+    The envelope fields holding the items and the links are named by `stream_data_field` and
+    `stream_links_field` on the view, or `SUCCESS_JSON_DATA_FIELD` and
+    `SUCCESS_JSON_LINKS_FIELD` in your settings, `data` and `links` by default.
+
+    It is a response rather than a mode of `RestJsonRenderer`: DRF renderers return the
+    whole body as bytes, which is what streaming avoids. Without `serializer_class`, rows are
+    encoded as they are, so the queryset must yield JSON encodable rows, e.g. with
+    `values()`, this is checked before anything is written.
+
+    ```py
+    class OrderListView(GenericAPIView):
+        def get(self, request):
+            return PaginatedStreamingResponse(
+                self.filter_queryset(self.get_queryset()),
+                serializer_class=self.get_serializer_class(), view=self, request=request)
+    ```
+    """
+    encoder_class = encoders.JSONEncoder
+    chunk_size = 500
+
+    def __init__(self, queryset, serializer_class=None, view=None, request=None, page_size=None,
+                 chunk_size=None, **kwds):
+        if serializer_class is None and issubclass(getattr(queryset, '_iterable_class', object), ModelIterable):
+            raise TypeError(
+                "Model instances can't be encoded, pass a serializer_class or a values() queryset")
+        kwds.setdefault('content_type', 'application/json')
+        self.view = view
+        self.request = request
+        self.paginator = getattr(view, 'paginator', None)
+        self.page_size = page_size or self.get_page_size()
+        self.page_number = self.get_page_number()
+        if self.page_size and self.page_number > 1:
+            offset = (self.page_number - 1) * self.page_size
+            if not queryset[offset:offset + 1].exists():
+                message = getattr(self.paginator, 'invalid_page_message', 'Invalid page.')
+                raise NotFound(message.format(page_number=self.page_number, message='That page contains no results'))
+        self.chunk_size = chunk_size or self.chunk_size
+        self.has_next = False
+        super().__init__(
+            buffered(self.stream(queryset, serializer_class)),
+            **kwds
+        )
+
+    def get_page_size(self):
+        if isinstance(self.paginator, PageNumberPagination):
+            return self.paginator.get_page_size(self.request)
+        return api_settings.PAGE_SIZE
+
+    @property
+    def page_query_param(self):
+        return getattr(self.paginator, 'page_query_param', 'page')
+
+    def get_page_number(self):
+        query_params = getattr(self.request, 'query_params', None) or getattr(self.request, 'GET', {})
+        try:
+            return max(int(query_params.get(self.page_query_param, 1)), 1)
+        except (TypeError, ValueError):
+            return 1
+
+    def get_field_name(self, attr, setting, default):
+        return getattr(self.view, attr, None) or getattr(settings, setting, default)
+
+    def get_envelope(self):
+        on_success = getattr(self.view, 'on_success', None)
+        if on_success:
+            return call_hook(on_success, self.request, None).to_dict()
+        return {}
+
+    def get_links(self):
+        url = self.request.build_absolute_uri()
+        next_link = None
+        prev_link = None
+        if self.has_next:
+            next_link = replace_query_param(url, self.page_query_param, self.page_number + 1)
+        if self.page_number == 2:
+            prev_link = remove_query_param(url, self.page_query_param)
+        elif self.page_number > 2:
+            prev_link = replace_query_param(url, self.page_query_param, self.page_number - 1)
+        return {
+            'self': {'href': url},
+            'next': {'href': next_link} if next_link else None,
+            'prev': {'href': prev_link} if prev_link else None,
+        }
+
+    def iter_items(self, queryset, serializer_class):
+        if not self.page_size:
+            rows = queryset.iterator(chunk_size=self.chunk_size)
+        else:
+            offset = (self.page_number - 1) * self.page_size
+            rows = queryset[offset:offset + self.page_size + 1].iterator(chunk_size=self.chunk_size)
+
+        # A single serializer instance is reused for every row
+        serializer = None
+        if serializer_class:
+            serializer = serializer_class(context={'request': self.request, 'view': self.view})
+
+        for index, row in enumerate(rows):
+            if self.page_size and index == self.page_size:
+                self.has_next = True
+                break
+            yield serializer.to_representation(row) if serializer else row
+
+    def stream(self, queryset, serializer_class=None):
+        encode = self.encoder_class(ensure_ascii=False, separators=(',', ':')).encode
+        data_field = self.get_field_name('stream_data_field', 'SUCCESS_JSON_DATA_FIELD', 'data')
+        links_field = self.get_field_name('stream_links_field', 'SUCCESS_JSON_LINKS_FIELD', 'links')
+        envelope = self.get_envelope()
+
+        prefix = ['{']
+        for key, value in envelope.items():
+            if key not in (data_field, links_field):
+                prefix.append(f'{encode(key)}:{encode(value)},')
+        prefix.append(f'{encode(data_field)}:[')
+        yield ''.join(prefix).encode('utf-8')
+
+        separator = ''
+        for item in self.iter_items(queryset, serializer_class):
+            yield (separator + encode(item)).encode('utf-8')
+            separator = ','
+
+        yield f'],{encode(links_field)}:{encode(self.get_links())}}}'.encode('utf-8')
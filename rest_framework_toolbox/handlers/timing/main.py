@@ -0,0 +1,131 @@
+import logging
+import time
+
+from django.conf import settings
+from rest_framework_toolbox.core.utils import cached_import_class
+
+__all__ = [
+    'ServerTiming',
+]
+
+logger = logging.getLogger('rest_framework_toolbox.timing')
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Phase:
+    __slots__ = ('timing', 'name', 'start')
+
+    def __init__(self, timing, name):
+        self.timing = timing
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timing.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTiming:
+    """Stand-in used when server timing is disabled, every operation is a no-op"""
+    enabled = False
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+    def add(self, name, duration):
+        pass
+
+    def header(self):
+        return ''
+
+    def record(self, **kwds):
+        return None
+
+    def finish(self, response, **kwds):
+        pass
+
+
+class ServerTiming:
+    """Collects monotonic phase timings for a single response.
+
+    Enable it by setting `SERVER_TIMING_ENABLED = True` in your settings. Timings are emitted
+    as a `Server-Timing` header, and handed over as a dict to the callable referenced by
+    `SERVER_TIMING_RECORDER`, or logged to the `rest_framework_toolbox.timing` logger otherwise.
+
+    ```py
+    timing = ServerTiming.for_response(response)
+    with timing.phase('on_success'):
+        ...
+    timing.finish(response, view=view, request=request)
+    ```
+    """
+    enabled = True
+    _attr = '_server_timing'
+    _null = _NullTiming()
+
+    def __init__(self):
+        self.phases = {}
+        self.started = time.perf_counter()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(getattr(settings, 'SERVER_TIMING_ENABLED', False))
+
+    @classmethod
+    def for_response(cls, response):
+        """Returns the timing attached to `response`, attaches a new one if there is none.
+
+        A no-op timing is returned when server timing is disabled.
+        """
+        if response is None or not cls.is_enabled():
+            return cls._null
+        timing = getattr(response, cls._attr, None)
+        if timing is None:
+            timing = cls()
+            setattr(response, cls._attr, timing)
+        return timing
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add(self, name, duration):
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def header(self):
+        return ', '.join(
+            f'{name};dur={duration * 1000:.3f}' for name, duration in self.phases.items()
+        )
+
+    def record(self, view=None, request=None, status_code=None):
+        return {
+            'view': view.__class__.__name__ if view is not None else None,
+            'method': getattr(request, 'method', None),
+            'path': getattr(request, 'path_info', None),
+            'status_code': status_code,
+            'phases': {name: duration * 1000 for name, duration in self.phases.items()},
+            'total': (time.perf_counter() - self.started) * 1000,
+        }
+
+    def finish(self, response, view=None, request=None, emit=True):
+        """Writes the `Server-Timing` header, and emits the structured record if `emit` is set"""
+        if self.phases:
+            response['Server-Timing'] = self.header()
+        if emit:
+            record = self.record(view, request, getattr(response, 'status_code', None))
+            recorder = getattr(settings, 'SERVER_TIMING_RECORDER', None)
+            if recorder:
+                cached_import_class(recorder)(record)
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug('server timing', extra={'server_timing': record})
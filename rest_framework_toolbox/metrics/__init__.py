@@ -0,0 +1,20 @@
+"""
+rest_framework_toolbox[metrics]
+===============================
+
+Counters and histograms recorded by the toolbox handlers, exposed in the Prometheus text format.
+
+Modules:
+- main
+- multiprocess
+- views
+"""
+from rest_framework_toolbox.core.utils import lazy_module
+
+from .main import *
+
+# The views import DRF, they are imported on first access
+__getattr__, __dir__ = lazy_module(__name__, {
+    'PrometheusRenderer': '.views',
+    'MetricsView': '.views',
+})
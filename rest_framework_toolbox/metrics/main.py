@@ -0,0 +1,319 @@
+import atexit
+import logging
+import os
+import threading
+import uuid
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+
+__all__ = [
+    'Counter',
+    'Histogram',
+    'Registry',
+    'registry',
+    'metrics_enabled',
+    'errors_total',
+    'error_dispatch_total',
+    'render_seconds',
+]
+
+logger = logging.getLogger('rest_framework_toolbox.metrics')
+
+DEFAULT_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0)
+
+
+def metrics_enabled() -> bool:
+    return bool(getattr(settings, 'METRICS_ENABLED', False))
+
+
+class _Metric:
+    """Base of the metrics, samples are kept in one shard per thread.
+
+    A thread only ever writes to its own shard, so no lock is taken when recording, shards
+    are merged when the metric is collected. The shards of dead threads are folded into
+    `_retired` so their samples are kept.
+    """
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+        self._registry = registry
+        if registry is not None:
+            registry.register(self)
+
+    def _shard(self) -> Dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            if self._registry is not None:
+                self._registry.on_new_shard()
+            return shard
+
+    def _merge(self, into: Dict, pairs: Iterable):
+        """Adds the `(label values, value)` pairs to the `into` samples, values are numbers
+        unless the metric overrides it"""
+        for labels, value in pairs:
+            into[labels] = into.get(labels, 0) + value
+
+    def samples(self) -> Dict:
+        """Returns the merged samples, keyed by label values"""
+        merged = {}
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard.items())
+            self._shards = alive
+            self._merge(merged, self._retired.items())
+            shards = [shard for _, shard in alive]
+        for shard in shards:
+            # Copy first, the owner thread may be adding label values meanwhile
+            self._merge(merged, list(shard.items()))
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._local = threading.local()
+            self._shards = []
+            self._retired = {}
+
+    def _after_fork(self):
+        # Another thread of the parent may have held the lock when it forked, it's replaced
+        # rather than acquired
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+
+
+class Counter(_Metric):
+    """Monotonic counter
+
+    ```py
+    requests = Counter('requests_total', 'Handled requests', ('view',), registry=registry)
+    requests.inc('OrderView')
+    ```
+    """
+    type = 'counter'
+
+    def inc(self, *labelvalues, amount=1):
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+
+class Histogram(_Metric):
+    """Histogram with fixed buckets, values are in seconds by convention
+
+    ```py
+    latency = Histogram('latency_seconds', 'Latency', ('view',), registry=registry)
+    latency.observe(0.012, 'OrderView')
+    ```
+    """
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, *labelvalues):
+        shard = self._shard()
+        counts = shard.get(labelvalues)
+        if counts is None:
+            # One count per bucket, plus the `+Inf` bucket, then the sum
+            counts = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _merge(self, into, pairs):
+        for labels, counts in pairs:
+            merged = into.get(labels)
+            if merged is None:
+                into[labels] = list(counts)
+            else:
+                for index, count in enumerate(counts):
+                    merged[index] += count
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra='') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Registry:
+    """Collection of metrics, exposed in the Prometheus text format.
+
+    When `METRICS_MULTIPROCESS_DIR` is set, every process writes its samples to a file in
+    that directory every `METRICS_MULTIPROCESS_INTERVAL` seconds (`5` by default) and on
+    exit, and the exposition adds up the samples of every process, e.g. gunicorn workers.
+    Files are named after the pid and a random token, a process reusing the pid of an exited
+    one doesn't overwrite its file.
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._flusher_pid = None
+        self._flush_failing = False
+        self.process_id = self._new_process_id()
+
+    @staticmethod
+    def _new_process_id() -> str:
+        return f'{os.getpid()}_{uuid.uuid4().hex[:12]}'
+
+    def register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def unregister(self, metric: _Metric):
+        with self._lock:
+            self._metrics.pop(metric.name, None)
+
+    def metrics(self) -> Iterable[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def collect(self) -> Dict[str, Dict]:
+        """Returns the merged samples of every metric, keyed by metric name"""
+        collected = {metric.name: metric.samples() for metric in self.metrics()}
+        directory = self.multiprocess_dir()
+        if directory:
+            from .multiprocess import read_samples
+            for name, pairs in read_samples(directory, exclude=self.process_id).items():
+                metric = self._metrics.get(name)
+                if metric is not None:
+                    metric._merge(collected.setdefault(name, {}), pairs)
+        return collected
+
+    def exposition(self) -> str:
+        """Renders the metrics in the Prometheus text format, version 0.0.4"""
+        collected = self.collect()
+        lines = []
+        for metric in self.metrics():
+            lines.append(f'# HELP {metric.name} {_escape(metric.documentation)}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for labels, value in sorted(collected.get(metric.name, {}).items()):
+                if metric.type == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float('inf'),), value):
+                        cumulative += count
+                        le = 'le="' + _number(bound) + '"'
+                        lines.append(f'{metric.name}_bucket{_labels(metric.labelnames, labels, le)} {cumulative}')
+                    lines.append(f'{metric.name}_sum{_labels(metric.labelnames, labels)} {_number(value[-1])}')
+                    lines.append(f'{metric.name}_count{_labels(metric.labelnames, labels)} {cumulative}')
+                else:
+                    lines.append(f'{metric.name}{_labels(metric.labelnames, labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def multiprocess_dir():
+        return getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+
+    def on_new_shard(self):
+        """Starts the multiprocess flusher thread of this process, if needed"""
+        if self._flusher_pid == os.getpid() or not self.multiprocess_dir():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name='rest_framework_toolbox_metrics', daemon=True)
+            self._flusher.start()
+
+    def flush(self):
+        """Writes the samples of this process to the multiprocess directory"""
+        directory = self.multiprocess_dir()
+        if directory:
+            from .multiprocess import write_samples
+            write_samples(directory, self.process_id, {metric.name: metric.samples() for metric in self.metrics()})
+
+    def _flush_periodically(self):
+        interval = getattr(settings, 'METRICS_MULTIPROCESS_INTERVAL', 5.0)
+        stop = threading.Event()
+        while not stop.wait(interval):
+            self._safe_flush()
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except Exception:
+            # Logged once until a flush succeeds again, the flusher retries every interval
+            if not self._flush_failing:
+                logger.exception("Metrics could not be written to %s", self.multiprocess_dir())
+            self._flush_failing = True
+        else:
+            self._flush_failing = False
+
+    def _after_fork(self):
+        # Samples recorded before the fork belong to the parent process, the locks are
+        # replaced as the thread holding them doesn't exist in the child
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric._after_fork()
+        self._flusher = None
+        self._flusher_pid = None
+        self._flush_failing = False
+        self.process_id = self._new_process_id()
+
+    def _at_exit(self):
+        if self._flusher_pid == os.getpid():
+            self._safe_flush()
+
+
+registry = Registry()
+atexit.register(registry._at_exit)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=registry._after_fork)
+
+
+# Metrics of the toolbox, recorded when `METRICS_ENABLED` is set
+
+errors_total = Counter(
+    'rest_framework_toolbox_errors_total',
+    'Exceptions handled by the exception handler',
+    ('exception', 'view', 'status_code'),
+    registry=registry,
+)
+
+error_dispatch_total = Counter(
+    'rest_framework_toolbox_error_dispatch_total',
+    'Exceptions handled by the error handler, by the kind of handler that built the error response',
+    ('exception', 'handler'),
+    registry=registry,
+)
+
+render_seconds = Histogram(
+    'rest_framework_toolbox_render_seconds',
+    'Time spent rendering responses',
+    ('renderer', 'view', 'status_code'),
+    registry=registry,
+)
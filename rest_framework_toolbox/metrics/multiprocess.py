@@ -0,0 +1,57 @@
+"""
+Exchange of samples between processes through files in a shared directory.
+
+Every process writes its samples to `metrics_<process id>.json`, the process id being the pid
+and a random token. The files of exited processes are kept, so the counters they contributed
+to don't go backwards.
+"""
+import json
+import os
+from typing import Dict
+
+__all__ = [
+    'write_samples',
+    'read_samples',
+]
+
+_prefix = 'metrics_'
+_suffix = '.json'
+
+
+def write_samples(directory: str, process_id: str, collected: Dict[str, Dict]):
+    data = {
+        name: [[list(labels), value] for labels, value in samples.items()]
+        for name, samples in collected.items()
+    }
+    path = os.path.join(directory, f'{_prefix}{process_id}{_suffix}')
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    # Readers never see a partially written file
+    os.replace(tmp, path)
+
+
+def read_samples(directory: str, exclude: str = None) -> Dict[str, Dict]:
+    """Returns the `(label values, value)` pairs of every process but `exclude`, per
+    metric name, pairs of the same labels are left to the metric to merge"""
+    collected = {}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return collected
+    for file_name in names:
+        if not (file_name.startswith(_prefix) and file_name.endswith(_suffix)):
+            continue
+        if file_name == f'{_prefix}{exclude}{_suffix}':
+            continue
+        try:
+            with open(os.path.join(directory, file_name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, samples in data.items():
+            collected.setdefault(name, []).extend(samples)
+    return {
+        name: [(tuple(labels), value) for labels, value in pairs]
+        for name, pairs in collected.items()
+    }
@@ -0,0 +1,38 @@
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .main import registry
+
+__all__ = [
+    'PrometheusRenderer',
+    'MetricsView',
+]
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset) if isinstance(data, str) else data
+
+
+class MetricsView(APIView):
+    """Serves the metrics in the Prometheus text format
+
+    ```py
+    urlpatterns = [
+        path('metrics', MetricsView.as_view()),
+    ]
+    ```
+
+    The view uses your default authentication and permission classes, override them to let
+    your Prometheus server scrape it.
+    """
+    renderer_classes = (PrometheusRenderer,)
+    registry = registry
+
+    def get(self, request):
+        return Response(self.registry.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
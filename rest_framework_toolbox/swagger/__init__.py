@@ -1 +1,26 @@
-from .main import Schema, generate_success_schema, generate_error_schema
\ No newline at end of file
+"""
+rest_framework_toolbox[swagger]
+===============================
+
+The swagger helpers are imported on first access, `import rest_framework_toolbox.swagger`
+doesn't import drf-spectacular.
+"""
+from rest_framework_toolbox.core.utils import lazy_module
+
+_attributes = {
+    'Schema': '.main',
+    'generate_success_schema': '.main',
+    'generate_error_schema': '.main',
+    'model_component': '.components',
+    'generate_success_component': '.components',
+    'generate_error_component': '.components',
+    'postprocess_components': '.components',
+    'lazy_extend_schema': '.lazy',
+    'materialize_schemas': '.lazy',
+    'ParallelSchemaGenerator': '.parallel',
+    'CachedSpectacularAPIView': '.views',
+}
+
+__all__ = list(_attributes)
+
+__getattr__, __dir__ = lazy_module(__name__, _attributes)
@@ -0,0 +1,173 @@
+"""
+Persistent cache of the rendered OpenAPI document.
+
+The document is keyed by a fingerprint of what it is generated from: the source files of the
+views, of the serializers and of the lazy schema declarations, the field tables of the
+`JSONModel`s, the drf-spectacular settings, `SWAGGER_CACHE_VERSION`, and the versions of the
+libraries. It is generated once per fingerprint, rendered to JSON and YAML, and written to
+`SWAGGER_CACHE_DIR`, later requests and processes serve the files memory-mapped. Without
+`SWAGGER_CACHE_DIR`, documents are only kept in memory.
+"""
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+from typing import Dict, Hashable, Iterable, Optional
+
+import django
+import rest_framework
+import drf_spectacular
+from django.conf import settings
+
+from rest_framework.serializers import BaseSerializer
+
+from rest_framework_toolbox.core.models import JSONModel
+from .lazy import _declaration_modules
+
+__all__ = [
+    'schema_fingerprint',
+    'SchemaCache',
+    'schema_cache',
+]
+
+_address = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def _describe(value) -> str:
+    """Stable representation of the values json can't encode"""
+    if inspect.isclass(value) or inspect.isroutine(value):
+        return f'{getattr(value, "__module__", "")}.{getattr(value, "__qualname__", repr(value))}'
+    return _address.sub('', repr(value))
+
+
+def _subclasses(klass) -> Iterable[type]:
+    for subclass in klass.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def _model_tables() -> list:
+    return sorted(
+        (
+            _describe(model),
+            [(name, _describe(field.__class__), _describe(getattr(field, 'default', None)))
+             for name, field in model._fields.items()],
+        )
+        for model in set(_subclasses(JSONModel))
+    )
+
+
+def _source_files(view_classes) -> set:
+    """The modules of the views and of the classes they extend, of the serializers loaded, be
+    they the `serializer_class` of a view, nested, or only referenced by `extend_schema`, and of
+    the lazy schema declarations"""
+    modules = _declaration_modules()
+    for view_class in view_classes:
+        modules.update(klass.__module__ for klass in inspect.getmro(view_class))
+    modules.update(serializer.__module__ for serializer in _subclasses(BaseSerializer))
+    files = set()
+    for name in modules:
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path:
+            files.add(path)
+    return files
+
+
+def schema_fingerprint(view_classes: Iterable[type], extra: Hashable = None) -> str:
+    """Hashes what the OpenAPI document of `view_classes` is generated from"""
+    digest = hashlib.sha256()
+    for path in sorted(_source_files(view_classes)):
+        digest.update(path.encode('utf-8'))
+        try:
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            digest.update(b'missing')
+    digest.update(json.dumps(_model_tables(), default=_describe).encode('utf-8'))
+    digest.update(json.dumps(
+        getattr(settings, 'SPECTACULAR_SETTINGS', {}), sort_keys=True, default=_describe).encode('utf-8'))
+    digest.update(json.dumps(
+        [django.get_version(), rest_framework.VERSION, drf_spectacular.__version__,
+         getattr(settings, 'SWAGGER_CACHE_VERSION', None), extra],
+        default=_describe).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class SchemaCache:
+    """Rendered OpenAPI documents, keyed by fingerprint, variant (e.g. version and language)
+    and format.
+
+    `config` identifies the view configuration a document is generated for, documents of
+    other fingerprints are only removed for the same configuration, so views configured
+    differently can share the cache directory.
+    """
+    prefix = 'openapi-'
+
+    def __init__(self):
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def directory() -> Optional[str]:
+        return getattr(settings, 'SWAGGER_CACHE_DIR', None)
+
+    def _path(self, directory, config, fingerprint, variant, fmt) -> str:
+        variant_hash = hashlib.sha256(repr(variant).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(directory, f'{self.prefix}{config}-{fingerprint}-{variant_hash}.{fmt}')
+
+    def get(self, fingerprint: str, variant: Hashable, fmt: str, config: str = 'default'):
+        """Returns the document as a buffer, memory-mapped when it is read from the cache
+        directory, or `None`"""
+        key = (config, fingerprint, variant, fmt)
+        document = self._documents.get(key)
+        if document is not None:
+            return document
+        directory = self.directory()
+        if not directory:
+            return None
+        try:
+            with open(self._path(directory, config, fingerprint, variant, fmt), 'rb') as f:
+                document = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            return self._documents.setdefault(key, document)
+
+    def set(self, fingerprint: str, variant: Hashable, documents: Dict[str, bytes], config: str = 'default'):
+        """Stores the rendered `documents`, keyed by format, and removes the files of other
+        fingerprints of `config`"""
+        directory = self.directory()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            for fmt, content in documents.items():
+                path = self._path(directory, config, fingerprint, variant, fmt)
+                tmp = f'{path}.{os.getpid()}.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(content)
+                # Other processes never read a partially written document
+                os.replace(tmp, path)
+            self._remove_stale(directory, config, fingerprint)
+        with self._lock:
+            for fmt, content in documents.items():
+                self._documents[(config, fingerprint, variant, fmt)] = memoryview(content)
+
+    def _remove_stale(self, directory, config, fingerprint):
+        prefix = f'{self.prefix}{config}-'
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and not name.startswith(f'{prefix}{fingerprint}-'):
+                try:
+                    # Processes still serving a mapped file keep reading it
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+schema_cache = SchemaCache()
@@ -0,0 +1,297 @@
+"""
+OpenAPI components generated from the fields of your JSON models, without building DRF
+serializers.
+"""
+import copy
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from drf_spectacular.drainage import warn
+from rest_framework import serializers
+
+from rest_framework_toolbox.core import fields
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.core.utils import cached_import_class
+
+__all__ = [
+    'model_component',
+    'generate_success_component',
+    'generate_error_component',
+    'postprocess_components',
+    'clear_components',
+]
+
+REF_PREFIX = '#/components/schemas/'
+# Prefix of the references emitted before the components are added to the document, the
+# postprocessing hook replaces it, so the components of JSON models can be told apart from the
+# components drf-spectacular generated under the same name
+MODEL_REF_PREFIX = '#/components/x-json-models/'
+
+# OpenAPI type of each field class, subclasses use the entry of their closest base
+FIELD_TYPES = {
+    fields.StringField: {'type': 'string'},
+    fields.IntegerField: {'type': 'integer'},
+    fields.BooleanField: {'type': 'boolean'},
+    fields.DateTimeField: {'type': 'string', 'format': 'date-time'},
+    fields.DateField: {'type': 'string', 'format': 'date'},
+    fields.ListField: {'type': 'array'},
+    fields.DictField: {'type': 'object'},
+    fields.DataField: {},
+    fields.Field: {},
+}
+
+# Keywords telling a `response` value is an OpenAPI schema rather than a default value
+SCHEMA_KEYWORDS = ('$ref', 'type', 'allOf', 'oneOf', 'anyOf', 'properties', 'items')
+
+# Component schemas by name, the name of each schema by its JSON encoding, and the component
+# name of each model class
+_components: Dict[str, Dict] = {}
+_names: Dict[str, str] = {}
+_models: Dict[type, str] = {}
+_lock = threading.RLock()
+
+
+def _is_model(value) -> bool:
+    return isinstance(value, JSONModel) or (isinstance(value, type) and issubclass(value, JSONModel))
+
+
+def _reserve(name: str) -> str:
+    """Takes a free component name, `name` or a numbered one"""
+    candidate = name
+    index = 2
+    while candidate in _components:
+        candidate = f'{name}{index}'
+        index += 1
+    _components[candidate] = {}
+    return candidate
+
+
+def _key(schema: Dict) -> str:
+    return json.dumps(schema, sort_keys=True, default=str)
+
+
+def _register(name: str, schema: Dict) -> str:
+    """Registers `schema` as a component and returns its name.
+
+    Identical schemas share the component registered first, a different schema registered
+    under a taken name gets a numbered name.
+    """
+    key = _key(schema)
+    with _lock:
+        registered = _names.get(key)
+        if registered is not None:
+            return registered
+        candidate = _reserve(name)
+        _components[candidate] = schema
+        _names[key] = candidate
+        return candidate
+
+
+def _ref(name: str) -> Dict:
+    return {'$ref': MODEL_REF_PREFIX + name}
+
+
+def _model_ref(model) -> Dict:
+    if isinstance(model, JSONModel):
+        model = model.__class__
+    name = _models.get(model)
+    if name is None:
+        with _lock:
+            name = _models.get(model)
+            if name is None:
+                # The name is taken before building the schema, for models referencing
+                # themselves to refer to it
+                name = _models[model] = _reserve(model.__name__)
+                try:
+                    schema = _model_schema(model, {})
+                except BaseException:
+                    del _models[model]
+                    del _components[name]
+                    raise
+                _components[name] = schema
+                _names.setdefault(_key(schema), name)
+    return _ref(name)
+
+
+def _default(value) -> bool:
+    return isinstance(value, (str, int, float, bool, list, dict))
+
+
+def field_schema(field) -> Dict:
+    """Returns the OpenAPI schema of a field, nested models are referenced as components"""
+    if _is_model(field):
+        return _model_ref(field)
+
+    for field_class in type(field).__mro__:
+        if field_class in FIELD_TYPES:
+            schema = dict(FIELD_TYPES[field_class])
+            break
+    else:
+        schema = {}
+
+    child = getattr(field, 'child', None)
+    if isinstance(field, fields.ListField):
+        schema['items'] = field_schema(child) if child is not None else {}
+    elif isinstance(field, fields.DictField):
+        schema['additionalProperties'] = field_schema(child) if child is not None else {}
+
+    if field.default is not None and _default(field.default) and not _is_model(field.default):
+        schema['default'] = field.default
+    if field.allow_null:
+        schema['nullable'] = True
+    if field.read_only:
+        schema['readOnly'] = True
+    if field.help_text:
+        schema['description'] = field.help_text
+    return schema
+
+
+def _override_schema(field, value) -> Dict:
+    """Returns the schema of a field overridden by a `response` value"""
+    if _is_model(value) or isinstance(value, fields.Field):
+        return field_schema(value)
+    if isinstance(value, list) and len(value) == 1:
+        return {'type': 'array', 'items': _override_schema(None, value[0])}
+    if isinstance(value, dict) and any(keyword in value for keyword in SCHEMA_KEYWORDS):
+        return copy.deepcopy(value)
+    if isinstance(value, serializers.Field):
+        raise TypeError(
+            "Serializers can't be translated to components, use `generate_success_schema` or "
+            "`generate_error_schema` for responses holding serializers")
+    if field is None:
+        raise TypeError(f"Can't generate a schema from {value!r}")
+    # Plain values are the default value of the field
+    schema = field_schema(field)
+    if _default(value):
+        schema['default'] = value
+    return schema
+
+
+def _model_schema(model, response: Dict) -> Dict:
+    properties = {}
+    for name, field in model._fields.items():
+        if name in response:
+            properties[name] = _override_schema(field, response[name])
+        else:
+            properties[name] = field_schema(field)
+    return {'type': 'object', 'properties': properties}
+
+
+def model_component(model, component_name: Optional[str] = None, response: Optional[Dict] = None) -> Dict:
+    """Registers the component of a `JSONModel` and returns its reference.
+
+    `response` overrides the schema of fields, e.g. of `DataField`s, by name, its values are:
+    - a `JSONModel` class or instance, referenced as a component
+    - a field, e.g. `ListField(child=OrderModel)`
+    - a list holding one of those, for an array of it
+    - an OpenAPI schema, e.g. `{'type': 'string', 'format': 'uuid'}`
+    - any other value, used as the default value of the field
+
+    Components are deduplicated: identical schemas are emitted once, under the name they were
+    registered with first.
+    """
+    if isinstance(model, JSONModel):
+        model = model.__class__
+    if not response:
+        if component_name is None or component_name == model.__name__:
+            return _model_ref(model)
+        return _ref(_register(component_name, _model_schema(model, {})))
+    return _ref(_register(component_name or model.__name__, _model_schema(model, response)))
+
+
+def generate_success_component(component_name="SuccessSchema", response=None) -> Dict:
+    """Same as `generate_success_schema`, returns the reference of an OpenAPI component
+    generated from `SUCCESS_JSON_MODEL`, usable in place of a serializer in `extend_schema`"""
+    success_class = cached_import_class(settings.SUCCESS_JSON_MODEL)
+    assert issubclass(
+        success_class, JSONModel), "SUCCESS_JSON_MODEL class must be an instance of JSONModel class"
+    return model_component(success_class, component_name, response)
+
+
+def generate_error_component(component_name="FailSchema", response=None) -> Dict:
+    """Same as `generate_error_schema`, returns the reference of an OpenAPI component
+    generated from `ERROR_JSON_MODEL`"""
+    fail_class = cached_import_class(settings.ERROR_JSON_MODEL)
+    assert issubclass(
+        fail_class, JSONModel), "ERROR_JSON_MODEL class must be an instance of JSONModel class"
+    return model_component(fail_class, component_name, response)
+
+
+def _model_refs(value):
+    """Yields the names of the JSON model components referenced in `value`"""
+    if isinstance(value, dict):
+        ref = value.get('$ref')
+        if isinstance(ref, str) and ref.startswith(MODEL_REF_PREFIX):
+            yield ref[len(MODEL_REF_PREFIX):]
+        for item in value.values():
+            yield from _model_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _model_refs(item)
+
+
+def _rewrite_refs(value, names: Dict[str, str]):
+    """Returns a copy of `value` referencing the components under their name in the document,
+    the schemas given to `extend_schema` are shared by every generation so they're not modified"""
+    if isinstance(value, dict):
+        value = {key: _rewrite_refs(item, names) for key, item in value.items()}
+        ref = value.get('$ref')
+        if isinstance(ref, str) and ref.startswith(MODEL_REF_PREFIX):
+            name = ref[len(MODEL_REF_PREFIX):]
+            value['$ref'] = REF_PREFIX + names.get(name, name)
+        return value
+    if isinstance(value, list):
+        return [_rewrite_refs(item, names) for item in value]
+    return value
+
+
+def postprocess_components(result, generator=None, request=None, public=False, **kwargs) -> Dict[str, Any]:
+    """drf-spectacular postprocessing hook adding the components referenced by the document
+
+    ```py
+    SPECTACULAR_SETTINGS = {
+        'POSTPROCESSING_HOOKS': [
+            'drf_spectacular.hooks.postprocess_schema_enums',
+            'rest_framework_toolbox.swagger.postprocess_components',
+        ],
+    }
+    ```
+
+    A component whose name is already taken in the document, e.g. by the component of a
+    serializer, is added under a numbered name, and a warning is emitted.
+    """
+    schemas = dict(result.get('components', {}).get('schemas', {}))
+    names: Dict[str, str] = {}
+    added = {}
+    pending = list(_model_refs(result))
+    while pending:
+        name = pending.pop()
+        if name in names or name not in _components:
+            continue
+        target = name
+        index = 2
+        while target in schemas or target in added:
+            target = f'{name}{index}'
+            index += 1
+        if target != name:
+            warn(f'Component name "{name}" of a JSON model is already used by another '
+                 f'component, it was renamed "{target}"')
+        names[name] = target
+        added[target] = _components[name]
+        pending.extend(_model_refs(_components[name]))
+    if not names:
+        return result
+    result = _rewrite_refs(result, names)
+    schemas.update((target, _rewrite_refs(schema, names)) for target, schema in added.items())
+    result.setdefault('components', {})['schemas'] = dict(sorted(schemas.items()))
+    return result
+
+
+def clear_components():
+    """Forgets the registered components"""
+    with _lock:
+        _components.clear()
+        _names.clear()
+        _models.clear()
@@ -0,0 +1,163 @@
+"""
+Deferred `extend_schema` declarations.
+
+`lazy_extend_schema` records the declaration, and builds the drf-spectacular objects and
+applies `extend_schema` only when the schema is generated, so workers that never serve the
+schema don't pay for it at import.
+
+Declarations are materialized all at once, in the order they were declared, the first time
+drf-spectacular reads one of them: the `schema` of a decorated view class, or the `schema`
+entry of a decorated view method's `kwargs`.
+"""
+import inspect
+import threading
+from collections.abc import Mapping
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from drf_spectacular.utils import extend_schema
+
+__all__ = [
+    'lazy_extend_schema',
+    'materialize_schemas',
+    'pending_schemas',
+]
+
+_missing = object()
+
+_pending = []
+_lock = threading.RLock()
+# Modules of the functions building the declarations, they are part of the schema fingerprint
+_build_modules = set()
+
+
+class _Declaration:
+    """A pending `extend_schema` declaration on a view class or method"""
+    def __init__(self, target, attr, build):
+        self.target = target
+        self.attr = attr
+        self.build = build
+        self.previous = target.__dict__.get(attr, _missing) if inspect.isclass(target) else getattr(target, attr, _missing)
+        self.result = _missing
+        self.done = False
+
+    def materialize(self):
+        with _lock:
+            if self.done:
+                return
+            previous = self.previous
+            if isinstance(previous, _Declaration):
+                previous.materialize()
+                previous = previous.result
+            try:
+                # `extend_schema` builds on what was there before this declaration
+                if previous is _missing:
+                    if self.attr in getattr(self.target, '__dict__', {}):
+                        delattr(self.target, self.attr)
+                else:
+                    setattr(self.target, self.attr, previous)
+                extend_schema(**self.build())(self.target)
+            except BaseException:
+                # The declaration stays in place, and is built again when it is read again
+                setattr(self.target, self.attr, self)
+                raise
+            self.result = getattr(self.target, '__dict__', {}).get(self.attr, _missing)
+            self.build = None
+            self.done = True
+
+
+class LazySchema(_Declaration):
+    """Stands for the `schema` of a view class until it is read"""
+    def __get__(self, instance, owner=None):
+        materialize_schemas()
+        self.materialize()
+        return getattr(instance if instance is not None else owner, 'schema')
+
+
+class LazyKwargs(_Declaration, Mapping):
+    """Stands for the `kwargs` of a view method, the `schema` entry is only built when read.
+
+    The other entries, e.g. those set by `@action`, are read without materializing the
+    declaration, `schema` is left out of the keys so routers copying `kwargs` don't
+    materialize it either.
+    """
+    def _base(self) -> Mapping:
+        previous = self.previous
+        return {} if previous is _missing else previous
+
+    def __getitem__(self, key):
+        if key == 'schema':
+            materialize_schemas()
+            self.materialize()
+            return self.target.kwargs['schema']
+        return self._base()[key]
+
+    def __iter__(self):
+        return (key for key in self._base() if key != 'schema')
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict:
+        materialize_schemas()
+        self.materialize()
+        return dict(self.target.kwargs)
+
+
+def lazy_enabled() -> bool:
+    return getattr(settings, 'SWAGGER_LAZY_SCHEMAS', True)
+
+
+def lazy_extend_schema(build: Optional[Callable[[], Dict]] = None, **kwargs):
+    """Same as `extend_schema`, applied when the schema is generated.
+
+    Args:
+        build (Callable): returns the `extend_schema` arguments, use it to defer building
+            the `OpenApiParameter`, `OpenApiResponse`... objects as well
+        kwargs: `extend_schema` arguments, when `build` is not given
+
+    Set `SWAGGER_LAZY_SCHEMAS = False` in your settings to apply the declarations right away.
+    """
+    if build is None:
+        build = lambda: kwargs  # noqa: E731
+
+    def decorator(f):
+        # `@api_view` functions are rare, they are decorated right away
+        if not lazy_enabled() or (callable(f) and hasattr(f, 'cls')):
+            return extend_schema(**build())(f)
+        if inspect.isclass(f):
+            declaration = LazySchema(f, 'schema', build)
+        elif callable(f):
+            declaration = LazyKwargs(f, 'kwargs', build)
+        else:
+            return f
+        setattr(f, declaration.attr, declaration)
+        with _lock:
+            _pending.append(declaration)
+            _build_modules.add(getattr(build, '__module__', None))
+        return f
+
+    return decorator
+
+
+def materialize_schemas(endpoints=None, **kwargs):
+    """Applies the pending declarations, in the order they were declared.
+
+    It can be listed in drf-spectacular's `PREPROCESSING_HOOKS` to apply them before the
+    endpoints are inspected, it returns `endpoints` untouched.
+    """
+    with _lock:
+        while _pending:
+            _pending.pop(0).materialize()
+    return endpoints
+
+
+def _declaration_modules() -> set:
+    """Modules of the functions building the declarations, materialized or not"""
+    with _lock:
+        return set(_build_modules)
+
+
+def pending_schemas() -> int:
+    """Returns the number of declarations not materialized yet"""
+    return len(_pending)
@@ -1,16 +1,18 @@
-from typing import Any
+import threading
+from typing import Any, Dict, Hashable, Optional
 
 from django.conf import settings
 
 from rest_framework import serializers
 
 from rest_framework_toolbox.core.models import JSONModel
-from rest_framework_toolbox.core.utils import import_class
+from rest_framework_toolbox.core.utils import cached_import_class
 from rest_framework_toolbox.core import fields
 
+from .lazy import lazy_extend_schema
+
 
 from drf_spectacular.utils import (
-    extend_schema,
     OpenApiRequest,
     OpenApiParameter,
     OpenApiResponse,
@@ -25,6 +27,12 @@ class Schema:
 
     @staticmethod
     def generate_schema(schema):
+        """Returns the `extend_schema` decorator of the `schema` declaration, the decorator is
+        applied when the OpenAPI schema is generated, see `lazy_extend_schema`"""
+        return lazy_extend_schema(lambda: Schema.schema_kwargs(schema))
+
+    @staticmethod
+    def schema_kwargs(schema) -> Dict[str, Any]:
         operation_id = getattr(schema, "operation_id", None)
         description = getattr(schema, "description", None)
         summary = getattr(schema, "summary", None)
@@ -74,50 +82,51 @@ class Schema:
                 if isinstance(example, OpenApiExample):
                     gen_examples.append(example)
 
-        if not auth:
-            return extend_schema(
-                operation_id=operation_id,
-                description=description,
-                summary=summary,
-                tags=tags,
-                external_docs=external_docs,
-                methods=methods,
-                request=gen_request,
-                parameters=gen_parameters,
-                responses=gen_responses,
-                examples=gen_examples
-            )
-
-        return extend_schema(
+        kwargs = dict(
             operation_id=operation_id,
             description=description,
             summary=summary,
             tags=tags,
             external_docs=external_docs,
-            auth=gen_auth,
             methods=methods,
             request=gen_request,
             parameters=gen_parameters,
             responses=gen_responses,
             examples=gen_examples
         )
+        if auth:
+            kwargs['auth'] = gen_auth
+        return kwargs
+
+
+def _freeze(value) -> Hashable:
+    """Returns a hashable structural key of a `response` value, serializer fields are compared
+    by class and constructor arguments"""
+    if isinstance(value, serializers.Field):
+        return (
+            value.__class__,
+            _freeze(getattr(value, '_args', ())),
+            _freeze(getattr(value, '_kwargs', {})),
+        )
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    if isinstance(value, set):
+        return (set, frozenset(_freeze(item) for item in value))
+    hash(value)
+    return (type(value), value)
 
 
-def generate_success_schema(serializer_name="SuccessSchema", response=None):
-    """
-    Generates a DRF serializer from JSONModel fields to be plugged into a serializer class
+# Serializer classes keyed by (JSON model, structure of `response`)
+_schemas: Dict[Hashable, type] = {}
+_schemas_lock = threading.Lock()
 
-    response: is a dict of value/serializers for the field in the Success JSONModel.
-
-    You must provide a response field in case if your response model contains `DataField` or a class that extends `JSONModel` 
-    """
-    success_class = import_class(settings.SUCCESS_JSON_MODEL)
-    assert issubclass(
-        success_class, JSONModel), "SUCCESS_JSON_MODEL class must be an instance of JSONModel class"
 
+def _build_schema(model, serializer_name, response):
     serializer_fields = {}
 
-    for field_name, field_value in success_class._fields.items():
+    for field_name, field_value in model._fields.items():
         # Inspect `response`
         if field_name in response.keys():
 
@@ -135,47 +144,67 @@ def generate_success_schema(serializer_name="SuccessSchema", response=None):
             serializer_fields[field_name] = field_value.serializer()
 
     # Create the serializer class
-    serializer_cls = type(
+    return type(
         serializer_name,
         (serializers.Serializer,),
         serializer_fields
     )
 
+
+def _generate_schema(model, serializer_name, response: Optional[Dict]):
+    """Returns the serializer class of `model` for `response`, built once per structure.
+
+    Calls with the same model and an identical `response` share the serializer class built
+    first, whatever `serializer_name` they pass, so drf-spectacular emits a single component.
+    """
+    response = response or {}
+    try:
+        key = (model, _freeze(response))
+    except TypeError:
+        # Unhashable values can't be compared, their schema is not cached
+        return _build_schema(model, serializer_name, response)
+
+    serializer_cls = _schemas.get(key)
+    if serializer_cls is None:
+        with _schemas_lock:
+            serializer_cls = _schemas.get(key)
+            if serializer_cls is None:
+                serializer_cls = _schemas[key] = _build_schema(model, serializer_name, response)
     return serializer_cls
 
 
-def generate_error_schema(serializer_name="FailSchema", response=None):
+def clear_schema_cache():
+    """Forgets the serializer classes generated by `generate_success_schema` and
+    `generate_error_schema`"""
+    with _schemas_lock:
+        _schemas.clear()
+
+
+def generate_success_schema(serializer_name="SuccessSchema", response=None):
     """
-    Generates a DRF serializer for error responses
+    Generates a DRF serializer from JSONModel fields to be plugged into a serializer class
+
+    response: is a dict of value/serializers for the field in the Success JSONModel.
+
+    You must provide a response field in case if your response model contains `DataField` or a class that extends `JSONModel` 
+
+    Serializers are cached, identical `response`s get the same serializer class.
     """
-    fail_class = import_class(settings.ERROR_JSON_MODEL)
+    success_class = cached_import_class(settings.SUCCESS_JSON_MODEL)
     assert issubclass(
-        fail_class, JSONModel), "ERROR_JSON_MODEL class must be an instance of JSONModel class"
+        success_class, JSONModel), "SUCCESS_JSON_MODEL class must be an instance of JSONModel class"
 
-    serializer_fields = {}
+    return _generate_schema(success_class, serializer_name, response)
 
-    for field_name, field_value in fail_class._fields.items():
-        # Inspect `response`
-        if field_name in response.keys():
-
-            # if response[name] is a serializer, add it to `serializer_fields`
-            if isinstance(response[field_name], serializers.Serializer):
-                serializer_fields[field_name] = response[field_name]
 
-            # if response[name] is an object/value, get its serializer and add its default value
-            else:
-                # provide default value to the serializer
-                serializer_fields[field_name] = field_value.serializer(
-                    response[field_name])
-        # Use default value
-        else:
-            serializer_fields[field_name] = field_value.serializer()
+def generate_error_schema(serializer_name="FailSchema", response=None):
+    """
+    Generates a DRF serializer for error responses
 
-    # Create the serializer class
-    serializer_cls = type(
-        serializer_name,
-        (serializers.Serializer,),
-        serializer_fields
-    )
+    Serializers are cached, identical `response`s get the same serializer class.
+    """
+    fail_class = cached_import_class(settings.ERROR_JSON_MODEL)
+    assert issubclass(
+        fail_class, JSONModel), "ERROR_JSON_MODEL class must be an instance of JSONModel class"
 
-    return serializer_cls
+    return _generate_schema(fail_class, serializer_name, response)
@@ -0,0 +1,155 @@
+"""
+OpenAPI schema generation spread over a pool of processes.
+"""
+import math
+import multiprocessing
+import os
+import posixpath
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from drf_spectacular.drainage import GENERATOR_STATS
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.plumbing import ComponentIdentity, ComponentRegistry, ResolvedComponent
+from drf_spectacular.settings import patched_settings, spectacular_settings
+
+__all__ = [
+    'ParallelSchemaGenerator',
+]
+
+# State of the generator being run, inherited by the forked workers, a single parallel
+# generation runs at a time
+_current = None
+_lock = threading.Lock()
+
+
+def _parse_partition(bounds: Tuple[int, int]):
+    """Runs in a worker: generates the operations of a slice of the endpoints.
+
+    Returns:
+        tuple: the (path, method, operation) of the slice in endpoint order, the
+        (name, type, schema) of the components it registered, in registration order, and the
+        counts of the warnings and errors it emitted, by message
+    """
+    generator, endpoints, path_prefix, request, public = _current
+    start, stop = bounds
+    generator.endpoints = endpoints[start:stop]
+    generator.registry = ComponentRegistry()
+    # The messages are counted by the worker and printed by the parent
+    GENERATOR_STATS.reset()
+    with patched_settings({'SCHEMA_PATH_PREFIX': path_prefix}), GENERATOR_STATS.silence():
+        result = SchemaGenerator.parse(generator, request, public)
+    operations = [
+        (path, method, operation)
+        for path, methods in result.items()
+        for method, operation in methods.items()
+    ]
+    components = [
+        (component.name, component.type, component.schema)
+        for component in generator.registry._components.values()
+    ]
+    stats = (dict(GENERATOR_STATS._warn_cache), dict(GENERATOR_STATS._error_cache))
+    return operations, components, stats
+
+
+def _merge_stats(warnings: Dict[str, int], errors: Dict[str, int]):
+    """Counts the messages of a worker in the parent's `GENERATOR_STATS`, for the summary and
+    `--fail-on-warn`, the messages are printed once, as the serial generator does"""
+    for messages, cache in ((warnings, GENERATOR_STATS._warn_cache), (errors, GENERATOR_STATS._error_cache)):
+        for msg, count in messages.items():
+            if not GENERATOR_STATS.silent and msg not in cache:
+                print(msg, file=sys.stderr)
+            cache[msg] += count
+
+
+class ParallelSchemaGenerator(SchemaGenerator):
+    """Schema generator building the operations of the endpoints in a pool of processes.
+
+    Endpoints are split in contiguous slices, each worker generates the operations and the
+    components of a slice, and the results are merged in endpoint order. When several slices
+    register a component under the same name, the one of the first slice is kept, as the
+    serial generator reuses the component it registered first, so the document is identical
+    to the one `SchemaGenerator` builds.
+
+    Workers are forked from the process generating the schema, where `fork` isn't available,
+    or with fewer than two workers or endpoints, the schema is generated serially. Warnings
+    and errors emitted by the workers are counted in drf-spectacular's statistics and printed
+    by the parent, so `--fail-on-warn` behaves as with the serial generator.
+
+    Forking is meant for the `spectacular` management command. A process serving requests
+    only runs one parallel generation at a time, prefer `CachedSpectacularAPIView` there.
+
+    Use it as drf-spectacular's generator:
+
+    ```py
+    SPECTACULAR_SETTINGS = {
+        'DEFAULT_GENERATOR_CLASS': 'rest_framework_toolbox.swagger.ParallelSchemaGenerator',
+    }
+    ```
+
+    Settings:
+    - `SWAGGER_SCHEMA_WORKERS`: number of processes, defaults to the number of CPUs
+    """
+    # Number of slices per worker, smaller slices balance the load better
+    partitions_per_worker = 4
+
+    def __init__(self, *args, workers: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = workers
+
+    def get_workers(self) -> int:
+        if self.workers is not None:
+            return self.workers
+        return getattr(settings, 'SWAGGER_SCHEMA_WORKERS', None) or os.cpu_count() or 1
+
+    def get_path_prefix(self, endpoints) -> str:
+        """Same path prefix as `SchemaGenerator.parse` computes for the whole API, the workers
+        only see a slice of it"""
+        if spectacular_settings.SCHEMA_PATH_PREFIX is not None:
+            return spectacular_settings.SCHEMA_PATH_PREFIX
+        if len(set(view.__class__ for _, _, _, view in endpoints)) > 1:
+            return re.escape(posixpath.commonpath([path for path, _, _, _ in endpoints]))
+        return '/'
+
+    def partition(self, count: int, workers: int) -> List[Tuple[int, int]]:
+        size = max(1, math.ceil(count / (workers * self.partitions_per_worker)))
+        return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+    def parse(self, input_request, public):
+        global _current
+
+        self._initialise_endpoints()
+        workers = min(self.get_workers(), len(self.endpoints))
+        if workers < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+            return super().parse(input_request, public)
+
+        endpoints = list(self.endpoints)
+        path_prefix = self.get_path_prefix(self._get_paths_and_endpoints())
+
+        with _lock:
+            _current = (self, endpoints, path_prefix, input_request, public)
+            try:
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                    partitions = list(executor.map(_parse_partition, self.partition(len(endpoints), workers)))
+            finally:
+                _current = None
+                self.endpoints = endpoints
+
+        result: Dict[str, Dict] = {}
+        for operations, components, stats in partitions:
+            _merge_stats(*stats)
+            for path, method, operation in operations:
+                result.setdefault(path, {})[method] = operation
+            for name, component_type, schema in components:
+                if (name, component_type) not in self.registry._components:
+                    self.registry.register(ResolvedComponent(
+                        name=name,
+                        type=component_type,
+                        schema=schema,
+                        object=ComponentIdentity((component_type, name)),
+                    ))
+        return result
@@ -3,7 +3,9 @@ from rest_framework_toolbox.core.utils import import_class
 from rest_framework import serializers
 from django.conf import settings
 
-from drf_spectacular.utils import extend_schema, OpenApiRequest, OpenApiResponse, OpenApiExample, OpenApiParameter
+from .lazy import lazy_extend_schema
+
+from drf_spectacular.utils import OpenApiRequest, OpenApiResponse, OpenApiExample, OpenApiParameter
 
 
 # Schema template:
@@ -112,9 +114,10 @@ def parse_response(*args, **kwargs):
 
 def generate_schema(*args, **kwargs):
     """
-    Generates the schema from the class
+    Generates the schema from the class, the decorator is applied when the OpenAPI schema is
+    generated, see `lazy_extend_schema`
     """
-    return extend_schema(
+    return lazy_extend_schema(lambda: dict(
         operation_id=kwargs.get("operation_id", ""),
         description=kwargs.get("description", ""),
         summary=kwargs.get("summary", ""),
@@ -131,4 +134,4 @@ def generate_schema(*args, **kwargs):
         callbacks=kwargs.get("callbacks", None),
         extensions=kwargs.get("extensions", None),
         deprecated=kwargs.get("deprecated", False)
-    )
+    ))
@@ -1,223 +1,286 @@
-from rest_framework import serializers
-
-
-class SchemaError(serializers.Serializer):
-    class ErrorFieldSerializer(serializers.Serializer):
-        code = serializers.CharField(default="<error_code>")
-        details = serializers.DictField()
-
-    def __init__(self, *args, **kwargs) -> None:
-        self.status_code = kwargs.pop('status_code', 400)
-        super().__init__(*args, **kwargs)
-
-    status = serializers.BooleanField(default=False)
-    message = serializers.CharField(default=None, allow_null=True)
-    error = ErrorFieldSerializer()
-
-
-class SchemaSuccess(serializers.Serializer):
-    status = serializers.BooleanField(default=True)
-    message = serializers.CharField(default=None, allow_null=True)
-    data = serializers.DictField()
-    links = serializers.DictField()
-
-
-class PermissionDenied:
-    def __init__(self, **kwargs) -> None:
-        self.status_code = 403
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'You do not have permission to perform this action.'),
-                'error': {
-                    'code': "permission_denied",
-                    'details': kwargs.get('message', 'You do not have permission to perform this action.')
-                }
-            }
-        )
-        self.serializer.is_valid()
-
-    def __call__(self):
-        return self.serializer.data
-    
-class NotFound:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=404
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'The requested resource was not found.'),
-                'error': {
-                    'code': "not_found",
-                    'details': kwargs.get('message', 'The requested resource was not found.')
-                }
-            }
-        )
-        self.serializer.is_valid()
-
-    def __call__(self):
-        return self.serializer.data
-
-class ValidationError:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=400
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Validation error'),
-                'error': {
-                    'code': "validation_error",
-                    'details': kwargs.get('message', 'Validation error')
-                }
-            }
-        )
-        self.serializer.is_valid()
-
-    def __call__(self):
-        return self.serializer.data
-
-class AuthenticationFailed:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=401
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Authentication failed'),
-                'error': {
-                    'code': "authentication_failed",
-                    'details': kwargs.get('message', 'Authentication failed')
-                }
-            }
-        )
-        self.serializer.is_valid()
-    
-    def __call__(self):
-        return self.serializer.data
-     
-class NotAuthenticated():
-    def __init__(self, **kwargs) -> None:
-        self.status_code=401
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Not authenticated'),
-                'error': {
-                    'code': "not_authenticated",
-                    'details': kwargs.get('message', 'Not authenticated')
-                }
-            }
-        )
-        self.serializer.is_valid()
-        
-    def __call__(self):
-        return self.serializer.data
-
-
-class MethodNotAllowed:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=405
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Method not allowed'),
-                'error': {
-                    'code': "method_not_allowed",
-                    'details': kwargs.get('message', 'Method not allowed')
-                }
-            }
-        )
-        self.serializer.is_valid()
-        
-    def __call__(self):
-        return self.serializer.data
-
-
-class NotAcceptable:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=406
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Not acceptable'),
-                'error': {
-                    'code': "not_acceptable",
-                    'details': kwargs.get('message', 'Not acceptable')
-                }
-            }
-        )
-        self.serializer.is_valid()
-        
-    def __call__(self):
-        return self.serializer.data
-
-
-class InvalidToken:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=400
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Invalid token'),
-                'error': {
-                    'code': "invalid_token",
-                    'details': kwargs.get('message', 'Invalid token')
-                }
-            }
-        )
-    
-    def __call__(self):
-        return self.serializer
-
-
-class ParseError:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=400
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Parse error'),
-                'error': {
-                    'code': "parse_error",
-                    'details': kwargs.get('message', 'Parse error')
-                }
-            }
-        )
-        
-    def __call__(self):
-        return self.serializer
-
-
-class Throttled:
-    def __init__(self, **kwargs) -> None:
-        self.status_code=429
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Request throttled'),
-                'error': {
-                    'code': "throttled",
-                    'details': kwargs.get('message', 'Request throttled')
-                }
-            }
-        )
-        
-    def __call__(self):
-        return self.serializer
-
-
-class ServiceUnavailable(SchemaError):
-    def __init__(self, **kwargs) -> None:
-        self.status_code=500
-        self.serializer = SchemaError(
-            data = {
-                'status': False,
-                'message': kwargs.get('message', 'Service unavailable'),
-                'error': {
-                    'code': "service_unavailable",
-                    'details': kwargs.get('message', 'Service unavailable')
-                }
-            }
-        )
-
-    def __call__(self):
-        return self.serializer
\ No newline at end of file
+"""
+Error payload examples for your schema.
+
+The payloads are generated once per error class and message from your `ERROR_JSON_MODEL`,
+frozen, and shared by every endpoint, see `error_examples`.
+"""
+import threading
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, Mapping, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+
+from rest_framework_toolbox.core.utils import camel_to_snake, cached_import_class
+
+
+class SchemaError(serializers.Serializer):
+    class ErrorFieldSerializer(serializers.Serializer):
+        code = serializers.CharField(default="<error_code>")
+        details = serializers.DictField()
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.status_code = kwargs.pop('status_code', 400)
+        super().__init__(*args, **kwargs)
+
+    status = serializers.BooleanField(default=False)
+    message = serializers.CharField(default=None, allow_null=True)
+    error = ErrorFieldSerializer()
+
+
+class SchemaSuccess(serializers.Serializer):
+    status = serializers.BooleanField(default=True)
+    message = serializers.CharField(default=None, allow_null=True)
+    data = serializers.DictField()
+    links = serializers.DictField()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _fill(value, code, message):
+    """Returns a copy of an error model representation with its `message`, `code` and
+    `details` fields filled, the representation holds the shared defaults of the fields and is
+    left untouched"""
+    if not isinstance(value, dict):
+        return value
+    filled = {}
+    for key, item in value.items():
+        if key == 'code':
+            filled[key] = code
+        elif key in ('message', 'details', 'detail'):
+            filled[key] = message
+        else:
+            filled[key] = _fill(item, code, message)
+    return filled
+
+
+class ErrorExamples:
+    """Registry of the error examples.
+
+    The payload of an example is what the error model handler of the error (e.g.
+    `not_found`) returns, or the default representation of the error model with its
+    `message`, `code` and `details` fields, nested models included, filled. It is built once
+    per error model, error and message, and frozen.
+
+    ```py
+    error_examples.payload('NotFound')
+    # {'status': False, 'message': 'The requested resource was not found.', 'error': {...}}
+    error_examples.openapi_example('NotFound', message='Order not found')
+    ```
+    """
+    def __init__(self):
+        self._errors = {}
+        self._payloads = {}
+        self._examples = {}
+        self._lock = threading.Lock()
+
+    def register(self, error_class):
+        self._errors[error_class.__name__] = error_class
+        return error_class
+
+    def get(self, name: str):
+        return self._errors[name]
+
+    def names(self):
+        return list(self._errors)
+
+    @staticmethod
+    def error_model():
+        path = getattr(settings, 'ERROR_JSON_MODEL', None)
+        return cached_import_class(path) if path else None
+
+    def payload(self, name: str, message: Optional[str] = None) -> Mapping:
+        """Returns the frozen payload of the `name` error"""
+        error_class = self._errors[name]
+        if message is None:
+            message = error_class.default_message
+        model = self.error_model()
+        key = (model, name, message)
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = _freeze(self.build(model, error_class, message))
+            with self._lock:
+                payload = self._payloads.setdefault(key, payload)
+        return payload
+
+    def value(self, name: str, message: Optional[str] = None) -> Dict:
+        """Returns a copy of the payload made of plain dicts and lists"""
+        return _thaw(self.payload(name, message))
+
+    def openapi_example(self, name: str, message: Optional[str] = None):
+        """Returns the `OpenApiExample` of the `name` error, shared by every endpoint"""
+        key = (self.error_model(), name, message)
+        example = self._examples.get(key)
+        if example is None:
+            from drf_spectacular.utils import OpenApiExample
+            error_class = self._errors[name]
+            example = OpenApiExample(
+                name,
+                value=self.value(name, message),
+                status_codes=[str(error_class.status_code)],
+                response_only=True,
+            )
+            with self._lock:
+                example = self._examples.setdefault(key, example)
+        return example
+
+    @staticmethod
+    def build(model, error_class, message) -> Dict:
+        code = error_class.code
+        if model is None:
+            return {
+                'status': False,
+                'message': message,
+                'error': {
+                    'code': code,
+                    'details': message,
+                }
+            }
+
+        handler = getattr(model(), camel_to_snake(error_class.__name__), None)
+        if callable(handler):
+            response = SimpleNamespace(
+                status_code=error_class.status_code,
+                data={'detail': ErrorDetail(message, code)},
+            )
+            try:
+                error = handler(None, response)
+            except Exception:
+                error = None
+            if isinstance(error, model):
+                return error.to_dict()
+        return _fill(model().to_dict(), code, message)
+
+    def clear(self):
+        with self._lock:
+            self._payloads.clear()
+            self._examples.clear()
+
+
+error_examples = ErrorExamples()
+
+
+def _clear_error_examples(setting, **kwargs):
+    if setting == 'ERROR_JSON_MODEL':
+        error_examples.clear()
+
+
+setting_changed.connect(_clear_error_examples)
+
+
+class StaticError:
+    """Example of an error response, the payload is taken from `error_examples`
+
+    ```py
+    NotFound(message='Order not found')()
+    ```
+    """
+    status_code = 400
+    code = 'error'
+    default_message = 'Error'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        error_examples.register(cls)
+
+    def __init__(self, **kwargs) -> None:
+        self.message = kwargs.get('message', self.default_message)
+
+    def __call__(self) -> Dict:
+        return error_examples.value(self.__class__.__name__, self.message)
+
+    @property
+    def payload(self) -> Mapping:
+        return error_examples.payload(self.__class__.__name__, self.message)
+
+    @property
+    def example(self):
+        return error_examples.openapi_example(self.__class__.__name__, self.message)
+
+    @property
+    def serializer(self) -> SchemaError:
+        serializer = SchemaError(data=self(), status_code=self.status_code)
+        serializer.is_valid()
+        return serializer
+
+
+class PermissionDenied(StaticError):
+    status_code = 403
+    code = "permission_denied"
+    default_message = 'You do not have permission to perform this action.'
+
+
+class NotFound(StaticError):
+    status_code = 404
+    code = "not_found"
+    default_message = 'The requested resource was not found.'
+
+
+class ValidationError(StaticError):
+    status_code = 400
+    code = "validation_error"
+    default_message = 'Validation error'
+
+
+class AuthenticationFailed(StaticError):
+    status_code = 401
+    code = "authentication_failed"
+    default_message = 'Authentication failed'
+
+
+class NotAuthenticated(StaticError):
+    status_code = 401
+    code = "not_authenticated"
+    default_message = 'Not authenticated'
+
+
+class MethodNotAllowed(StaticError):
+    status_code = 405
+    code = "method_not_allowed"
+    default_message = 'Method not allowed'
+
+
+class NotAcceptable(StaticError):
+    status_code = 406
+    code = "not_acceptable"
+    default_message = 'Not acceptable'
+
+
+class InvalidToken(StaticError):
+    status_code = 400
+    code = "invalid_token"
+    default_message = 'Invalid token'
+
+
+class ParseError(StaticError):
+    status_code = 400
+    code = "parse_error"
+    default_message = 'Parse error'
+
+
+class Throttled(StaticError):
+    status_code = 429
+    code = "throttled"
+    default_message = 'Request throttled'
+
+
+class ServiceUnavailable(StaticError):
+    status_code = 500
+    code = "service_unavailable"
+    default_message = 'Service unavailable'
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import threading
+
+from django.http import StreamingHttpResponse
+from django.utils import translation
+from drf_spectacular.generators import EndpointEnumerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.views import SpectacularAPIView
+
+from .cache import _describe, schema_cache, schema_fingerprint
+
+__all__ = [
+    'CachedSpectacularAPIView',
+]
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """`SpectacularAPIView` serving the OpenAPI document from `schema_cache`.
+
+    The document is generated once per fingerprint, version and language, and rendered to
+    JSON and YAML. Documents that depend on the user (`serve_public = False`) or requested
+    with media type parameters, e.g. `indent`, are generated on every request.
+
+    ```py
+    urlpatterns = [
+        path('schema', CachedSpectacularAPIView.as_view()),
+    ]
+    ```
+    """
+    cache = schema_cache
+    chunk_size = 64 * 1024
+    cached_renderers = {
+        'json': OpenApiJsonRenderer,
+        'yaml': OpenApiYamlRenderer,
+    }
+
+    _fingerprints = {}
+    _build_lock = threading.Lock()
+
+    def _config_key(self):
+        custom_settings = json.dumps(self.custom_settings, sort_keys=True, default=_describe)
+        return (self.__class__, self.urlconf, tuple(self.patterns or ()), custom_settings, self.serve_public)
+
+    def get_config(self) -> str:
+        """Identifies the view class and `as_view()` arguments across deployments, the cached
+        documents of other configurations are left alone"""
+        config = json.dumps(self._config_key(), default=_describe)
+        return hashlib.sha256(config.encode('utf-8')).hexdigest()[:16]
+
+    def get_fingerprint(self) -> str:
+        """Fingerprint of the document, computed once per view class and `as_view()` arguments"""
+        key = self._config_key()
+        custom_settings = key[3]
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            endpoints = EndpointEnumerator(self.patterns, self.urlconf).get_api_endpoints()
+            view_classes = {getattr(callback, 'cls', None) for _, _, _, callback in endpoints}
+            view_classes.discard(None)
+            fingerprint = schema_fingerprint(
+                sorted(view_classes, key=lambda klass: (klass.__module__, klass.__qualname__)),
+                extra=[[(path, method) for path, _, method, _ in endpoints], custom_settings],
+            )
+            self._fingerprints[key] = fingerprint
+        return fingerprint
+
+    def _get_schema_response(self, request):
+        renderer = request.accepted_renderer
+        if (not self.serve_public or renderer.format not in self.cached_renderers
+                or ';' in (request.accepted_media_type or '')):
+            return super()._get_schema_response(request)
+
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        variant = (version, translation.get_language())
+        fingerprint = self.get_fingerprint()
+        config = self.get_config()
+
+        document = self.cache.get(fingerprint, variant, renderer.format, config)
+        if document is None:
+            with self._build_lock:
+                document = self.cache.get(fingerprint, variant, renderer.format, config)
+                if document is None:
+                    self.cache.set(fingerprint, variant, self.render_documents(request, version), config)
+                    document = self.cache.get(fingerprint, variant, renderer.format, config)
+
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(self.iter_chunks(document), content_type=content_type)
+        response['Content-Length'] = str(len(document))
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, version)}"'
+        return response
+
+    def render_documents(self, request, version):
+        generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+        schema = generator.get_schema(request=request, public=self.serve_public)
+        context = self.get_renderer_context()
+        return {
+            fmt: renderer_class().render(schema, renderer_class.media_type, context)
+            for fmt, renderer_class in self.cached_renderers.items()
+        }
+
+    def iter_chunks(self, document):
+        for start in range(0, len(document), self.chunk_size):
+            yield document[start:start + self.chunk_size]
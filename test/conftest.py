@@ -0,0 +1,84 @@
+import logging
+
+import django
+import pytest
+from django.conf import settings
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+
+
+def pytest_configure():
+    if settings.configured:
+        return
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='rest_framework_toolbox-tests',
+        INSTALLED_APPS=[
+            'django.contrib.contenttypes',
+            'django.contrib.auth',
+            'rest_framework',
+            'rest_framework_toolbox',
+        ],
+        DATABASES={
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:',
+            }
+        },
+        ROOT_URLCONF=__name__,
+        REST_FRAMEWORK={
+            'EXCEPTION_HANDLER': 'rest_framework_toolbox.handlers.exception_handler',
+            'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+        },
+        ALLOWED_HOSTS=['*'],
+    )
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+urlpatterns = []
+
+
+# Helpers shared by the error handler tests
+
+
+class FailResponse(JSONModel):
+    status = BooleanField(default=False)
+    message = StringField(default="Failed request")
+    error = DataField()
+
+
+class View:
+    error_model = FailResponse
+
+    def on_error(self, exc, context, response):
+        return self.error_model(message=str(exc.detail), error=exc.default_code)
+
+
+def handle(exc, view):
+    from django.test import RequestFactory
+    from rest_framework_toolbox.handlers import exception_handler
+    return exception_handler(exc, {'view': view, 'request': RequestFactory().get('/')})
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def error_log():
+    handler = Collect()
+    logger = logging.getLogger('rest_framework_toolbox_error_logger')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield handler.records
+    logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
@@ -0,0 +1,119 @@
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from logging.handlers import QueueListener
+
+import pytest
+from django.test import RequestFactory
+
+from rest_framework_toolbox.core.aio import call_hook, queued_logger
+from rest_framework_toolbox.core.fields import BooleanField, DataField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import RestJsonRenderer
+
+
+class SuccessResponse(JSONModel):
+    status = BooleanField(default=True)
+    data = DataField()
+
+
+class AsyncView:
+    response = type('Response', (), {'status_code': 200})()
+
+    async def on_success(self, request, data):
+        await asyncio.sleep(0)
+        return SuccessResponse(data=data)
+
+
+class TestHooks:
+    def test_call_hook_awaits_coroutines(self):
+        async def hook(value):
+            return value * 2
+
+        assert call_hook(hook, 2) == 4
+        assert call_hook(lambda value: value + 1, 2) == 3
+
+    def test_render_with_async_on_success(self):
+        context = {'view': AsyncView(), 'request': RequestFactory().get('/')}
+        content = RestJsonRenderer().render([1, 2], renderer_context=context)
+        assert content == b'{"status":true,"data":[1,2]}'
+
+class TestQueuedLogger:
+    def test_records_reach_the_original_handlers(self):
+        records = []
+
+        class Collect(logging.Handler):
+            def emit(self, record):
+                records.append(record.getMessage())
+
+        logger = logging.getLogger('rest_framework_toolbox_test_queued')
+        logger.setLevel(logging.INFO)
+        logger.addHandler(Collect())
+        queued = queued_logger(logger)
+        assert queued is queued_logger(logger)
+
+        queued.info('rendered %s', 'ok')
+        queued.listener.stop()
+        assert records == ['rendered ok']
+
+    def test_concurrent_first_calls_start_one_listener(self, monkeypatch):
+        started = []
+        monkeypatch.setattr(QueueListener, 'start', lambda listener: started.append(listener))
+        logger = logging.getLogger('rest_framework_toolbox_test_queued_concurrent')
+        logger.addHandler(logging.NullHandler())
+        barrier = threading.Barrier(8)
+
+        def first_call():
+            barrier.wait()
+            queued_logger(logger)
+
+        threads = [threading.Thread(target=first_call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(started) == 1
+
+    def test_listener_is_stopped_at_exit(self, monkeypatch):
+        registered = []
+        monkeypatch.setattr(atexit, 'register', lambda func, *args: registered.append((func, args)))
+        logger = logging.getLogger('rest_framework_toolbox_test_queued_exit')
+        logger.addHandler(logging.NullHandler())
+        queued = queued_logger(logger)
+        [(func, args)] = registered
+        func(*args)
+        assert queued.listener._thread is None
+        # Stopping it twice is harmless
+        func(*args)
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not available')
+    def test_listener_runs_in_forked_children(self):
+        read, write = os.pipe()
+
+        class Forward(logging.Handler):
+            def emit(self, record):
+                os.write(write, record.getMessage().encode())
+
+        logger = logging.getLogger('rest_framework_toolbox_test_queued_fork')
+        logger.setLevel(logging.INFO)
+        logger.addHandler(Forward())
+        queued = queued_logger(logger)
+        parent = queued.listener
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                assert queued.listener is not parent
+                assert queued.listener._thread.is_alive()
+                queued.info('from the child')
+                queued.listener.stop()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        os.close(write)
+        assert os.read(read, 1024) == b'from the child'
+        os.close(read)
+        assert parent._thread.is_alive()
+        parent.stop()
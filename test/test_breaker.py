@@ -0,0 +1,135 @@
+import logging
+import threading
+
+from django.test import override_settings
+from rest_framework import exceptions
+
+from rest_framework_toolbox.handlers import ErrorHandler
+from rest_framework_toolbox.handlers.error_handler import LogBreaker
+from rest_framework_toolbox.handlers.error_handler import breaker as breaker_module
+
+from conftest import Collect, View, handle
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def log_breaker(monkeypatch, **kwds):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, 'monotonic', clock)
+    handler = Collect()
+    logger = logging.getLogger(f'rest_framework_toolbox_test_breaker_{id(handler)}')
+    logger.addHandler(handler)
+    logger.propagate = False
+    return LogBreaker(logger, **kwds), clock, handler.records
+
+
+KEY = ('NotFound', 'OrderView')
+
+
+class TestLogBreaker:
+    def test_opens_above_threshold(self, monkeypatch):
+        breaker, clock, records = log_breaker(monkeypatch, threshold=3, window=10)
+        assert [breaker.allow(KEY) for _ in range(5)] == [True, True, True, False, False]
+        assert breaker.allow(('NotFound', 'OtherView'))
+
+        state = breaker.snapshot()['NotFound:OrderView']
+        assert state['state'] == 'open'
+        assert state['suppressed'] == 2
+        assert records == []
+
+    def test_summaries_and_recovery(self, monkeypatch):
+        breaker, clock, records = log_breaker(monkeypatch, threshold=3, window=10)
+        for _ in range(10):
+            breaker.allow(KEY)
+
+        # Still storming, a summary is logged once per window
+        clock.now += 10
+        for _ in range(10):
+            assert not breaker.allow(KEY)
+        assert len(records) == 1
+        assert records[0].error_summary['suppressed'] == 8
+        assert not records[0].error_summary['recovered']
+
+        # The last window was still storming, the next one is quiet and closes the circuit
+        clock.now += 10
+        assert not breaker.allow(KEY)
+        clock.now += 10
+        assert breaker.allow(KEY)
+        assert records[-1].error_summary['recovered']
+        assert records[-2].error_summary['suppressed'] == 10
+        assert breaker.snapshot()['NotFound:OrderView']['state'] == 'closed'
+
+    def test_silence_closes_the_circuit(self, monkeypatch):
+        breaker, clock, records = log_breaker(monkeypatch, threshold=10, window=10)
+        for _ in range(200):
+            clock.now += 0.01
+            breaker.allow(KEY)
+        assert breaker.snapshot()['NotFound:OrderView']['state'] == 'open'
+
+        clock.now += 3600
+        assert breaker.allow(KEY)
+        assert records[-1].error_summary['recovered']
+        assert records[-1].error_summary['suppressed'] == 190
+        assert breaker.snapshot()['NotFound:OrderView']['state'] == 'closed'
+
+    def test_low_rate_closes_the_circuit(self, monkeypatch):
+        breaker, clock, records = log_breaker(monkeypatch, threshold=10, window=10)
+        for _ in range(20):
+            breaker.allow(KEY)
+
+        # 20 exceptions over 15 seconds is still a storm, 8 over 18 seconds isn't
+        clock.now += 15
+        for _ in range(8):
+            assert not breaker.allow(KEY)
+        clock.now += 18
+        assert breaker.allow(KEY)
+        assert records[-1].error_summary['recovered']
+
+    def test_disabled(self, monkeypatch):
+        breaker, clock, records = log_breaker(monkeypatch, threshold=0)
+        assert all(breaker.allow(KEY) for _ in range(1000))
+        assert breaker.snapshot() == {}
+
+
+class TestErrorHandlerBreaker:
+    @override_settings(ERROR_HANDLER_BREAKER_THRESHOLD=2)
+    def test_storm_is_not_logged(self, error_log):
+        for _ in range(5):
+            response = handle(exceptions.NotFound('missing'), View())
+            assert response.status_code == 404
+        assert len(error_log) == 2
+        assert ErrorHandler.breaker_state()['NotFound:View']['suppressed'] == 3
+
+    @override_settings(ERROR_HANDLER_BREAKER_THRESHOLD=2)
+    def test_handler_failure_is_counted_once(self, error_log):
+        class BrokenView(View):
+            def on_error(self, exc, context, response):
+                raise KeyError('on_error failed')
+
+        handle(exceptions.PermissionDenied('denied'), BrokenView())
+        assert ErrorHandler.breaker_state()['PermissionDenied:BrokenView']['count'] == 1
+
+    @override_settings(ERROR_HANDLER_BREAKER_THRESHOLD=1)
+    def test_only_background_signals_are_gated(self):
+        inline, background = [], []
+        done = threading.Event()
+
+        def notify(phase, ctx):
+            background.append(ctx.suppressed)
+            done.set()
+
+        with override_settings(ERROR_HANDLER_SIGNALS=[
+            {'receiver': lambda phase, ctx: inline.append(ctx.suppressed), 'phase': 'init'},
+            {'receiver': notify, 'phase': 'init', 'delivery': 'background'},
+        ]):
+            for _ in range(3):
+                handle(exceptions.NotFound('missing'), View())
+        assert done.wait(5)
+        assert inline == [False, True, True]
+        assert background == [False]
@@ -0,0 +1,120 @@
+import logging
+
+from django.test import RequestFactory
+
+from rest_framework_toolbox.handlers import CrashRecord, CrashReporter, ErrorContext, ErrorHandler
+
+from conftest import Collect, View, handle
+
+
+def crash(message='boom'):
+    try:
+        raise RuntimeError(message)
+    except RuntimeError as exc:
+        return exc
+
+
+def record_for(exc):
+    return CrashRecord.capture(ErrorContext(exc, {'view': object(), 'request': RequestFactory().post('/orders')}))
+
+
+def reporter(**kwds):
+    handler = Collect()
+    logger = logging.getLogger(f'rest_framework_toolbox_test_crash_{id(handler)}')
+    logger.addHandler(handler)
+    logger.propagate = False
+    return CrashReporter(logger, **kwds), handler
+
+
+class TestCrashRecord:
+    def test_same_crash_site_has_the_same_fingerprint(self):
+        first = record_for(crash('first'))
+        second = record_for(crash('second'))
+        assert first.fingerprint == second.fingerprint
+        assert first.exception == 'RuntimeError'
+        assert first.method == 'POST'
+        assert first.uri == '/orders'
+        assert first.frames[-1][2] == 'crash'
+
+    def test_capture_the_handler_exception_along(self):
+        exc = crash()
+        try:
+            raise KeyError('handler failed')
+        except KeyError as error:
+            handler_exc = error
+            record = CrashRecord.capture(ErrorContext(exc, {'view': object()}), handler_exc)
+        assert record.fingerprint == record_for(crash()).fingerprint
+        assert record.exception == 'RuntimeError'
+        assert record.frames[-1][2] == 'crash'
+        assert record.handler_exc is handler_exc
+        assert 'Error handler traceback' in record.format()
+        assert 'KeyError' in record.format()
+
+    def test_other_exception_class_has_another_fingerprint(self):
+        try:
+            raise KeyError('boom')
+        except KeyError as exc:
+            assert record_for(exc).fingerprint != record_for(crash()).fingerprint
+
+
+class TestCrashReporter:
+    def test_rate_limit_per_fingerprint(self):
+        crash_reporter, handler = reporter(window=60, rate_limit=2)
+        results = [crash_reporter.report(record_for(crash())) for _ in range(5)]
+        crash_reporter.join()
+        assert results == [True, True, False, False, False]
+        assert len(handler.records) == 2
+        assert 'Traceback' in handler.records[0].getMessage()
+        assert handler.records[0].crash_report['exception'] == 'RuntimeError'
+        fingerprint = handler.records[0].crash_report['fingerprint']
+        assert crash_reporter.snapshot() == {fingerprint: {'reported': 2, 'suppressed': 3}}
+
+    def test_suppressed_count_is_reported_once_the_window_is_over(self):
+        crash_reporter, handler = reporter(window=0, rate_limit=1)
+        crash_reporter.window = 60
+        for _ in range(3):
+            crash_reporter.report(record_for(crash()))
+        crash_reporter.window = 0
+        crash_reporter.flush_suppressed()
+        crash_reporter.join()
+        assert [record.crash_report['suppressed'] for record in handler.records] == [0, 2]
+
+    def test_full_queue_drops_reports(self):
+        crash_reporter, handler = reporter(queue_size=1)
+        crash_reporter._ensure_worker = lambda: None
+        assert crash_reporter.report(record_for(crash())) is True
+        assert crash_reporter.report(record_for(KeyError('other'))) is False
+        assert crash_reporter.dropped == 1
+
+    def test_write_errors_are_logged(self, caplog):
+        crash_reporter, handler = reporter()
+
+        def broken(record, suppressed):
+            raise OSError('disk full')
+
+        crash_reporter._write = broken
+        crash_reporter.report(record_for(crash()))
+        crash_reporter.join()
+        assert 'could not be written' in caplog.text
+        assert 'disk full' in caplog.text
+
+
+class TestViewCrashes:
+    def test_view_exceptions_have_their_own_fingerprint(self, monkeypatch):
+        records = []
+        monkeypatch.setattr(ErrorHandler.default().crash_reporter, 'report', records.append)
+
+        def lookup():
+            return {}['missing']
+
+        def divide():
+            return 1 / 0
+
+        for func in (lookup, divide):
+            try:
+                func()
+            except Exception as exc:
+                assert handle(exc, View()).status_code == 500
+        assert [record.exception for record in records] == ['KeyError', 'ZeroDivisionError']
+        assert records[0].fingerprint != records[1].fingerprint
+        assert [record.handler_exc for record in records] == [None, None]
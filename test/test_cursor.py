@@ -0,0 +1,62 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from rest_framework_toolbox.handlers import Linker
+
+ORDERING = ('-codename', 'pk')
+
+
+def get(url='/permissions'):
+    return Request(RequestFactory().get(url))
+
+
+def page(url='/permissions', page_size=5):
+    return Linker.paginate(get(url), Permission.objects.all(), ORDERING, page_size)
+
+
+def walk(link):
+    return urlsplit(link['href']).path + '?' + urlsplit(link['href']).query
+
+
+class TestCursorPagination:
+    def test_pages(self):
+        expected = list(Permission.objects.order_by(*ORDERING))
+        assert len(expected) > 10
+
+        with CaptureQueriesContext(connection) as queries:
+            first = page()
+        assert len(queries) == 1
+        assert 'COUNT' not in queries[0]['sql'].upper()
+        assert first.items == expected[:5]
+        assert first.links['prev'] is None
+        assert first.links['self'] == {'href': 'http://testserver/permissions'}
+
+        second = page(walk(first.links['next']))
+        assert second.items == expected[5:10]
+        assert second.has_prev
+
+        items = []
+        link = first.links['self']
+        while link:
+            current = page(walk(link))
+            items.extend(current.items)
+            link = current.links['next']
+        assert items == expected
+
+        # Going back from the second page
+        previous = page(walk(second.links['prev']))
+        assert previous.items == expected[:5]
+        assert previous.links['prev'] is None
+        assert previous.links['next'] is not None
+
+    def test_invalid_cursor(self):
+        token = parse_qs(urlsplit(page().links['next']['href']).query)['cursor'][0]
+        with pytest.raises(NotFound):
+            page(f'/permissions?cursor={token[:-2]}xx')
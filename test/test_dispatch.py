@@ -0,0 +1,83 @@
+from django.test import RequestFactory
+from rest_framework import exceptions
+from rest_framework.response import Response
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import ErrorHandler
+
+
+class NotFoundResponse(JSONModel):
+    """Error model handling `NotFound` itself, unlike the `FailResponse` of conftest"""
+    status = BooleanField(default=False)
+    message = StringField(default="Failed request")
+    error = DataField()
+
+    def not_found(self, request, response):
+        return NotFoundResponse(message="Not found", error="not_found")
+
+
+class GoneMissing(exceptions.NotFound):
+    pass
+
+
+class PlainView:
+    pass
+
+
+class ErrorView:
+    def on_error(self, exc, context, response):
+        return NotFoundResponse(message="on_error", error=exc.default_code)
+
+
+def handle_error(exc, view):
+    handler = ErrorHandler(error_model=NotFoundResponse)
+    context = {'view': view, 'request': RequestFactory().get('/')}
+    return handler._handle(exc, context, Response(status=exc.status_code))
+
+
+class TestDispatch:
+    def test_subclasses_use_the_base_class_handler(self):
+        dispatch = ErrorHandler.resolve_dispatch(GoneMissing, NotFoundResponse, PlainView)
+        assert dispatch.default_handler == 'not_found'
+        assert dispatch.user_handler is None
+        assert dispatch.on_error is False
+        assert handle_error(GoneMissing(), PlainView()).message == "Not found"
+
+    def test_view_on_error_comes_before_error_model_handlers(self):
+        assert ErrorHandler.resolve_dispatch(GoneMissing, NotFoundResponse, ErrorView).on_error is True
+        assert handle_error(GoneMissing(), ErrorView()).message == "on_error"
+
+    def test_dispatch_is_cached(self):
+        first = ErrorHandler.resolve_dispatch(exceptions.NotFound, NotFoundResponse, PlainView)
+        assert ErrorHandler.resolve_dispatch(exceptions.NotFound, NotFoundResponse, PlainView) is first
+
+    def test_registering_a_handler_invalidates_the_cache(self):
+        class Teapot(exceptions.APIException):
+            status_code = 418
+
+        class BrewedTeapot(Teapot):
+            pass
+
+        assert ErrorHandler.resolve_dispatch(BrewedTeapot, NotFoundResponse, PlainView).user_handler is None
+
+        @ErrorHandler.register_handler(Teapot)
+        def teapot(exc, context, response):
+            return NotFoundResponse(message="I'm a teapot")
+
+        try:
+            assert ErrorHandler.resolve_dispatch(BrewedTeapot, NotFoundResponse, PlainView).user_handler is teapot
+            assert handle_error(BrewedTeapot(), PlainView()).message == "I'm a teapot"
+        finally:
+            ErrorHandler._user_handlers.pop('Teapot')
+            ErrorHandler.invalidate_dispatch()
+
+
+class TestSharedHandler:
+    def test_default_handler_is_shared(self):
+        assert ErrorHandler.default() is ErrorHandler.default()
+
+    def test_configure_rebuilds_it(self):
+        previous = ErrorHandler.default()
+        assert ErrorHandler.configure() is not previous
+        assert ErrorHandler.default() is not previous
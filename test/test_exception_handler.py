@@ -0,0 +1,188 @@
+import json
+import logging
+import threading
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, override_settings
+from rest_framework import exceptions
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.core.fields import BooleanField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.core.msgpack import unpackb
+from rest_framework_toolbox.handlers import ErrorHandler, RestJsonRenderer, RestMsgPackRenderer
+from rest_framework_toolbox.handlers.error_handler import error_response_cache
+from rest_framework_toolbox.handlers.error_handler.log_policy import _capped, resolve_log_policy
+
+from conftest import Collect, FailResponse, View, handle
+
+
+class OtherFailResponse(JSONModel):
+    ok = BooleanField(default=False)
+    reason = StringField()
+
+
+class OtherView:
+    error_model = OtherFailResponse
+
+    def on_error(self, exc, context, response):
+        return self.error_model(reason=str(exc.detail))
+
+
+class TestExceptionHandler:
+    def test_view_error_model(self):
+        response = handle(exceptions.NotFound('missing'), View())
+        assert response.status_code == 404
+        assert response.data == {'status': False, 'message': 'missing', 'error': 'not_found'}
+
+    def test_concurrent_requests_keep_their_own_error_model(self):
+        barrier = threading.Barrier(8)
+        failures = []
+
+        def worker(index):
+            view = View() if index % 2 else OtherView()
+            barrier.wait()
+            for _ in range(50):
+                response = handle(exceptions.PermissionDenied(f'denied {index}'), view)
+                expected = view.on_error(exceptions.PermissionDenied(f'denied {index}'), None, None).to_dict()
+                if response.data != expected:
+                    failures.append(response.data)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert failures == []
+
+
+class TestErrorLogging:
+    def test_structured_event(self, error_log):
+        handle(exceptions.NotFound('missing'), View())
+        event = error_log[-1].error_event
+        assert error_log[-1].levelno == logging.WARNING
+        assert event['exception'] == 'NotFound'
+        assert event['view'] == 'View'
+        assert event['status_code'] == 404
+        assert 'traceback' not in event
+
+    @override_settings(ERROR_HANDLER_LOG_POLICIES={
+        'ValidationError': {'level': 'DEBUG'},
+        'APIException': {'traceback': True, 'max_size': 10},
+    })
+    def test_policies(self, error_log):
+        handle(exceptions.ValidationError('invalid'), View())
+        assert error_log == []
+
+        handle(exceptions.PermissionDenied('denied'), View())
+        event = error_log[-1].error_event
+        assert 'traceback' in event
+        assert event['meta'].startswith(repr(RequestFactory().get('/').META)[:10])
+        assert event['meta'].endswith('... (truncated)')
+
+    def test_capped_representation(self):
+        value = {'a': [1, 'b', (2, None), (3,)], 'c': 'x' * 10000}
+        assert _capped(value, 1000000) == repr(value)
+        capped = _capped(value, 40)
+        assert capped == repr(value)[:40] + '... (truncated)'
+
+    @override_settings(ERROR_HANDLER_LOG_POLICIES={'NotFound': {'level': 'VERBOSE'}})
+    def test_unknown_level(self):
+        with pytest.raises(ImproperlyConfigured):
+            ErrorHandler.configure()
+        # Exceptions are still handled, with the default level
+        assert resolve_log_policy(exceptions.NotFound).level == logging.WARNING
+        assert handle(exceptions.NotFound('missing'), View()).status_code == 404
+
+    @override_settings(ERROR_HANDLER_LOG_POLICIES={'default': {'sample_rate': 0}})
+    def test_sampling(self, error_log):
+        handle(exceptions.NotFound('missing'), View())
+        assert error_log == []
+
+
+class CountingView(APIView):
+    renderer_classes = (RestJsonRenderer, RestMsgPackRenderer)
+    error_model = FailResponse
+    handled = 0
+
+    def get(self, request):
+        raise exceptions.Throttled(wait=3)
+
+    def post(self, request):
+        raise exceptions.NotFound('missing')
+
+    def on_error(self, exc, context, response):
+        CountingView.handled += 1
+        return FailResponse(message=str(exc.detail), error=exc.default_code)
+
+
+STATIC_ERRORS = ('NotFound', 'Throttled')
+
+
+@pytest.fixture
+def render_log():
+    handler = Collect()
+    logger = logging.getLogger('rest_framework_toolbox')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield handler.records
+    logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+
+
+class TestErrorResponseCache:
+    def setup_method(self):
+        error_response_cache.clear()
+        CountingView.handled = 0
+
+    @override_settings(ERROR_HANDLER_STATIC_ERRORS=STATIC_ERRORS)
+    def test_static_errors_are_served_from_the_cache(self, render_log):
+        view = CountingView.as_view()
+        first = view(APIRequestFactory().post('/'))
+        first.render()
+        second = view(APIRequestFactory().post('/'))
+        second.render()
+        assert CountingView.handled == 1
+        assert second.status_code == 404
+        assert second.content == first.content
+        assert second['Content-Type'] == 'application/json'
+        assert json.loads(second.content) == {'status': False, 'message': 'missing', 'error': 'not_found'}
+        # Cached responses still go through the renderer
+        assert len([record for record in render_log if 'status code 404' in record.getMessage()]) == 2
+
+    @override_settings(ERROR_HANDLER_STATIC_ERRORS=STATIC_ERRORS)
+    def test_cached_per_renderer(self):
+        view = CountingView.as_view()
+        view(APIRequestFactory().post('/')).render()
+        view(APIRequestFactory().post('/', HTTP_ACCEPT='application/msgpack')).render()
+        second = view(APIRequestFactory().post('/', HTTP_ACCEPT='application/msgpack'))
+        second.render()
+        assert CountingView.handled == 2
+        assert second['Content-Type'] == 'application/msgpack'
+        assert unpackb(second.content) == {'status': False, 'message': 'missing', 'error': 'not_found'}
+
+    @override_settings(ERROR_HANDLER_STATIC_ERRORS=STATIC_ERRORS)
+    def test_dynamic_headers_are_merged(self):
+        view = CountingView.as_view()
+        view(APIRequestFactory().get('/')).render()
+        second = view(APIRequestFactory().get('/'))
+        assert CountingView.handled == 1
+        assert second.status_code == 429
+        assert second['Retry-After'] == '3'
+
+    @override_settings(ERROR_HANDLER_STATIC_ERRORS=STATIC_ERRORS)
+    def test_editing_the_response_data_leaves_the_cache_untouched(self):
+        view = CountingView.as_view()
+        view(APIRequestFactory().post('/')).data['message'] = 'edited'
+        second = view(APIRequestFactory().post('/'))
+        second.data['message'] = 'edited again'
+        assert view(APIRequestFactory().post('/')).data['message'] == 'missing'
+        assert CountingView.handled == 1
+
+    def test_disabled_by_default(self):
+        view = CountingView.as_view()
+        view(APIRequestFactory().post('/')).render()
+        view(APIRequestFactory().post('/')).render()
+        assert CountingView.handled == 2
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SETUP = (
+    "import sys, django; from django.conf import settings; settings.configure(); django.setup(); "
+)
+MARKER = '-- measured imports'
+
+
+def import_time(statement, setup=''):
+    """Runs `statement` with `-X importtime` and returns the cumulative import time, in
+    microseconds, of the modules it imported, by name, and their total"""
+    code = f"{setup}import sys; sys.stderr.write('{MARKER}\\n'); sys.stderr.flush(); {statement}"
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=BASE_DIR, check=True,
+    )
+    modules = {}
+    total = 0
+    for line in process.stderr.split(MARKER, 1)[1].splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+        # Top level imports are indented with a single space
+        if not name.startswith('   '):
+            total += int(cumulative)
+    return modules, total
+
+
+def packages(modules):
+    return {name.split('.')[0] for name in modules}
+
+
+def test_core_imports_without_django():
+    modules, _ = import_time('import rest_framework_toolbox.core.models, rest_framework_toolbox.core.fields')
+    assert 'rest_framework_toolbox.core.models.main' in modules
+    assert not packages(modules) & {'django', 'rest_framework'}
+
+
+def test_packages_import_lazily():
+    modules, _ = import_time('import rest_framework_toolbox.handlers, rest_framework_toolbox.swagger')
+    assert not packages(modules) & {'django', 'rest_framework', 'drf_spectacular'}
+
+
+def test_lazy_import_time():
+    lazy, lazy_total = import_time('import rest_framework_toolbox.handlers', SETUP)
+    eager, eager_total = import_time(
+        'from rest_framework_toolbox.handlers import exception_handler, Linker, RestJsonRenderer', SETUP)
+    assert 'rest_framework_toolbox.handlers.error_handler.main' not in lazy
+    assert 'rest_framework_toolbox.handlers.error_handler.main' in eager
+    assert lazy_total < eager_total, (lazy_total, eager_total)
@@ -0,0 +1,137 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.conf.urls.i18n import i18n_patterns
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, include, path, reverse
+from django.utils import translation
+from rest_framework.request import Request
+
+from rest_framework_toolbox.core.fields import DictField, IntegerField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import Linker
+
+
+def view(request, **kwargs):
+    pass
+
+
+shop_patterns = ([
+    path('orders/<int:pk>', view, name='order-detail'),
+    path('orders/<slug:reference>/lines/<int:line>', view, name='order-line'),
+], 'shop')
+
+urlpatterns = [
+    path('customers/<str:pk>', view, name='customer-detail'),
+    path('shops/<int:shop>/', include(shop_patterns, namespace='eu')),
+    # The last pattern of a name is tried first
+    path('items/<slug:pk>', view, name='item'),
+    path('items/<int:pk>', view, name='item'),
+    path('reports.<slug:format>', view, name='report'),
+    path('reports/', view, {'format': 'json'}, name='report'),
+    *i18n_patterns(path('catalog/<int:pk>', view, name='catalog-item')),
+    path('permissions/<int:pk>', view, name='permission-detail'),
+    path('content-types/<int:pk>', view, name='contenttype-detail'),
+]
+
+
+@pytest.fixture(autouse=True)
+def urlconf():
+    with override_settings(ROOT_URLCONF=__name__):
+        yield
+
+
+class Order(JSONModel):
+    pk = IntegerField()
+    links = DictField()
+
+
+class TestLinker:
+    def request(self):
+        return Request(RequestFactory().get('/orders', HTTP_HOST='api.example.com'))
+
+    def test_links_match_reverse(self):
+        request = self.request()
+        assert Linker.links(request, 'customer-detail', ['a b', 'café?']) == [
+            request.build_absolute_uri(reverse('customer-detail', kwargs={'pk': pk})) for pk in ['a b', 'café?']
+        ]
+        assert Linker.reverse(request, 'eu:order-line', shop=3, reference='ab-1', line=2) == \
+            'http://api.example.com' + reverse('eu:order-line', kwargs={'shop': 3, 'reference': 'ab-1', 'line': 2})
+        assert Linker.reverse(request, 'shop:order-detail', shop=1, pk=5) == 'http://api.example.com/shops/1/orders/5'
+
+    def test_invalid_values(self):
+        with pytest.raises(NoReverseMatch):
+            Linker.links(self.request(), 'eu:order-line', ['not a slug'], kwarg='reference')
+        with pytest.raises(NoReverseMatch):
+            Linker.reverse(self.request(), 'eu:order-detail', shop='x', pk=1)
+        with pytest.raises(NoReverseMatch):
+            Linker.reverse(self.request(), 'customer-detail', id=1)
+
+    def test_candidates_are_tried_in_order(self):
+        request = self.request()
+        for pk in [5, 'abc']:
+            assert Linker.reverse(request, 'item', pk=pk) == 'http://api.example.com' + reverse('item', kwargs={'pk': pk})
+        for report_format in ['json', 'csv']:
+            assert Linker.reverse(request, 'report', format=report_format) == \
+                'http://api.example.com' + reverse('report', kwargs={'format': report_format})
+        assert Linker.reverse(request, 'report', format='json') == 'http://api.example.com/reports/'
+
+    def test_active_language(self):
+        request = self.request()
+        for language in ['en', 'fr', 'en']:
+            with translation.override(language):
+                assert Linker.links(request, 'catalog-item', [1]) == [f'http://api.example.com/{language}/catalog/1']
+
+    def test_attach(self):
+        request = self.request()
+        items = Linker.attach(request, [{'pk': 'a'}, {'pk': 'b', 'links': {'orders': {'href': '/orders'}}}], 'customer-detail')
+        assert items[0] == {'pk': 'a', 'links': {'self': {'href': 'http://api.example.com/customers/a'}}}
+        assert items[1]['links'] == {
+            'orders': {'href': '/orders'},
+            'self': {'href': 'http://api.example.com/customers/b'},
+        }
+
+        orders = Linker.attach(request, [Order(pk=1), Order(pk=2)], 'eu:order-detail', shop=7)
+        assert [order.to_dict()['links'] for order in orders] == [
+            {'self': {'href': 'http://api.example.com/shops/7/orders/1'}},
+            {'self': {'href': 'http://api.example.com/shops/7/orders/2'}},
+        ]
+        # The default value of the field is left untouched
+        assert Order().links == {}
+
+
+class TestRelatedLinks:
+    def expected(self, request, permission):
+        return {
+            'self': {'href': request.build_absolute_uri(reverse('permission-detail', kwargs={'pk': permission.pk}))},
+            'content_type': {'href': request.build_absolute_uri(
+                reverse('contenttype-detail', kwargs={'pk': permission.content_type_id}))},
+        }
+
+    def test_queryset(self):
+        request = Request(RequestFactory().get('/'))
+        permissions = list(Permission.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            links = Linker.related(
+                request, Permission.objects.all(), {'content_type': 'contenttype-detail'},
+                self_view='permission-detail')
+        assert len(queries) == 1
+        assert 'django_content_type' not in queries[0]['sql']
+        assert links == {permission.pk: self.expected(request, permission) for permission in permissions}
+
+    def test_instances(self):
+        request = Request(RequestFactory().get('/'))
+        permissions = list(Permission.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            links = Linker.related(request, permissions, {'content_type': 'contenttype-detail'}, self_view='permission-detail')
+        assert len(queries) == 0
+        assert links[permissions[0].pk] == self.expected(request, permissions[0])
+
+    def test_null_and_invalid_relations(self):
+        request = Request(RequestFactory().get('/'))
+        permission = Permission(pk=1000, content_type_id=None)
+        assert Linker.related(request, [permission], {'content_type': 'contenttype-detail'}) == {
+            1000: {'content_type': None}}
+        with pytest.raises(ValueError):
+            Linker.related(request, Permission.objects.all(), {'group': 'contenttype-detail'})
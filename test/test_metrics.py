@@ -0,0 +1,139 @@
+import os
+import threading
+
+import pytest
+
+from django.test import override_settings
+from rest_framework import exceptions
+from rest_framework.test import APIRequestFactory
+
+from rest_framework_toolbox.metrics import Counter, Histogram, MetricsView, Registry, errors_total, registry
+from rest_framework_toolbox.metrics.multiprocess import write_samples
+
+from conftest import View, handle
+
+
+def run_in_threads(func, count=4):
+    threads = [threading.Thread(target=func) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestMetrics:
+    def test_counter_shards_are_merged(self):
+        counter = Counter('hits_total', 'Hits', ('view',), registry=Registry())
+
+        def hit():
+            for _ in range(1000):
+                counter.inc('OrderView')
+
+        run_in_threads(hit)
+        counter.inc('OrderView', amount=5)
+        assert counter.samples() == {('OrderView',): 4005}
+        # Samples of the exited threads are kept
+        assert counter.samples() == {('OrderView',): 4005}
+
+    def test_exposition(self):
+        metrics = Registry()
+        counter = Counter('hits_total', 'Hits', ('view',), registry=metrics)
+        histogram = Histogram('latency_seconds', 'Latency', ('view',), registry=metrics, buckets=(.1, 1))
+        counter.inc('Order"View')
+        for value in (.05, .5, 5):
+            histogram.observe(value, 'OrderView')
+
+        assert metrics.exposition() == (
+            '# HELP hits_total Hits\n'
+            '# TYPE hits_total counter\n'
+            'hits_total{view="Order\\"View"} 1\n'
+            '# HELP latency_seconds Latency\n'
+            '# TYPE latency_seconds histogram\n'
+            'latency_seconds_bucket{view="OrderView",le="0.1"} 1\n'
+            'latency_seconds_bucket{view="OrderView",le="1"} 2\n'
+            'latency_seconds_bucket{view="OrderView",le="+Inf"} 3\n'
+            'latency_seconds_sum{view="OrderView"} 5.55\n'
+            'latency_seconds_count{view="OrderView"} 3\n'
+        )
+
+    def test_multiprocess(self, tmp_path):
+        metrics = Registry()
+        counter = Counter('hits_total', 'Hits', ('view',), registry=metrics)
+        histogram = Histogram('latency_seconds', 'Latency', (), registry=metrics, buckets=(1,))
+        counter.inc('OrderView')
+        histogram.observe(.5)
+        write_samples(str(tmp_path), 1, {'hits_total': {('OrderView',): 2}, 'latency_seconds': {(): [1, 1, 3.0]}})
+        write_samples(str(tmp_path), 2, {'hits_total': {('OrderView',): 3, ('UserView',): 1}})
+
+        with override_settings(METRICS_MULTIPROCESS_DIR=str(tmp_path)):
+            assert metrics.collect() == {
+                'hits_total': {('OrderView',): 6, ('UserView',): 1},
+                'latency_seconds': {(): [2, 1, 3.5]},
+            }
+            metrics.flush()
+        assert len(list(tmp_path.glob('metrics_*.json'))) == 3
+
+    def test_processes_reusing_a_pid_keep_their_own_file(self, tmp_path):
+        # Registries of the same process stand for processes with the same pid
+        first, second, scraper = Registry(), Registry(), Registry()
+        for metrics, hits in ((first, 2), (second, 3), (scraper, 0)):
+            Counter('hits_total', 'Hits', (), registry=metrics).inc(amount=hits)
+        with override_settings(METRICS_MULTIPROCESS_DIR=str(tmp_path)):
+            first.flush()
+            second.flush()
+            assert len(list(tmp_path.glob('metrics_*.json'))) == 2
+            assert scraper.collect() == {'hits_total': {(): 5}}
+
+    def test_flush_failures_are_logged_once(self, tmp_path, caplog):
+        metrics = Registry()
+        Counter('hits_total', 'Hits', (), registry=metrics).inc()
+        # A file stands where the directory should be
+        directory = tmp_path / 'metrics'
+        directory.write_text('')
+        with override_settings(METRICS_MULTIPROCESS_DIR=str(directory)):
+            metrics._safe_flush()
+            metrics._safe_flush()
+        failures = [record for record in caplog.records if record.name == 'rest_framework_toolbox.metrics']
+        assert len(failures) == 1
+        assert 'could not be written' in failures[0].getMessage()
+
+        directory.unlink()
+        directory.mkdir()
+        with override_settings(METRICS_MULTIPROCESS_DIR=str(directory)):
+            metrics._safe_flush()
+        assert metrics._flush_failing is False
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not available')
+    def test_fork_while_a_lock_is_held(self):
+        metrics = Registry()
+        counter = Counter('hits_total', 'Hits', (), registry=metrics)
+        counter.inc()
+        with counter._lock:
+            pid = os.fork()
+            if pid == 0:
+                # A fresh lock and no samples of the parent in the child
+                metrics._after_fork()
+                counter.inc()
+                os._exit(0 if counter.samples() == {(): 1} else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert counter.samples() == {(): 1}
+
+
+class TestToolboxMetrics:
+    @override_settings(METRICS_ENABLED=True)
+    def test_errors_are_counted(self):
+        before = errors_total.samples().get(('NotFound', 'View', '404'), 0)
+        handle(exceptions.NotFound('missing'), View())
+        assert errors_total.samples()[('NotFound', 'View', '404')] == before + 1
+
+    @override_settings(METRICS_ENABLED=True)
+    def test_metrics_view(self):
+        handle(exceptions.NotFound('missing'), View())
+        request = APIRequestFactory().get('/metrics')
+        response = MetricsView.as_view(permission_classes=(), registry=registry)(request)
+        response.render()
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.content.decode()
+        assert '# TYPE rest_framework_toolbox_errors_total counter' in body
+        assert 'rest_framework_toolbox_error_dispatch_total{exception="NotFound",handler="on_error"}' in body
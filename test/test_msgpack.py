@@ -0,0 +1,73 @@
+import datetime
+import io
+
+import pytest
+from django.test import RequestFactory
+from rest_framework.exceptions import ParseError
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.core.msgpack import packb, unpackb, MsgPackError
+from rest_framework_toolbox.handlers import MsgPackParser, RestMsgPackRenderer
+
+
+class SuccessResponse(JSONModel):
+    class Meta(JSONModel):
+        page = StringField()
+
+    status = BooleanField(default=True)
+    message = StringField(default="Successful request")
+    data = DataField()
+    meta = Meta()
+
+
+class TestMsgPack:
+    @pytest.mark.parametrize('value', [
+        None, True, False, 0, 127, 128, 65536, 2 ** 64 - 1, -1, -33, -2 ** 63, 1.5,
+        '', 'a' * 31, 'é' * 300, b'\x00' * 300, [1] * 16, {'a': [{'b': None}]},
+        {str(i): i for i in range(70000)},
+    ])
+    def test_roundtrip(self, value):
+        assert unpackb(packb(value)) == value
+
+    def test_known_encoding(self):
+        assert packb({'compact': True, 'schema': 0}) == b'\x82\xa7compact\xc3\xa6schema\x00'
+
+    def test_model_uses_class_plan(self):
+        model = SuccessResponse(data=[1, 2])
+        model.meta.page = '1'
+        assert unpackb(packb(model)) == model.to_dict()
+
+    def test_default_hook(self):
+        value = datetime.date(2024, 1, 2)
+        with pytest.raises(TypeError):
+            packb(value)
+        assert unpackb(packb(value, default=str)) == '2024-01-02'
+
+    def test_malformed_data(self):
+        with pytest.raises(MsgPackError):
+            unpackb(b'\x92\x01')
+        with pytest.raises(MsgPackError):
+            unpackb(b'\x01\x02')
+
+
+class TestMsgPackRendererParser:
+    def test_render_and_parse(self):
+        class View:
+            response = type('Response', (), {'status_code': 200})()
+
+            def on_success(self, request, data):
+                return SuccessResponse(data=data)
+
+        view = View()
+        content = RestMsgPackRenderer().render(
+            {'created': datetime.datetime(2024, 1, 2, 3, 4, 5)},
+            renderer_context={'view': view, 'request': RequestFactory().get('/')},
+        )
+        data = MsgPackParser().parse(io.BytesIO(content))
+        assert data['status'] is True
+        assert data['data'] == {'created': '2024-01-02T03:04:05'}
+
+    def test_parse_error(self):
+        with pytest.raises(ParseError):
+            MsgPackParser().parse(io.BytesIO(b'\xc1'))
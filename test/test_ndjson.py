@@ -0,0 +1,74 @@
+import json
+
+from django.contrib.auth.models import Permission
+from django.test import override_settings
+from rest_framework.response import Response
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import NDJSONRenderer, NDJSONStreamingResponse
+
+
+class SuccessResponse(JSONModel):
+    status = BooleanField(default=True)
+    message = StringField(default="Successful request")
+    data = DataField()
+
+
+class ExportView:
+    def on_success(self, request, data):
+        return SuccessResponse(message="Export", data=data)
+
+
+class AsyncExportView:
+    async def on_success(self, request, data):
+        return SuccessResponse(message="Async export", data=data)
+
+
+def parse(content):
+    return [json.loads(line) for line in content.decode('utf-8').splitlines()]
+
+
+class TestNDJSONRenderer:
+    def test_one_record_per_line(self):
+        content = NDJSONRenderer().render([{'id': 1}, {'id': 2}, SuccessResponse(data=3)])
+        assert content.endswith(b'\n')
+        assert parse(content) == [
+            {'id': 1},
+            {'id': 2},
+            {'status': True, 'message': 'Successful request', 'data': 3},
+        ]
+
+    @override_settings(NDJSON_ENVELOPE='header')
+    def test_envelope_header(self):
+        content = NDJSONRenderer().render([{'id': 1}], renderer_context={'view': ExportView()})
+        assert parse(content) == [
+            {'status': True, 'message': 'Export', 'data': None},
+            {'id': 1},
+        ]
+
+    @override_settings(NDJSON_ENVELOPE='header')
+    def test_async_on_success_envelope(self):
+        content = NDJSONRenderer().render([{'id': 1}], renderer_context={'view': AsyncExportView()})
+        assert parse(content)[0] == {'status': True, 'message': 'Async export', 'data': None}
+
+    def test_envelope_trailer(self):
+        view = ExportView()
+        view.ndjson_envelope = 'trailer'
+        content = NDJSONRenderer().render([{'id': 1}], renderer_context={'view': view})
+        assert parse(content)[-1]['message'] == 'Export'
+
+    @override_settings(NDJSON_ENVELOPE='header')
+    def test_error_responses_have_no_envelope(self):
+        error = {'status': False, 'message': 'Not found'}
+        response = Response(error, status=404)
+        response.exception = True
+        content = NDJSONRenderer().render(error, renderer_context={'view': ExportView(), 'response': response})
+        assert parse(content) == [error]
+
+    def test_streaming_response_from_queryset(self):
+        queryset = Permission.objects.order_by('pk').values('pk', 'codename')
+        response = NDJSONStreamingResponse(queryset, chunk_size=10)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        records = parse(b''.join(response.streaming_content))
+        assert records == list(queryset)
@@ -0,0 +1,75 @@
+from django.test import override_settings
+
+from rest_framework_toolbox.core.fields import BooleanField, DictField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.swagger.schema_errors import NotFound, Throttled, error_examples
+
+
+class Error(JSONModel):
+    code = StringField()
+    details = StringField()
+
+
+class ErrorResponse(JSONModel):
+    ok = BooleanField(default=False)
+    message = StringField()
+    error = Error()
+
+
+class DictErrorResponse(JSONModel):
+    ok = BooleanField(default=False)
+    error = DictField(default={'code': None, 'details': None})
+
+
+class HandlerErrorResponse(JSONModel):
+    ok = BooleanField(default=False)
+    reason = StringField()
+
+    def not_found(self, request, response):
+        return HandlerErrorResponse(reason=f"missing: {response.data['detail']}")
+
+
+class TestErrorExamples:
+    def setup_method(self):
+        error_examples.clear()
+
+    def test_default_payload(self):
+        assert NotFound()() == {
+            'status': False,
+            'message': 'The requested resource was not found.',
+            'error': {'code': 'not_found', 'details': 'The requested resource was not found.'},
+        }
+        assert Throttled(message='Slow down')()['error']['code'] == 'throttled'
+        assert NotFound().serializer.status_code == 404
+        assert NotFound().serializer.data == NotFound()()
+
+    def test_payloads_are_built_once_and_frozen(self):
+        payload = error_examples.payload('NotFound')
+        assert error_examples.payload('NotFound') is payload
+        assert NotFound().payload is payload
+        value = NotFound()()
+        value['message'] = 'changed'
+        assert payload['message'] == 'The requested resource was not found.'
+        assert NotFound().example is NotFound().example
+        assert NotFound().example.status_codes == ['404']
+
+    @override_settings(ERROR_JSON_MODEL='test_schema_errors.ErrorResponse')
+    def test_error_model_fields(self):
+        assert NotFound(message='Order not found')() == {
+            'ok': False,
+            'message': 'Order not found',
+            'error': {'code': 'not_found', 'details': 'Order not found'},
+        }
+
+    @override_settings(ERROR_JSON_MODEL='test_schema_errors.HandlerErrorResponse')
+    def test_error_model_handler(self):
+        assert NotFound()() == {'ok': False, 'reason': 'missing: The requested resource was not found.'}
+        assert Throttled()() == {'ok': False, 'reason': None}
+
+    @override_settings(ERROR_JSON_MODEL='test_schema_errors.DictErrorResponse')
+    def test_error_model_defaults_are_left_untouched(self):
+        assert NotFound()() == {
+            'ok': False,
+            'error': {'code': 'not_found', 'details': 'The requested resource was not found.'},
+        }
+        assert DictErrorResponse().to_dict() == {'ok': False, 'error': {'code': None, 'details': None}}
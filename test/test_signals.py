@@ -0,0 +1,83 @@
+import threading
+import time
+
+from django.test import override_settings
+from rest_framework import exceptions
+
+from rest_framework_toolbox.handlers import ErrorHandler
+from rest_framework_toolbox.handlers.error_handler import ErrorSignals
+from rest_framework_toolbox.handlers.error_handler.signals import Receiver
+
+from conftest import View, handle
+
+calls = []
+
+
+def record(phase, ctx, **kwds):
+    calls.append((phase, ctx.exc.__class__.__name__, sorted(kwds)))
+
+
+async def arecord(phase, ctx, **kwds):
+    calls.append(('async ' + phase, ctx.exc.__class__.__name__, sorted(kwds)))
+
+
+def broken(phase, ctx, **kwds):
+    raise RuntimeError('receiver failed')
+
+
+class BrokenView(View):
+    def on_error(self, exc, context, response):
+        raise KeyError('on_error failed')
+
+
+class TestErrorSignals:
+    def setup_method(self):
+        calls.clear()
+
+    @override_settings(ERROR_HANDLER_SIGNALS=[record, {'receiver': arecord, 'phase': 'error_handling'}, broken])
+    def test_inline_receivers(self):
+        response = handle(exceptions.PermissionDenied('denied'), View())
+        assert response.status_code == 403
+        assert calls == [
+            ('init', 'PermissionDenied', []),
+            ('error_handling', 'PermissionDenied', ['error_response']),
+            ('async error_handling', 'PermissionDenied', ['error_response']),
+        ]
+
+    @override_settings(ERROR_HANDLER_SIGNALS=[{'receiver': record, 'phase': ['failure']}])
+    def test_failure(self):
+        response = handle(exceptions.PermissionDenied('denied'), BrokenView())
+        assert response.status_code == 500
+        assert calls == [('failure', 'PermissionDenied', ['error'])]
+
+    @override_settings(ERROR_HANDLER_SIGNALS=[record])
+    def test_failure_sequence(self):
+        handle(exceptions.PermissionDenied('denied'), BrokenView())
+        assert [phase for phase, _, _ in calls] == ['init', 'failure']
+
+    def test_background_receivers_dont_block(self):
+        release = threading.Event()
+        done = threading.Event()
+
+        def slow(phase, ctx, **kwds):
+            release.wait(5)
+            done.set()
+
+        with override_settings(ERROR_HANDLER_SIGNALS=[
+            {'receiver': slow, 'phase': 'error_handling', 'delivery': 'background'},
+        ]):
+            started = time.perf_counter()
+            handle(exceptions.PermissionDenied('denied'), View())
+            assert time.perf_counter() - started < 1
+            assert not done.is_set()
+            release.set()
+            assert done.wait(5)
+
+    def test_bounded_queue(self):
+        release = threading.Event()
+        signals = ErrorSignals([Receiver(lambda *args, **kwds: release.wait(5), ('init',), 'background')], queue_size=2)
+        ctx = ErrorHandler.default().build_context(exceptions.NotFound(), {'view': View()})
+        for _ in range(5):
+            signals.send('init', ctx)
+        assert signals.dropped == 3
+        release.set()
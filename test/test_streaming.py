@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.test import RequestFactory
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, ListField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import PaginatedStreamingResponse
+
+
+class SuccessResponse(JSONModel):
+    status = BooleanField(default=True)
+    links = ListField()
+    message = StringField(default="Successful request")
+    data = DataField()
+
+
+class PermissionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Permission
+        fields = ('id', 'codename')
+
+
+class Pagination(PageNumberPagination):
+    page_size = 5
+
+
+class ListView:
+    paginator = Pagination()
+
+    def on_success(self, request, data):
+        return SuccessResponse(data=data)
+
+
+class AsyncListView(ListView):
+    async def on_success(self, request, data):
+        return SuccessResponse(message="Async list", data=data)
+
+
+def stream(url, view=None):
+    response = PaginatedStreamingResponse(
+        Permission.objects.order_by('pk'),
+        serializer_class=PermissionSerializer,
+        view=view or ListView(),
+        request=RequestFactory().get(url),
+    )
+    return json.loads(b''.join(response.streaming_content))
+
+
+class TestPaginatedStreamingResponse:
+    def test_first_page(self):
+        content = stream('/permissions/')
+        expected = PermissionSerializer(Permission.objects.order_by('pk')[:5], many=True).data
+        assert list(content) == ['status', 'message', 'data', 'links']
+        assert content['data'] == expected
+        assert content['links'] == {
+            'self': {'href': 'http://testserver/permissions/'},
+            'next': {'href': 'http://testserver/permissions/?page=2'},
+            'prev': None,
+        }
+
+    def test_last_page(self):
+        count = Permission.objects.count()
+        last = (count + 4) // 5
+        content = stream(f'/permissions/?page={last}')
+        assert len(content['data']) == count - (last - 1) * 5
+        assert content['links']['next'] is None
+        assert content['links']['prev'] == {'href': f'http://testserver/permissions/?page={last - 1}'}
+
+    def test_page_past_the_last_one(self):
+        last = (Permission.objects.count() + 4) // 5
+        with pytest.raises(NotFound):
+            stream(f'/permissions/?page={last + 1}')
+
+    def test_async_on_success_envelope(self):
+        content = stream('/permissions/', AsyncListView())
+        assert content['message'] == 'Async list'
+        assert len(content['data']) == 5
+
+    def test_rows_without_serializer(self):
+        request = RequestFactory().get('/permissions/')
+        queryset = Permission.objects.order_by('pk')
+        with pytest.raises(TypeError):
+            PaginatedStreamingResponse(queryset, view=ListView(), request=request)
+
+        response = PaginatedStreamingResponse(queryset.values('id', 'codename'), view=ListView(), request=request)
+        content = json.loads(b''.join(response.streaming_content))
+        assert content['data'] == list(queryset.values('id', 'codename')[:5])
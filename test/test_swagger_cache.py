@@ -0,0 +1,109 @@
+import os
+
+import pytest
+from django.test import override_settings
+from django.urls import path
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.core.fields import StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.swagger import CachedSpectacularAPIView
+from rest_framework_toolbox.swagger.cache import _source_files, schema_cache, schema_fingerprint
+
+import test_swagger_lazy
+from test_swagger_lazy import declare
+from drf_spectacular.utils import extend_schema
+
+OrdersView = declare(extend_schema)
+patterns = [path('orders', OrdersView.as_view())]
+
+JSON = 'application/vnd.oai.openapi+json'
+YAML = 'application/vnd.oai.openapi'
+
+
+def fetch(view_class, accept, **initkwargs):
+    request = APIRequestFactory().get('/schema', HTTP_ACCEPT=accept)
+    response = view_class.as_view(patterns=patterns, **initkwargs)(request)
+    if hasattr(response, 'render'):
+        response.render()
+    content = b''.join(response) if response.streaming else response.content
+    return response, content
+
+
+class TestSchemaCache:
+    def setup_method(self):
+        schema_cache.clear()
+        CachedSpectacularAPIView._fingerprints.clear()
+
+    @pytest.mark.parametrize('accept', [JSON, YAML])
+    def test_same_document(self, accept):
+        expected, expected_content = fetch(SpectacularAPIView, accept)
+        response, content = fetch(CachedSpectacularAPIView, accept)
+        assert content == expected_content
+        assert response['Content-Type'] == expected['Content-Type']
+        assert response['Content-Disposition'] == expected['Content-Disposition']
+
+    def test_persisted_documents_are_served(self, tmp_path, monkeypatch):
+        with override_settings(SWAGGER_CACHE_DIR=str(tmp_path)):
+            _, content = fetch(CachedSpectacularAPIView, JSON)
+            assert sorted(file.suffix for file in tmp_path.iterdir()) == ['.json', '.yaml']
+
+            # Another process finds the documents on disk
+            schema_cache.clear()
+            CachedSpectacularAPIView._fingerprints.clear()
+            monkeypatch.setattr(CachedSpectacularAPIView, 'render_documents', None)
+            assert fetch(CachedSpectacularAPIView, JSON)[1] == content
+            assert b'openapi: 3.0.3' in fetch(CachedSpectacularAPIView, YAML)[1]
+
+    def test_fingerprint(self):
+        fingerprint = schema_fingerprint([OrdersView])
+        assert schema_fingerprint([OrdersView]) == fingerprint
+
+        class OrderEnvelope(JSONModel):
+            reference = StringField()
+
+        assert schema_fingerprint([OrdersView]) != fingerprint
+        assert schema_fingerprint([OrdersView], extra=['orders']) != schema_fingerprint([OrdersView])
+
+    @override_settings(BASE_DIR=os.path.dirname(__file__))
+    def test_source_files_are_the_modules_of_the_views(self):
+        files = _source_files([OrdersView])
+        assert test_swagger_lazy.__file__ in files
+        assert __file__ not in files
+
+        # Serializers only referenced by `extend_schema`, or nested, are found once loaded
+        class ReferencedSerializer(serializers.Serializer):
+            reference = serializers.CharField()
+
+        assert __file__ in _source_files([OrdersView])
+
+    @override_settings(SWAGGER_CACHE_VERSION='2')
+    def test_cache_version(self):
+        with override_settings(SWAGGER_CACHE_VERSION='1'):
+            fingerprint = schema_fingerprint([OrdersView])
+        assert schema_fingerprint([OrdersView]) != fingerprint
+
+    def test_configurations_share_the_directory(self, tmp_path):
+        with override_settings(SWAGGER_CACHE_DIR=str(tmp_path)):
+            fetch(CachedSpectacularAPIView, JSON)
+            fetch(CachedSpectacularAPIView, JSON, custom_settings={'TITLE': 'Orders API'})
+            assert len(list(tmp_path.iterdir())) == 4
+
+            # A new fingerprint of a configuration only replaces the files of that configuration
+            schema_cache.set('new', None, {'json': b'{}'}, config='other')
+            schema_cache.set('newer', None, {'json': b'{}'}, config='other')
+            names = sorted(file.name for file in tmp_path.iterdir())
+            assert len(names) == 5
+            assert [name for name in names if name.startswith('openapi-other-')] == [
+                os.path.basename(schema_cache._path(str(tmp_path), 'other', 'newer', None, 'json'))]
+
+    def test_views_with_other_arguments_are_cached_separately(self):
+        _, content = fetch(CachedSpectacularAPIView, JSON)
+        _, titled = fetch(CachedSpectacularAPIView, JSON, custom_settings={'TITLE': 'Orders API'})
+        assert b'Orders API' in titled
+        assert b'Orders API' not in content
+        assert fetch(CachedSpectacularAPIView, JSON)[1] == content
+        assert len(CachedSpectacularAPIView._fingerprints) == 2
@@ -0,0 +1,119 @@
+import pytest
+from django.test import override_settings
+from django.urls import path
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.settings import patched_settings
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.core.fields import DictField, IntegerField, ListField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.swagger import (
+    generate_success_component,
+    model_component,
+    postprocess_components,
+)
+from rest_framework_toolbox.swagger.components import MODEL_REF_PREFIX, clear_components
+
+from test_swagger_schema import MODELS
+
+
+class Line(JSONModel):
+    sku = StringField()
+    quantity = IntegerField(default=1)
+
+
+class Order(JSONModel):
+    reference = StringField()
+    lines = ListField(child=Line)
+    totals = DictField(child=IntegerField())
+    shipping = Line()
+
+
+class Category(JSONModel):
+    name = StringField()
+    children = ListField()
+
+
+# A model can only reference itself once it's defined
+Category._fields['children'].child = Category
+
+
+class TestComponents:
+    def setup_method(self):
+        clear_components()
+
+    def test_model_component(self):
+        assert model_component(Order) == {'$ref': MODEL_REF_PREFIX + 'Order'}
+        result = postprocess_components({'paths': {'/': model_component(Order)}})
+        schemas = result['components']['schemas']
+        assert list(schemas) == ['Line', 'Order']
+        order = schemas['Order']['properties']
+        assert order['lines'] == {
+            'type': 'array', 'items': {'$ref': '#/components/schemas/Line'}, 'default': [], 'nullable': True}
+        assert order['totals']['additionalProperties'] == {'type': 'integer', 'nullable': True}
+        assert order['shipping'] == {'$ref': '#/components/schemas/Line'}
+        assert schemas['Line']['properties']['quantity'] == {'type': 'integer', 'default': 1, 'nullable': True}
+
+    @override_settings(**MODELS)
+    def test_identical_components_are_deduplicated(self):
+        first = generate_success_component('OrdersSchema', {'data': [Order]})
+        assert generate_success_component('ArchivedOrdersSchema', {'data': [Order]}) == first
+        other = generate_success_component('OrdersSchema', {'data': Order, 'message': 'Order'})
+        assert other == {'$ref': MODEL_REF_PREFIX + 'OrdersSchema2'}
+
+        with pytest.raises(TypeError):
+            generate_success_component('OrdersSchema', {'data': serializers.IntegerField()})
+
+    def test_self_referencing_model(self):
+        result = postprocess_components({'paths': {'/': model_component(Category)}})
+        children = result['components']['schemas']['Category']['properties']['children']
+        assert children['items'] == {'$ref': '#/components/schemas/Category'}
+
+    def test_name_taken_by_a_serializer_component(self):
+        class OrderSerializer(serializers.Serializer):
+            id = serializers.IntegerField()
+
+        class OrdersView(APIView):
+            @extend_schema(responses={200: model_component(Order)})
+            def get(self, request):
+                pass
+
+            @extend_schema(request=OrderSerializer, responses={201: OrderSerializer})
+            def post(self, request):
+                pass
+
+        generator = SchemaGenerator(patterns=[path('orders', OrdersView.as_view())])
+        with patched_settings({
+            'POSTPROCESSING_HOOKS': ['rest_framework_toolbox.swagger.postprocess_components'],
+            'COMPONENT_SPLIT_REQUEST': False,
+        }):
+            schema = generator.get_schema(request=None, public=True)
+            # The schema given to `extend_schema` isn't modified by the hook
+            assert generator.get_schema(request=None, public=True) == schema
+        operations = schema['paths']['/orders']
+        schemas = schema['components']['schemas']
+        assert operations['post']['responses']['201']['content']['application/json']['schema'] == {
+            '$ref': '#/components/schemas/Order'}
+        assert operations['get']['responses']['200']['content']['application/json']['schema'] == {
+            '$ref': '#/components/schemas/Order2'}
+        assert list(schemas['Order']['properties']) == ['id']
+        assert 'reference' in schemas['Order2']['properties']
+        assert schemas['Order2']['properties']['shipping'] == {'$ref': '#/components/schemas/Line'}
+
+    @override_settings(**MODELS)
+    def test_generated_document(self):
+        class OrdersView(APIView):
+            @extend_schema(responses={200: generate_success_component('OrdersSchema', {'data': [Order]})})
+            def get(self, request):
+                pass
+
+        generator = SchemaGenerator(patterns=[path('orders', OrdersView.as_view())])
+        with patched_settings({'POSTPROCESSING_HOOKS': ['rest_framework_toolbox.swagger.postprocess_components']}):
+            schema = generator.get_schema(request=None, public=True)
+        content = schema['paths']['/orders']['get']['responses']['200']['content']['application/json']
+        assert content['schema'] == {'$ref': '#/components/schemas/OrdersSchema'}
+        assert set(schema['components']['schemas']) == {'OrdersSchema', 'Order', 'Line'}
+        data = schema['components']['schemas']['OrdersSchema']['properties']['data']
+        assert data == {'type': 'array', 'items': {'$ref': '#/components/schemas/Order'}}
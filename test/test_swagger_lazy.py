@@ -0,0 +1,104 @@
+import pytest
+from django.urls import path
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import serializers, viewsets
+from rest_framework.decorators import action
+from rest_framework.routers import SimpleRouter
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.swagger import Schema, lazy_extend_schema, materialize_schemas
+from rest_framework_toolbox.swagger.lazy import pending_schemas
+
+
+class OrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+
+
+def openapi(*views):
+    generator = SchemaGenerator(patterns=[path(f'view{index}', view.as_view()) for index, view in enumerate(views)])
+    return generator.get_schema(request=None, public=True)
+
+
+def declare(decorate):
+    @decorate(tags=['orders'])
+    class OrdersView(APIView):
+        @decorate(responses={200: OrderSerializer}, parameters=[OpenApiParameter('status', str)])
+        def get(self, request):
+            pass
+
+        @decorate(request=OrderSerializer, responses={201: OrderSerializer})
+        def post(self, request):
+            pass
+
+    return OrdersView
+
+
+class TestLazySchema:
+    def setup_method(self):
+        materialize_schemas()
+
+    def test_same_schema_as_extend_schema(self):
+        built = []
+
+        def lazy(**kwargs):
+            def build():
+                built.append(kwargs)
+                return kwargs
+            return lazy_extend_schema(build)
+
+        view = declare(lazy)
+        assert pending_schemas() == 3
+        assert built == []
+        assert openapi(view) == openapi(declare(extend_schema))
+        assert pending_schemas() == 0
+        assert len(built) == 3
+
+    def test_generate_schema(self):
+        class OrderSchema:
+            summary = 'List orders'
+            responses = {200: OrderSerializer(many=True)}
+
+        class OrdersView(APIView):
+            @Schema.generate_schema(OrderSchema)
+            def get(self, request):
+                pass
+
+        assert pending_schemas() == 1
+        operation = openapi(OrdersView)['paths']['/view0']['get']
+        assert operation['summary'] == 'List orders'
+
+    def test_routers_dont_materialize_actions(self):
+        class OrderViewSet(viewsets.ViewSet):
+            @lazy_extend_schema(responses={200: OrderSerializer})
+            @action(detail=False, url_path='recent-orders')
+            def recent(self, request):
+                pass
+
+        router = SimpleRouter()
+        router.register('orders', OrderViewSet, basename='orders')
+        assert 'recent-orders' in str(router.urls[0].pattern)
+        assert pending_schemas() == 1
+        assert OrderViewSet.recent.kwargs['schema']
+        assert pending_schemas() == 0
+
+    def test_failing_build_is_raised_on_every_read(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError('bad declaration')
+            return {'tags': ['orders']}
+
+        @lazy_extend_schema(build)
+        class OrdersView(APIView):
+            def get(self, request):
+                pass
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                OrdersView.schema
+        assert OrdersView.schema is not None
+        assert len(calls) == 3
+        assert openapi(OrdersView)['paths']['/view0']['get']['tags'] == ['orders']
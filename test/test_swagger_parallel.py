@@ -0,0 +1,74 @@
+from django.urls import path
+from drf_spectacular.drainage import GENERATOR_STATS, reset_generator_stats
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.swagger import ParallelSchemaGenerator
+
+
+class LineSerializer(serializers.Serializer):
+    sku = serializers.CharField()
+    quantity = serializers.IntegerField()
+
+
+def make_view(index):
+    class OrderSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        lines = LineSerializer(many=True)
+        status = serializers.ChoiceField(choices=['open', 'closed'])
+
+    OrderSerializer.__name__ = f'Order{index}Serializer'
+
+    class OrderView(APIView):
+        @extend_schema(responses={200: OrderSerializer(many=True)})
+        def get(self, request):
+            pass
+
+        @extend_schema(request=LineSerializer, responses={201: OrderSerializer})
+        def post(self, request):
+            pass
+
+    OrderView.__name__ = f'Order{index}View'
+    return OrderView
+
+
+patterns = [path(f'shops/{index}/orders', make_view(index).as_view()) for index in range(40)]
+
+
+def render(generator):
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema), OpenApiYamlRenderer().render(schema)
+
+
+def test_parallel_document_is_identical():
+    serial = render(SchemaGenerator(patterns=patterns))
+    for workers in (2, 3):
+        assert render(ParallelSchemaGenerator(patterns=patterns, workers=workers)) == serial
+
+
+def test_single_worker_is_serial():
+    generator = ParallelSchemaGenerator(patterns=patterns[:2], workers=1)
+    assert render(generator) == render(SchemaGenerator(patterns=patterns[:2]))
+
+
+class UndocumentedView(APIView):
+    def get(self, request):
+        pass
+
+
+def test_worker_messages_are_counted(capsys):
+    undocumented = patterns[:4] + [path(f'undocumented/{index}', UndocumentedView.as_view()) for index in range(4)]
+    reset_generator_stats()
+    SchemaGenerator(patterns=undocumented).get_schema(request=None, public=True)
+    serial = (dict(GENERATOR_STATS._warn_cache), dict(GENERATOR_STATS._error_cache))
+    serial_output = capsys.readouterr().err
+
+    reset_generator_stats()
+    ParallelSchemaGenerator(patterns=undocumented, workers=2).get_schema(request=None, public=True)
+    assert GENERATOR_STATS
+    assert (dict(GENERATOR_STATS._warn_cache), dict(GENERATOR_STATS._error_cache)) == serial
+    assert sorted(capsys.readouterr().err.splitlines()) == sorted(serial_output.splitlines())
+    reset_generator_stats()
@@ -0,0 +1,65 @@
+from django.test import override_settings
+from django.urls import path
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.swagger import generate_error_schema, generate_success_schema
+from rest_framework_toolbox.swagger.main import clear_schema_cache
+
+
+class SuccessResponse(JSONModel):
+    status = BooleanField(default=True)
+    message = StringField(default="Successful request")
+    data = DataField()
+
+
+class OrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+
+
+MODELS = {
+    'SUCCESS_JSON_MODEL': 'test_swagger_schema.SuccessResponse',
+    'ERROR_JSON_MODEL': 'test_exception_handler.FailResponse',
+}
+
+
+@override_settings(**MODELS)
+def test_schemas_are_cached():
+    first = generate_success_schema('OrderSchema', {'data': OrderSerializer(many=True)})
+    assert generate_success_schema('OrderSchema', {'data': OrderSerializer(many=True)}) is first
+    # Identical structures share a serializer class
+    assert generate_success_schema('OrderListSchema', {'data': OrderSerializer(many=True)}) is first
+    assert generate_success_schema('OrderSchema', {'data': OrderSerializer()}) is not first
+    assert generate_success_schema('OrderSchema', {'data': OrderSerializer(many=True), 'message': 'Orders'}) is not first
+    assert first.__name__ == 'OrderSchema'
+    assert set(first().fields) == {'status', 'message', 'data'}
+
+    error = generate_error_schema('OrderError', {'error': serializers.DictField()})
+    assert generate_error_schema('OrderError', {'error': serializers.DictField()}) is error
+
+
+@override_settings(**MODELS)
+def test_identical_schemas_share_a_component():
+    clear_schema_cache()
+
+    class OrdersView(APIView):
+        @extend_schema(responses={200: generate_success_schema('OrdersSchema', {'data': OrderSerializer(many=True)})})
+        def get(self, request):
+            pass
+
+    class ArchivedOrdersView(APIView):
+        @extend_schema(responses={200: generate_success_schema('ArchivedOrdersSchema', {'data': OrderSerializer(many=True)})})
+        def get(self, request):
+            pass
+
+    generator = SchemaGenerator(patterns=[
+        path('orders', OrdersView.as_view()),
+        path('orders/archived', ArchivedOrdersView.as_view()),
+    ])
+    schemas = generator.get_schema(request=None, public=True)['components']['schemas']
+    assert 'OrdersSchema' in schemas
+    assert 'ArchivedOrdersSchema' not in schemas
@@ -0,0 +1,38 @@
+from django.http import HttpResponse
+from django.test import override_settings
+
+from rest_framework_toolbox.handlers import ServerTiming
+
+
+class TestServerTiming:
+    def test_disabled_is_noop(self):
+        response = HttpResponse()
+        timing = ServerTiming.for_response(response)
+        with timing.phase('encode'):
+            pass
+        timing.finish(response)
+        assert timing.enabled is False
+        assert not response.has_header('Server-Timing')
+        assert not hasattr(response, '_server_timing')
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_phases_are_emitted_as_header(self):
+        response = HttpResponse()
+        timing = ServerTiming.for_response(response)
+        with timing.phase('on_success'):
+            pass
+        with ServerTiming.for_response(response).phase('encode'):
+            pass
+        timing.finish(response, emit=False)
+        names = [metric.split(';')[0] for metric in response['Server-Timing'].split(', ')]
+        assert names == ['on_success', 'encode']
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_record(self):
+        response = HttpResponse(status=404)
+        timing = ServerTiming.for_response(response)
+        timing.add('error_handler', 0.002)
+        record = timing.record(status_code=response.status_code)
+        assert record['status_code'] == 404
+        assert record['phases'] == {'error_handler': 2.0}
+        assert record['total'] >= 0
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from django.test import override_settings
+from rest_framework import exceptions
+
+from rest_framework_toolbox.core.fields import BooleanField, DataField, StringField
+from rest_framework_toolbox.core.models import JSONModel
+from rest_framework_toolbox.handlers import ErrorHandler
+from rest_framework_toolbox.handlers.error_handler import TRUNCATION_MARKER, format_validation_errors
+
+from conftest import handle
+
+
+class BulkFailResponse(JSONModel):
+    status = BooleanField(default=False)
+    message = StringField(default="Failed request")
+    error = DataField()
+
+    def validation_error(self, request, response):
+        return BulkFailResponse(message="Invalid data", error=response.data)
+
+
+class QuotaExceeded(exceptions.APIException):
+    outcome = "Quota exceeded"
+
+
+class BulkView:
+    error_model = BulkFailResponse
+
+
+def bulk_errors(count):
+    return exceptions.ValidationError([{'name': ['This field is required.']} for _ in range(count)])
+
+
+class TestFormatValidationErrors:
+    def test_untruncated_tree_is_kept(self):
+        exc = exceptions.ValidationError({'items': [{'name': ['required']}], 'email': 'invalid'})
+        assert format_validation_errors(exc.detail) == {'items': [{'name': ['required']}], 'email': 'invalid'}
+        assert format_validation_errors(exc.detail, full=True) == {
+            'items': [{'name': [{'message': 'required', 'code': 'invalid'}]}],
+            'email': {'message': 'invalid', 'code': 'invalid'},
+        }
+
+    def test_items_cap(self):
+        formatted = format_validation_errors(bulk_errors(5000).detail, max_items=2)
+        assert formatted == [
+            {'name': ['This field is required.']},
+            {'name': ['This field is required.']},
+            {TRUNCATION_MARKER: 4998},
+        ]
+
+    def test_depth_cap(self):
+        detail = {'a': {'b': {'c': ['deep'], 'd': ['deep']}}}
+        assert format_validation_errors(detail, max_depth=2) == {'a': {'b': {TRUNCATION_MARKER: 2}}}
+
+
+class TestValidationErrorHandling:
+    @override_settings(ERROR_HANDLER_VALIDATION_MAX_ITEMS=3)
+    def test_error_model_gets_a_bounded_tree(self):
+        response = handle(bulk_errors(1000), BulkView())
+        assert response.status_code == 400
+        assert len(response.data['error']) == 4
+        assert response.data['error'][-1] == {TRUNCATION_MARKER: 997}
+
+    def test_registered_exception(self):
+        class BulkCreateFailed(exceptions.ValidationError):
+            outcome = "Bulk create failed"
+
+        ErrorHandler.register_exception(BulkCreateFailed)
+        try:
+            handler = ErrorHandler._user_handlers['BulkCreateFailed']
+            res = handler(BulkCreateFailed([{'name': ['required']}]), {}, SimpleNamespace())
+            assert res.message == "Bulk create failed"
+            assert res.data == {
+                'code': 'invalid',
+                'details': [{'name': [{'message': 'required', 'code': 'invalid'}]}],
+            }
+
+            ErrorHandler.register_exception(QuotaExceeded)
+            handler = ErrorHandler._user_handlers['QuotaExceeded']
+            res = handler(QuotaExceeded('Too many items', code='quota'), {}, SimpleNamespace())
+            assert res.data == {'code': 'quota', 'details': 'Too many items'}
+        finally:
+            ErrorHandler._user_handlers.pop('BulkCreateFailed')
+            ErrorHandler._user_handlers.pop('QuotaExceeded', None)
+            ErrorHandler.invalidate_dispatch()